@@ -0,0 +1,60 @@
+"""
+Runs the rendering benchmark suite headless and writes the results as JSON.
+
+Usage:
+    python -m benchmarks [--scenes primitives crowd ...] [--width 1600] [--height 900]
+                         [--frames 20] [--rasterizer immediate] [--output results.json]
+                         [--baseline previous.json] [--threshold 0.1]
+
+With --baseline, exits with status 1 if any median frame or stage time got
+slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+from tkenginer.rasterizer import RASTERIZERS
+from benchmarks.scenes import SCENES
+from benchmarks.suite import *
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", nargs="+", choices=list(SCENES), default=list(SCENES))
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=900)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--rasterizer", choices=list(RASTERIZERS), default="immediate")
+    parser.add_argument("--output", help="the file to write the results to, instead of stdout")
+    parser.add_argument("--baseline", help="the results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = run_suite(args.scenes, args.width, args.height, args.frames, args.rasterizer)
+    for name, metrics in results["scenes"].items():
+        stages = "  ".join(
+            f"{stage} {metrics['stages_ms'][stage]['median']:.2f}"
+            for stage in ("traversal", "culling", "vertex", "raster"))
+        print(f"{name:15} frame {metrics['frame_ms']['median']:8.2f} ms  ({stages})  "
+              f"{metrics['triangles_per_s'] / 1e6:6.2f} Mtri/s", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Measures how long TransformArray.update takes for large entity counts.
+
+Usage:
+    python -m benchmarks.ecs [--entities 100000] [--frames 20]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from tkenginer.ecs import *
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=100000)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    store = TransformArray(args.entities)
+    parents = np.arange(args.entities) - 1
+    parents[::10] = -1
+    store.create_many(
+        rng.uniform(-10, 10, (args.entities, 3)).astype(np.float32),
+        rng.uniform(-np.pi, np.pi, (args.entities, 3)).astype(np.float32),
+        rng.uniform(0.5, 2, (args.entities, 3)).astype(np.float32),
+        parents
+    )
+    store.update()
+
+    timings = list()
+    for _ in range(args.frames):
+        store.positions[:, 1] += 0.01
+        start = time.perf_counter()
+        store.update()
+        timings.append(time.perf_counter() - start)
+
+    print(f"{args.entities} entities (chains of 10): "
+          f"{1000 * np.mean(timings):.2f} ms per update")
+
+
+if __name__ == "__main__":
+    main()
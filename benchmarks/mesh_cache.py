@@ -0,0 +1,42 @@
+"""
+Measures how long loading an OBJ file takes with and without the mesh cache.
+
+Usage:
+    python -m benchmarks.mesh_cache [--segments 500] [--file mesh.obj]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from tkenginer.mesh import *
+from benchmarks.obj_parser import make_obj
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=500)
+    parser.add_argument("--file", help="an OBJ file to load instead of a generated sphere")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["TKENGINER_CACHE_DIR"] = directory
+        path = args.file
+        if path is None:
+            path = os.path.join(directory, "sphere.obj")
+            with open(path, "wb") as file:
+                file.write(make_obj(args.segments))
+        OBJMesh(b"v 0 0 0\nf 1 1 1\n")  # compile
+
+        for name, cache in [("uncached", False), ("cold cache", True), ("warm cache", True)]:
+            start = time.perf_counter()
+            mesh = OBJMesh(path, cache=cache)
+            mesh.vertices.sum()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10}: {len(mesh.indices)} triangles in {1000 * elapsed:.1f} ms")
+        del mesh
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the throughput of the OBJ parser against the old line-by-line parser.
+
+Usage:
+    python -m benchmarks.obj_parser [--segments 500] [--file mesh.obj]
+"""
+
+import argparse
+import io
+import time
+
+from tkenginer.mesh import *
+
+
+def parse_legacy(file: io.TextIOWrapper) -> Mesh:
+    """
+    The line-by-line parser OBJMesh used before the streaming parser.
+    """
+    vertices = []
+    indices = []
+    with file:
+        for line in file:
+            parts = line.strip().split()
+            if not parts:
+                continue
+            if parts[0] == "v":
+                vertices.append([float(coord) for coord in parts[1:4]])
+            elif parts[0] == "f":
+                buffer = [int(part.split("/")[0]) - 1 for part in parts[1:]]
+                for i in range(1, len(buffer) - 1):
+                    indices.append([buffer[0], buffer[i], buffer[i + 1]])
+    return Mesh(vertices, indices)
+
+
+def make_obj(segments: int) -> bytes:
+    """
+    Writes a sphere as OBJ text, with normals and v//vn faces.
+    """
+    mesh = SphereMesh(segments)
+    lines = [f"v {x:.6f} {y:.6f} {z:.6f}" for x, y, z in mesh.vertices]
+    lines += [f"vn {x:.6f} {y:.6f} {z:.6f}" for x, y, z in mesh.vertices]
+    lines += [f"f {a + 1}//{a + 1} {b + 1}//{b + 1} {c + 1}//{c + 1}" for a, b, c in mesh.indices]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=500)
+    parser.add_argument("--file", help="an OBJ file to parse instead of a generated sphere")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as file:
+            data = file.read()
+    else:
+        data = make_obj(args.segments)
+    size = len(data) / 2 ** 20
+    OBJMesh(b"v 0 0 0\nf 1 1 1\n")  # compile
+
+    for name, parse in [
+        ("legacy", lambda: parse_legacy(io.TextIOWrapper(io.BytesIO(data)))),
+        ("streaming", lambda: OBJMesh(io.BytesIO(data)))
+    ]:
+        start = time.perf_counter()
+        mesh = parse()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>9}: {len(mesh.indices)} triangles from {size:.1f} MB "
+              f"in {elapsed:.2f} s ({size / elapsed:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures the cost of presenting a frame, before and after the zero-copy present path.
+
+The copies made on the way to Tk are timed everywhere. The upload into the Tk
+photo image is only timed when a display is available.
+
+Usage:
+    python -m benchmarks.present [--width 1600] [--height 900] [--frames 100]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from PIL import Image
+
+
+def measure(function, frames: int) -> float:
+    """
+    Returns the mean time of a function in milliseconds.
+    """
+    function()
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+    return 1000 * (time.perf_counter() - start) / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=900)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    size = (args.width, args.height)
+    buffer = np.random.randint(0, 256, (args.height, args.width, 4), dtype=np.uint8)
+    image = Image.frombuffer("RGBA", size, buffer, "raw", "RGBA", 0, 1)
+
+    def legacy():
+        # Clearing the image, wrapping the buffer again and the block PhotoImage.paste()
+        # allocated and converted into every frame.
+        Image.fromarray(buffer, "RGBA").paste("black", (0, 0) + size)
+        frame = Image.fromarray(buffer, "RGBA")
+        block = Image.core.new_block("RGBA", size)
+        frame.im.convert2(block, frame.im)
+
+    print(f"{'legacy':>8}: {measure(legacy, args.frames):6.2f} ms")
+    for mode in ("RGBA", "RGB"):
+        frame = Image.new(mode, (0, 0))._new(Image.core.new_block(mode, size))
+        print(f"{mode:>8}: {measure(lambda: frame.paste(image), args.frames):6.2f} ms")
+
+    try:
+        from tkenginer.window import Window
+
+        window = Window("present", *size)
+    except Exception as error:
+        print(f"Tk upload not measured: {error}")
+        return
+    for mode in ("RGBA", "RGB"):
+        window.resize(*size, mode)
+        print(f"{mode + ' Tk':>8}: {measure(lambda: window.present(image), args.frames):6.2f} ms")
+    window.destroy()
+
+
+if __name__ == "__main__":
+    main()
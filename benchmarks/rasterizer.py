@@ -0,0 +1,82 @@
+"""
+Compares the immediate, tiled and process rasterizers on synthetic frames.
+
+Usage:
+    python -m benchmarks.rasterizer [--width 1600] [--height 900] [--frames 20] [--processes N]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from tkenginer.rasterizer import *
+
+
+def make_triangles(rng: np.random.Generator, count: int, size: float, width: int, height: int) -> tuple:
+    """
+    Creates front-facing triangles of roughly the given size scattered over the screen.
+    """
+    centers = rng.uniform((0, 0), (width, height), (count, 2))
+    angles = rng.uniform(0, 2 * np.pi, (count, 1)) + \
+        np.array([0, -2 * np.pi / 3, -4 * np.pi / 3])
+    screen_coords = np.empty((count, 3, 2), dtype=np.int32)
+    screen_coords[:, :, 0] = centers[:, 0:1] + size * np.cos(angles)
+    screen_coords[:, :, 1] = centers[:, 1:2] + size * np.sin(angles)
+    w_coords = rng.uniform(1, 10, (count * 3, 1)).astype(np.float32)
+    indices = np.arange(count * 3, dtype=np.uint32).reshape(count, 3)
+    colors = rng.integers(0, 256, (count * 3, 4)).astype(np.uint8)
+    return screen_coords.reshape(-1, 2), w_coords, indices, colors
+
+
+def run(rasterizer: Rasterizer, batches: list, width: int, height: int, frames: int) -> float:
+    """
+    Renders the batches repeatedly and returns the mean frame time in milliseconds.
+    """
+    target = rasterizer.create_target(width, height)
+    buffer, zbuffer = target.buffer, target.zbuffer
+    timings = list()
+    for _ in range(frames + 1):
+        zbuffer[:, :] = np.inf
+        start = time.perf_counter()
+        rasterizer.begin(buffer, zbuffer)
+        for batch in batches:
+            rasterizer.submit(*batch)
+        rasterizer.end()
+        timings.append(time.perf_counter() - start)
+    return 1000 * float(np.mean(timings[1:]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=900)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--processes", type=int, help="the number of worker processes")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scenes = {
+        "tiny (100 meshes x 500 tris, 4px)": [
+            make_triangles(rng, 500, 4, args.width, args.height) for _ in range(100)],
+        "small (50 meshes x 200 tris, 20px)": [
+            make_triangles(rng, 200, 20, args.width, args.height) for _ in range(50)],
+        "large (20 meshes x 10 tris, 300px)": [
+            make_triangles(rng, 10, 300, args.width, args.height) for _ in range(20)],
+    }
+
+    processes = ProcessRasterizer(args.processes)
+    print(f"{args.width}x{args.height}, {args.frames} frames, {processes.processes} processes")
+    for name, batches in scenes.items():
+        immediate = run(ImmediateRasterizer(), batches,
+                        args.width, args.height, args.frames)
+        tiled = run(TiledRasterizer(), batches,
+                    args.width, args.height, args.frames)
+        multiprocess = run(processes, batches, args.width, args.height, args.frames)
+        print(f"{name:40} immediate {immediate:8.2f} ms  tiled {tiled:8.2f} ms  "
+              f"processes {multiprocess:8.2f} ms  speedup {immediate / tiled:5.2f}x "
+              f"{immediate / multiprocess:5.2f}x")
+    processes.close()
+
+
+if __name__ == "__main__":
+    main()
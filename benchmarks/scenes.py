@@ -0,0 +1,100 @@
+"""
+Reproducible scenes for the benchmark suite.
+
+Every scene is built for the default camera, at the origin looking down -z.
+"""
+
+import numpy as np
+
+from tkenginer.node import *
+from tkenginer.mesh import *
+from tkenginer.color import *
+from benchmarks.obj_parser import make_obj
+
+
+def build_primitives(count: int = 400) -> Node:
+    """
+    A grid of assorted primitives from the mesh module.
+    """
+    rng = np.random.default_rng(0)
+    meshes = [SphereMesh(16), CubeMesh(), ConeMesh(24), CylinderMesh(24),
+              PyramidMesh(), PyramidWithSquareBaseMesh()]
+    side = int(np.ceil(np.sqrt(count)))
+    children = list()
+    for i in range(count):
+        row, column = divmod(i, side)
+        children.append(Node(
+            mesh=meshes[i % len(meshes)],
+            material=MeshColorMaterial(Color(*rng.integers(64, 256, 3), 255)),
+            transform=Transform(
+                position=[(column - side / 2) * 1.5, (row - side / 2) * 1.5, -side * 1.2],
+                rotation=rng.uniform(-np.pi, np.pi, 3)
+            )
+        ))
+    return Node(children=children)
+
+
+def build_large_obj(segments: int = 400) -> Node:
+    """
+    A single dense mesh parsed from OBJ text.
+    """
+    mesh = OBJMesh(make_obj(segments))
+    return Node(children=[Node(mesh=mesh, transform=Transform(position=[0, 0, -1.8]))])
+
+
+def build_crowd(count: int = 10000) -> Node:
+    """
+    An instanced crowd of cubes spread over a wide field.
+    """
+    rng = np.random.default_rng(0)
+    side = int(np.ceil(np.sqrt(count)))
+    matrices = np.tile(np.eye(4, dtype=np.float32), (count, 1, 1))
+    matrices[:, 0, 3] = (np.arange(count) % side - side / 2) * 1.5
+    matrices[:, 1, 3] = -2
+    matrices[:, 2, 3] = -(np.arange(count) // side) * 1.5 - 3
+    colors = rng.integers(64, 256, (count, 4)).astype(np.uint8)
+    colors[:, 3] = 255
+    return Node(children=[InstancedNode(CubeMesh(), matrices, colors)])
+
+
+def build_overdraw(layers: int = 16) -> Node:
+    """
+    Screen-filling planes stacked far to near, so every layer passes the depth test.
+    """
+    children = list()
+    for i in range(layers):
+        shade = int(255 * (i + 1) / layers)
+        children.append(Node(
+            mesh=PlaneMesh(),
+            material=MeshColorMaterial(Color(shade, shade, shade, 255)),
+            transform=Transform(
+                position=[0, 0, -2 - (layers - i) * 0.05],
+                rotation=[np.pi / 2, 0, 0],
+                scale=[20, 1, 20]
+            )
+        ))
+    return Node(children=children)
+
+
+def build_tiny_triangles(segments: int = 300) -> Node:
+    """
+    Dense spheres far away, so most triangles cover a pixel or less.
+    """
+    mesh = SphereMesh(segments)
+    children = [
+        Node(mesh=mesh, transform=Transform(position=[x, y, -60]))
+        for x in (-12, 0, 12) for y in (-6, 6)
+    ]
+    return Node(children=children)
+
+
+SCENES = {
+    "primitives": build_primitives,
+    "large_obj": build_large_obj,
+    "crowd": build_crowd,
+    "overdraw": build_overdraw,
+    "tiny_triangles": build_tiny_triangles
+}
+"""
+The scene builders, by name.
+"""
@@ -0,0 +1,38 @@
+"""
+Measures how long quadric error simplification takes on a large sphere.
+
+Usage:
+    python -m benchmarks.simplify [--segments 708] [--ratio 0.1]
+"""
+
+import argparse
+import time
+
+from tkenginer.mesh import *
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=708)
+    parser.add_argument("--ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    SphereMesh(8).simplify(64)  # compile
+    mesh = SphereMesh(args.segments)
+    count = len(mesh.indices)
+
+    start = time.perf_counter()
+    simplified = mesh.simplify(int(count * args.ratio))
+    elapsed = time.perf_counter() - start
+    print(f"simplify: {count} -> {len(simplified.indices)} triangles in {elapsed:.2f} s")
+
+    targets = [int(count * args.ratio ** level) for level in range(1, 4)]
+    start = time.perf_counter()
+    levels = mesh.simplify_chain(targets)
+    elapsed = time.perf_counter() - start
+    print(f"simplify_chain: {count} -> "
+          f"{', '.join(str(len(level.indices)) for level in levels)} triangles in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Runs the standard scenes headless and collects per-stage performance metrics.
+"""
+
+import contextlib
+import platform
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+import numba
+
+import tkenginer
+from tkenginer.engine import *
+from tkenginer.material import Material
+from benchmarks.scenes import SCENES
+
+STAGES = ("vertex", "raster")
+"""
+The stages peak memory is measured for, besides the whole frame: the vertex and
+fragment work of the materials ("vertex") and rasterization ("raster"). Timings
+use the stages of the engine's profiler.
+"""
+
+
+class StageRecorder:
+    """
+    Records the peak traced memory of nested stages, including the stages nested in them.
+    """
+
+    def __init__(self) -> None:
+        self.stack = list()
+        self.reset()
+
+    def reset(self) -> None:
+        self.times = dict.fromkeys(("frame",) + STAGES, 0.0)
+        self.peaks = dict.fromkeys(("frame",) + STAGES, 0)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak)
+            tracemalloc.reset_peak()
+        entry = [name, current if tracing else 0, 0, 0.0]
+        self.stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stack.pop()
+            self.times[name] += elapsed - entry[3]
+            if self.stack:
+                self.stack[-1][3] += elapsed
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], entry[2])
+                self.peaks[name] = max(self.peaks[name], peak - entry[1])
+                if self.stack:
+                    self.stack[-1][2] = max(self.stack[-1][2], peak)
+
+
+class TimedRasterizer(Rasterizer):
+    """
+    A rasterizer that records the work of another one as the raster stage.
+    """
+
+    def __init__(self, rasterizer: Rasterizer, recorder: StageRecorder) -> None:
+        self.rasterizer = rasterizer
+        self.recorder = recorder
+        self.triangles = 0
+        self.vertices = 0
+
+    def create_target(self, width: int, height: int):
+        return self.rasterizer.create_target(width, height)
+
+    def begin(self, buffer: np.ndarray, zbuffer: np.ndarray) -> None:
+        self.triangles = 0
+        self.vertices = 0
+        with self.recorder.stage("raster"):
+            self.rasterizer.begin(buffer, zbuffer)
+
+    def submit(self, screen_coords, w_coords, indices, colors) -> None:
+        self.triangles += len(indices)
+        self.vertices += len(screen_coords)
+        with self.recorder.stage("raster"):
+            self.rasterizer.submit(screen_coords, w_coords, indices, colors)
+
+    def end(self) -> None:
+        with self.recorder.stage("raster"):
+            self.rasterizer.end()
+
+
+@contextlib.contextmanager
+def record_material_process(recorder: StageRecorder):
+    """
+    Records Material.process as the vertex stage while active.
+    """
+    process = Material.process
+
+    def recorded_process(self, uniforms: dict, **kwargs) -> None:
+        with recorder.stage("vertex"):
+            return process(self, uniforms, **kwargs)
+
+    Material.process = recorded_process
+    try:
+        yield
+    finally:
+        Material.process = process
+
+
+def get_summary(values: list[float]) -> dict[str, float]:
+    """
+    Summarizes timings in seconds as milliseconds.
+    """
+    values = 1000 * np.asarray(values)
+    return {
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        "p95": float(np.percentile(values, 95)),
+        "min": float(values.min())
+    }
+
+
+def run_scene(
+    name: str,
+    width: int,
+    height: int,
+    frames: int,
+    rasterizer: str = "immediate",
+    warmup: int = 2
+) -> dict:
+    """
+    Renders a scene repeatedly and measures it.
+
+    Args:
+        name: The name of the scene in SCENES.
+        width, height: The frame size.
+        frames: The number of frames to measure.
+        rasterizer: The name of the rasterizer to use.
+        warmup: The number of frames to render first, so compilation is not measured.
+
+    Returns:
+        The metrics of the scene.
+    """
+    recorder = StageRecorder()
+    timed = TimedRasterizer(RASTERIZERS[rasterizer](), recorder)
+    engine = Engine(
+        headless=True,
+        width=width,
+        height=height,
+        scene=SCENES[name](),
+        rasterizer=timed,
+        profile=True
+    )
+    engine.profiler.window = frames
+
+    for _ in range(warmup):
+        engine.render_frame(1 / 60)
+    engine.profiler.reset()
+    for _ in range(frames):
+        engine.render_frame(1 / 60)
+    samples = {
+        stage: engine.profiler.get_times(stage) for stage in engine.profiler.history
+    }
+
+    with record_material_process(recorder):
+        recorder.reset()
+        tracemalloc.start()
+        with recorder.stage("frame"):
+            engine.render_frame(1 / 60)
+        tracemalloc.stop()
+    peaks = recorder.peaks
+
+    frame = float(np.mean(samples["frame"]))
+    raster = float(np.mean(samples["raster"]))
+    vertex = float(np.mean(samples["vertex"]))
+    pixels = int(np.isfinite(engine.zbuffer).sum())
+    return {
+        "frame_ms": get_summary(samples["frame"]),
+        "stages_ms": {
+            stage: get_summary(values) for stage, values in samples.items() if stage != "frame"
+        },
+        "fps": 1 / frame,
+        "triangles": timed.triangles,
+        "triangles_per_s": timed.triangles / frame,
+        "raster_triangles_per_s": timed.triangles / raster if raster > 0 else 0.0,
+        "vertices": timed.vertices,
+        "vertices_per_s": timed.vertices / vertex if vertex > 0 else 0.0,
+        "pixels": pixels,
+        "pixels_per_s": pixels / frame,
+        "visible_nodes": engine.visible_nodes,
+        "culled_nodes": engine.culled_nodes,
+        "peak_memory_bytes": peaks
+    }
+
+
+def get_environment() -> dict:
+    """
+    Describes the machine and code the benchmarks ran on.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "version": tkenginer.VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "threads": numba.config.NUMBA_NUM_THREADS
+    }
+
+
+def run_suite(
+    scenes: list[str],
+    width: int,
+    height: int,
+    frames: int,
+    rasterizer: str = "immediate"
+) -> dict:
+    """
+    Runs several scenes.
+
+    Returns:
+        The environment, the settings and the metrics of every scene.
+    """
+    return {
+        "environment": get_environment(),
+        "settings": {
+            "width": width,
+            "height": height,
+            "frames": frames,
+            "rasterizer": rasterizer
+        },
+        "scenes": {
+            name: run_scene(name, width, height, frames, rasterizer) for name in scenes
+        }
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Finds the median timings that got slower than in a baseline run.
+
+    Args:
+        results: The results of the current run.
+        baseline: The results of the run to compare against.
+        threshold: The relative slowdown to tolerate, e.g. 0.1 for 10%.
+
+    Returns:
+        A description of every regression.
+    """
+    regressions = list()
+    for name, metrics in results["scenes"].items():
+        old = baseline.get("scenes", dict()).get(name)
+        if old is None:
+            continue
+        timings = [("frame", metrics["frame_ms"], old["frame_ms"])] + [
+            (stage, times, old["stages_ms"][stage])
+            for stage, times in metrics["stages_ms"].items() if stage in old["stages_ms"]
+        ]
+        for stage, new, previous in timings:
+            if previous["median"] > 0 and new["median"] > previous["median"] * (1 + threshold):
+                regressions.append(
+                    f"{name}/{stage}: {previous['median']:.2f} ms -> {new['median']:.2f} ms "
+                    f"(+{100 * (new['median'] / previous['median'] - 1):.0f}%)"
+                )
+    return regressions
@@ -0,0 +1,127 @@
+"""
+Tests for the bvh module.
+"""
+
+import numpy as np
+
+from tkenginer.bvh import *
+from tkenginer.node import Node
+from tkenginer.mesh import CubeMesh
+from tkenginer.transform import Transform
+from tkenginer import math
+
+
+def random_boxes(rng: np.random.Generator, count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Creates random axis-aligned boxes.
+    """
+    centers = rng.uniform(-50, 50, (count, 3)).astype(np.float32)
+    extents = rng.uniform(0.1, 2, (count, 3)).astype(np.float32)
+    return centers - extents, centers + extents
+
+
+def get_planes() -> np.ndarray:
+    """
+    Creates the frustum planes of a camera at the origin looking down -z.
+    """
+    projection = math.get_projection_matrix(60.0, 160, 90, 0.1, 40.0)
+    view = math.get_view_matrix(np.zeros(3, dtype=np.float32), np.pi, 0.0)
+    return math.get_frustum_planes(projection @ view)
+
+
+def brute_force_frustum(planes, items_min, items_max) -> np.ndarray:
+    return np.array([
+        i for i in range(len(items_min))
+        if math.is_aabb_in_frustum(planes, items_min[i], items_max[i])
+    ], dtype=np.int64)
+
+
+def test_query_frustum_matches_brute_force():
+    """
+    Tests that hierarchical frustum culling finds the same boxes as testing each box.
+    """
+    rng = np.random.default_rng(0)
+    items_min, items_max = random_boxes(rng, 500)
+    bvh = BVH(items_min, items_max)
+    planes = get_planes()
+
+    expected = brute_force_frustum(planes, items_min, items_max)
+    assert len(expected) > 0
+    np.testing.assert_array_equal(bvh.query_frustum(planes), expected)
+
+
+def test_refit_after_update():
+    """
+    Tests that queries stay correct after moving some boxes.
+    """
+    rng = np.random.default_rng(1)
+    items_min, items_max = random_boxes(rng, 300)
+    bvh = BVH(items_min, items_max)
+    planes = get_planes()
+
+    moved = np.array([3, 50, 299])
+    offset = np.array([0, 0, -80], dtype=np.float32)
+    bvh.update(moved, items_min[moved] + offset, items_max[moved] + offset)
+    items_min[moved] += offset
+    items_max[moved] += offset
+
+    np.testing.assert_array_equal(
+        bvh.query_frustum(planes),
+        brute_force_frustum(planes, items_min, items_max)
+    )
+
+
+def test_query_aabb_and_nearest():
+    """
+    Tests box overlap and nearest box queries against brute force.
+    """
+    rng = np.random.default_rng(2)
+    items_min, items_max = random_boxes(rng, 400)
+    bvh = BVH(items_min, items_max)
+
+    query_min = np.array([-10, -10, -10], dtype=np.float32)
+    query_max = np.array([10, 10, 10], dtype=np.float32)
+    expected = np.nonzero(
+        np.all(items_min <= query_max, axis=1) &
+        np.all(items_max >= query_min, axis=1)
+    )[0]
+    np.testing.assert_array_equal(bvh.query_aabb(query_min, query_max), expected)
+
+    point = np.array([3, -7, 12], dtype=np.float32)
+    distances = np.linalg.norm(
+        np.maximum(np.maximum(items_min - point, point - items_max), 0), axis=1)
+    index, distance = bvh.nearest(point)
+    assert np.isclose(distance, distances.min(), atol=1e-5)
+    assert np.isclose(distances[index], distances.min(), atol=1e-5)
+
+
+def test_empty_bvh():
+    """
+    Tests queries on an empty hierarchy.
+    """
+    bvh = BVH()
+    assert len(bvh) == 0
+    assert len(bvh.query_frustum(get_planes())) == 0
+    assert bvh.nearest(np.zeros(3)) == (-1, np.inf)
+
+
+def test_scene_index_refits_moved_nodes():
+    """
+    Tests that the scene index follows nodes as they move.
+    """
+    nodes = [Node(mesh=CubeMesh(), transform=Transform(position=[x, 0, -5]))
+             for x in (-1, 0, 1)]
+    root = Node(children=nodes)
+    index = SceneIndex()
+    planes = get_planes()
+
+    def items():
+        return [(node, matrix) for node, matrix in root.traverse() if node.mesh is not None]
+
+    index.update(items())
+    assert index.query_frustum(planes) == nodes
+
+    nodes[1].transform.position[2] = 5
+    index.update(items())
+    assert index.query_frustum(planes) == [nodes[0], nodes[2]]
+    assert index.nearest(np.array([0, 0, 5]))[0] is nodes[1]
@@ -0,0 +1,80 @@
+"""
+Tests for the ecs module.
+"""
+
+import numpy as np
+import pytest
+
+from tkenginer.ecs import *
+from tkenginer.node import Node
+from tkenginer.transform import Transform
+
+
+def test_update_matches_transform():
+    """
+    Tests that the batched matrices match Transform.get_matrix.
+    """
+    rng = np.random.default_rng(0)
+    store = TransformArray(capacity=2)
+    positions = rng.uniform(-5, 5, (10, 3)).astype(np.float32)
+    rotations = rng.uniform(-np.pi, np.pi, (10, 3)).astype(np.float32)
+    scales = rng.uniform(0.5, 2, (10, 3)).astype(np.float32)
+    store.create_many(positions, rotations, scales)
+
+    world_matrices = store.update()
+
+    assert world_matrices.shape == (10, 4, 4)
+    for i in range(10):
+        expected = Transform(positions[i], rotations[i], scales[i]).get_matrix()
+        assert np.allclose(world_matrices[i], expected, atol=1e-5)
+
+
+def test_hierarchy_resolved_in_topological_order():
+    """
+    Tests that children are resolved after their parents, whatever their indices.
+    """
+    store = TransformArray()
+    child = store.create(position=[0, 1, 0])
+    parent = store.create(position=[1, 0, 0], scale=[2, 2, 2])
+    store.set_parent(child, parent)
+
+    world_matrices = store.update()
+
+    assert np.allclose(world_matrices[child][:3, 3], [1, 2, 0])
+    assert np.allclose(world_matrices[parent][:3, 3], [1, 0, 0])
+
+
+def test_hierarchy_cycle():
+    """
+    Tests that a cyclic hierarchy is rejected.
+    """
+    store = TransformArray()
+    a = store.create()
+    b = store.create(parent=a)
+    store.set_parent(a, b)
+    with pytest.raises(ValueError):
+        store.update()
+
+
+def test_attach_scene():
+    """
+    Tests that an attached scene renders the same world matrices through both paths.
+    """
+    child = Node(transform=Transform(position=[0, 1, 0], rotation=[0, 0.5, 0]))
+    root = Node(transform=Transform(position=[1, 0, 0]), children=[child])
+    before = [matrix for _, matrix in root.traverse()]
+
+    store = TransformArray()
+    store.attach(root)
+    assert isinstance(child.transform, TransformView)
+
+    world_matrices = store.update()
+    after = [matrix for _, matrix in root.traverse()]
+    for expected, matrix, index in zip(before, after, (0, 1)):
+        assert np.allclose(matrix, expected, atol=1e-6)
+        assert np.allclose(world_matrices[index], expected, atol=1e-6)
+
+    child.transform.position += np.array([0, 1, 0], dtype=np.float32)
+    assert np.allclose(store.positions[1], [0, 2, 0])
+    moved = [matrix for _, matrix in root.traverse()]
+    assert np.allclose(moved[1][:3, 3], [1, 2, 0])
@@ -0,0 +1,209 @@
+"""
+Tests for the engine module.
+"""
+
+import subprocess
+import sys
+import threading
+import numpy as np
+import pytest
+
+from tkenginer.engine import *
+from tkenginer.node import Node
+from tkenginer.mesh import CubeMesh
+from tkenginer.transform import Transform
+
+
+def make_engine(**kwargs) -> Engine:
+    """
+    Creates a small headless engine looking at a cube.
+    """
+    scene = Node(children=[
+        Node(mesh=CubeMesh(), transform=Transform(position=[0, 0, -3]))
+    ])
+    return Engine(headless=True, width=64, height=48, scene=scene, **kwargs)
+
+
+def test_headless_render_frame():
+    """
+    Tests that a headless engine renders into its buffer and returns it.
+    """
+    engine = make_engine()
+    frame = engine.render_frame(0.0)
+    assert frame is engine.buffer
+    assert frame.shape == (48, 64, 4)
+    covered = frame[:, :, :3].any(axis=2)
+    assert covered[24, 32] and not covered[0, 0]
+    assert engine.visible_nodes == 1
+    assert engine.window is None
+
+    engine.scene.children[0].transform.position = [0, 0, 3]
+    frame = engine.render_frame(0.0)
+    assert not frame[:, :, :3].any()
+    assert engine.culled_nodes == 1
+
+
+def test_headless_resize_and_run():
+    """
+    Tests resizing a headless engine and running it until it stops itself.
+    """
+    frames = list()
+
+    class Counter(Engine):
+        def update(self, delta: float) -> None:
+            frames.append(self.buffer.shape)
+            if len(frames) == 3:
+                self.stop()
+
+    engine = Counter(headless=True, width=32, height=32, fps=1000)
+    engine.init(40, 20)
+    engine.run()
+    assert frames == [(20, 40, 4)] * 3
+    assert engine.target.zbuffer.shape == (20, 40)
+
+
+def test_headless_does_not_import_tkinter():
+    """
+    Tests that rendering headless never imports tkinter.
+    """
+    code = (
+        "import sys, tkenginer\n"
+        "tkenginer.Engine(headless=True, width=8, height=8).render_frame()\n"
+        "assert 'tkinter' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_image_shares_buffer():
+    """
+    Tests that the frame image is a writable view of the buffer, also after resizing.
+    """
+    from PIL import ImageDraw
+
+    class Marker(Engine):
+        def update(self, delta: float) -> None:
+            ImageDraw.Draw(self.image).point((1, 2), fill=(10, 20, 30, 40))
+
+    engine = Marker(headless=True, width=16, height=8)
+    engine.init(12, 6)
+    frame = engine.render_frame(0.0)
+    assert tuple(frame[2, 1]) == (10, 20, 30, 40)
+    frame[0, 0] = (1, 2, 3, 4)
+    assert engine.image.getpixel((0, 0)) == (1, 2, 3, 4)
+    assert engine.image.size == (12, 6)
+
+
+def test_target_reuses_storage():
+    """
+    Tests that resizing a target within its capacity keeps its storage, and that the
+    buffers stay contiguous and cleared.
+    """
+    target = RenderTarget(40, 30)
+    storage = target.colors
+    assert target.capacity >= 40 * 30
+    target.buffer[:, :, :] = 255
+    target.resize(33, 25)
+    assert target.colors is storage
+    assert np.shares_memory(target.buffer, storage)
+    assert target.buffer.flags.c_contiguous and target.zbuffer.flags.c_contiguous
+    assert not np.any(target.buffer)
+    assert np.all(np.isinf(target.zbuffer))
+    assert target.image.size == (33, 25)
+    target.resize(42, 30)
+    assert target.colors is storage
+    target.resize(80, 60)
+    assert target.colors is not storage
+    assert target.buffer.shape == (60, 80, 4)
+
+
+def test_swap_chain_buffering():
+    """
+    Tests that double buffering waits for the presenter and triple buffering drops frames.
+    """
+    from tkenginer.target import SwapChain
+
+    chain = SwapChain(4, 4, 2)
+    back = chain.acquire()
+    chain.submit(back, "first")
+    acquired = list()
+    thread = threading.Thread(target=lambda: acquired.append(chain.acquire()))
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive() and not acquired
+    assert chain.take() == (back, "first")
+    thread.join(1)
+    assert acquired and acquired[0] is not back
+    assert chain.take() is None
+
+    chain = SwapChain(4, 4, 3)
+    first = chain.acquire()
+    chain.submit(first, 1)
+    second = chain.acquire()
+    chain.submit(second, 2)
+    assert chain.acquire() is first
+    assert chain.take() == (second, 2)
+    assert chain.dropped == 1
+    chain.close()
+    assert chain.acquire() is None
+
+
+def test_threaded_run():
+    """
+    Tests that a threaded engine renders on another thread and measures latency.
+    """
+    threads = set()
+
+    class Counter(Engine):
+        def update(self, delta: float) -> None:
+            threads.add(threading.current_thread())
+            self.mark_input()
+            if self.profiler.get_times("input_latency").size >= 2:
+                self.stop()
+
+    engine = Counter(headless=True, width=32, height=16, fps=200, threaded=True, profile=True)
+    engine.init(20, 10)
+    engine.run()
+    assert threads and threading.main_thread() not in threads
+    assert engine.swap_chain.front.buffer.shape == (10, 20, 4)
+    assert "present_interval" in engine.profiler.get_stats()
+    assert np.all(engine.profiler.get_times("input_latency") > 0)
+
+
+def test_threaded_error():
+    """
+    Tests that errors on the render thread are raised by run().
+    """
+    class Failing(Engine):
+        def update(self, delta: float) -> None:
+            raise RuntimeError("broken")
+
+    engine = Failing(headless=True, width=8, height=8, threaded=True)
+    with pytest.raises(RuntimeError, match="broken"):
+        engine.run()
+
+
+def test_render_scale():
+    """
+    Tests rendering below the output size and adjusting the scale to the frame time.
+    """
+    engine = make_engine(render_scale=0.5)
+    assert engine.render_frame(0.0).shape == (24, 32, 4)
+    assert (engine.output_width, engine.output_height) == (64, 48)
+
+    engine = make_engine(dynamic_resolution=True, fps=1e6)
+    engine.render_frame(0.0)
+    engine.render_frame(0.0)
+    assert engine.render_scale == engine.resolution_controller.min_scale
+    assert engine.render_frame(0.0).shape == (12, 16, 4)
+
+
+def test_resolution_controller():
+    """
+    Tests that the controller settles on the scale whose frame time meets the target.
+    """
+    controller = ResolutionController(0.01, headroom=1.0, smoothing=1.0)
+    scale = 1.0
+    for _ in range(20):
+        scale = controller.update(scale, 0.04 * scale ** 2)
+    assert scale == pytest.approx(0.5)
+    assert controller.update(scale, 0.04 * scale ** 2) == scale
@@ -0,0 +1,96 @@
+"""
+Tests for the material module.
+"""
+
+import numpy as np
+
+from tkenginer.material import *
+from tkenginer.color import *
+from tkenginer import math
+
+
+class LegacyMaterial(Material):
+    """
+    A material that only implements the per-vertex contract.
+    """
+
+    def __init__(self, color: Color) -> None:
+        self.color = color
+
+    def vertex(self, attributes: dict, uniforms: dict) -> tuple[np.ndarray, dict]:
+        position_clip = math.transform_vertex(
+            attributes["position"], uniforms["mvp_matrix"])
+        return position_clip, {"color": self.color}
+
+    def fragment(self, varyings: dict, uniforms: dict) -> Color:
+        return varyings["color"]
+
+
+def make_uniforms(width: int = 32, height: int = 32) -> dict:
+    """
+    Creates uniforms that render straight to a small buffer.
+    """
+    return {
+        "mvp_matrix": np.identity(4, dtype=np.float32),
+        "width": width,
+        "height": height,
+        "buffer": np.zeros((height, width, 4), dtype=np.uint8),
+        "zbuffer": np.full((height, width), np.inf, dtype=np.float32)
+    }
+
+
+VERTICES = np.array([
+    [-0.5, -0.5, 0.0],
+    [0.5, -0.5, 0.0],
+    [0.0, 0.5, 0.0],
+], dtype=np.float32)
+INDICES = np.array([[0, 1, 2]], dtype=np.uint32)
+
+
+def test_mesh_color_material_vertex_batch():
+    """
+    Tests that the batched vertex stage matches the per-vertex one.
+    """
+    material = MeshColorMaterial(Colors.RED)
+    uniforms = make_uniforms()
+    positions_clip, varyings = material.vertex_batch(
+        {"position": VERTICES, "color": None}, uniforms)
+    assert positions_clip.shape == (3, 4)
+    for i, vertex in enumerate(VERTICES):
+        expected, _ = material.vertex(
+            {"position": vertex, "color": None}, uniforms)
+        assert np.allclose(positions_clip[i], expected)
+    colors = material.fragment_batch(varyings, uniforms)
+    assert colors.shape == (3, 4)
+    assert np.all(colors == Colors.RED.to_numpy())
+
+
+def test_legacy_material_fallback():
+    """
+    Tests that materials implementing only vertex() and fragment() render the same as batched ones.
+    """
+    legacy_uniforms = make_uniforms()
+    LegacyMaterial(Colors.GREEN).process(
+        legacy_uniforms, vertices=VERTICES, indices=INDICES, colors=None)
+
+    batched_uniforms = make_uniforms()
+    MeshColorMaterial(Colors.GREEN).process(
+        batched_uniforms, vertices=VERTICES, indices=INDICES, colors=None)
+
+    assert np.any(legacy_uniforms["buffer"][:, :, 1] == 255)
+    np.testing.assert_array_equal(
+        legacy_uniforms["buffer"], batched_uniforms["buffer"])
+
+
+def test_process_empty_mesh():
+    """
+    Tests that processing an empty mesh draws nothing.
+    """
+    uniforms = make_uniforms()
+    MeshColorMaterial().process(
+        uniforms,
+        vertices=np.zeros((0, 3), dtype=np.float32),
+        indices=np.zeros((0, 3), dtype=np.uint32),
+        colors=None
+    )
+    assert not np.any(uniforms["buffer"])
@@ -84,3 +84,100 @@ def test_barycentric_outside_triangle():
     p2 = (0.0, 2.0)
     u, v, w = math.barycentric_weights(3.0, 3.0, p0, p1, p2)
     assert u < 0 or v < 0 or w < 0
+
+
+def test_draw_mesh_culls_triangles():
+    """
+    Tests that draw_mesh skips back-facing triangles and triangles behind the camera.
+    """
+    buffer = np.zeros((20, 20, 4), dtype=np.uint8)
+    zbuffer = np.full((20, 20), np.inf, dtype=np.float32)
+    screen = np.array([[2, 18], [18, 18], [10, 2]], dtype=np.int32)
+    w = np.ones((3, 1), dtype=np.float32)
+    colors = np.full((3, 4), 255, dtype=np.uint8)
+
+    back = np.array([[0, 2, 1]], dtype=np.uint32)
+    assert math.draw_mesh(buffer, zbuffer, screen, w, back, colors) == 0
+    assert not np.any(buffer)
+
+    w_behind = w.copy()
+    w_behind[2, 0] = -1
+    front = np.array([[0, 1, 2]], dtype=np.uint32)
+    assert math.draw_mesh(buffer, zbuffer, screen, w_behind, front, colors) == 0
+
+    assert math.draw_mesh(buffer, zbuffer, screen, w, front, colors) == 1
+    assert buffer[12, 10, 0] == 255
+    assert zbuffer[12, 10] == 1
+
+
+def test_rasterize_shared_edge_drawn_once():
+    """
+    Tests that pixels on an edge shared by two triangles are covered by exactly one of them.
+    """
+    corners = np.array([[2, 2], [14, 2], [14, 14], [2, 14]], dtype=np.float32)
+    colors = np.full((4, 4), 255, dtype=np.uint8)
+    coverage = np.zeros((16, 16), dtype=np.int32)
+    for triangle in ([0, 1, 2], [0, 2, 3]):
+        buffer = np.zeros((16, 16, 4), dtype=np.uint8)
+        zbuffer = np.full((16, 16), np.inf, dtype=np.float32)
+        p0, p1, p2 = corners[triangle]
+        math.rasterize_triangle(
+            buffer, zbuffer,
+            p0, p1, p2,
+            colors[0], colors[1], colors[2],
+            1.0, 1.0, 1.0,
+            0, 0, 16, 16
+        )
+        coverage += np.isfinite(zbuffer)
+        assert np.all(buffer[np.isfinite(zbuffer)] == 255)
+
+    assert coverage.max() == 1
+    assert np.all(coverage[2:14, 2:14] == 1)
+    assert coverage.sum() == 12 * 12
+
+
+def test_draw_triangle_perspective_depth():
+    """
+    Tests that draw_triangle fills both windings and interpolates depth perspective-correctly.
+    """
+    p0 = np.array([0.0, 0.0], dtype=np.float32)
+    p1 = np.array([8.0, 0.0], dtype=np.float32)
+    p2 = np.array([0.0, 8.0], dtype=np.float32)
+    color = np.array([255, 255, 255, 255], dtype=np.uint8)
+    for order in ((p0, p1, p2), (p0, p2, p1)):
+        buffer = np.zeros((8, 8, 4), dtype=np.uint8)
+        zbuffer = np.full((8, 8), np.inf, dtype=np.float32)
+        math.draw_triangle(buffer, zbuffer, *order,
+                           color, color, color, 2.0, 2.0, 2.0)
+        assert buffer[1, 1, 0] == 255
+        assert np.isclose(zbuffer[1, 1], 2.0)
+        assert buffer[7, 7, 0] == 0
+
+
+def test_frustum_culling():
+    """
+    Tests frustum tests against bounds in front of, behind and beside the camera.
+    """
+    projection = math.get_projection_matrix(90.0, 100, 100, 0.1, 100.0)
+    view = math.get_view_matrix(
+        np.zeros(3, dtype=np.float32), np.pi, 0.0)
+    planes = math.get_frustum_planes(projection @ view)
+    aabb_min = np.full(3, -0.5, dtype=np.float32)
+    aabb_max = np.full(3, 0.5, dtype=np.float32)
+    center = np.zeros(3, dtype=np.float32)
+
+    def model(x, y, z):
+        matrix = np.identity(4, dtype=np.float32)
+        matrix[:3, 3] = x, y, z
+        return matrix
+
+    assert math.is_mesh_in_frustum(
+        planes, model(0, 0, -5), aabb_min, aabb_max, center, 0.87)
+    assert not math.is_mesh_in_frustum(
+        planes, model(0, 0, 5), aabb_min, aabb_max, center, 0.87)
+    assert not math.is_mesh_in_frustum(
+        planes, model(50, 0, -5), aabb_min, aabb_max, center, 0.87)
+    assert not math.is_mesh_in_frustum(
+        planes, model(0, 0, -200), aabb_min, aabb_max, center, 0.87)
+    assert math.is_mesh_in_frustum(
+        planes, model(5.3, 0, -5), aabb_min, aabb_max, center, 0.87)
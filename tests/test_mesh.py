@@ -0,0 +1,260 @@
+"""
+Tests for the mesh module.
+"""
+
+import numpy as np
+
+from tkenginer.mesh import *
+
+
+def test_cube_bounds():
+    """
+    Tests the bounding volumes computed for a cube.
+    """
+    mesh = CubeMesh()
+    assert np.allclose(mesh.aabb_min, [-0.5, -0.5, -0.5])
+    assert np.allclose(mesh.aabb_max, [0.5, 0.5, 0.5])
+    assert np.allclose(mesh.bounding_center, [0, 0, 0])
+    assert np.isclose(mesh.bounding_radius, np.sqrt(0.75))
+
+
+def test_sphere_bounds_enclose_vertices():
+    """
+    Tests that the bounding sphere encloses every vertex.
+    """
+    mesh = SphereMesh(8)
+    distances = np.linalg.norm(mesh.vertices - mesh.bounding_center, axis=1)
+    assert np.all(distances <= mesh.bounding_radius + 1e-6)
+
+
+def test_empty_mesh_bounds():
+    """
+    Tests the bounding volumes of an empty mesh.
+    """
+    mesh = Mesh([], [])
+    assert np.allclose(mesh.aabb_min, 0)
+    assert np.allclose(mesh.aabb_max, 0)
+    assert mesh.bounding_radius == 0
+
+
+def make_grid(size: int) -> Mesh:
+    """
+    Creates a flat square grid of triangles with an open boundary.
+    """
+    xs, zs = np.meshgrid(np.linspace(0, 1, size + 1), np.linspace(0, 1, size + 1))
+    vertices = np.stack([xs.ravel(), np.zeros(xs.size), zs.ravel()], axis=1)
+    indices = []
+    for i in range(size):
+        for j in range(size):
+            x = i * (size + 1) + j
+            y = x + size + 1
+            indices.extend([[x, y, x + 1], [y, y + 1, x + 1]])
+    return Mesh(vertices, indices)
+
+
+def test_simplify_reaches_target():
+    """
+    Tests that simplifying a sphere reaches the target without flipping triangles.
+    """
+    mesh = SphereMesh(32)
+    simplified = mesh.simplify(500)
+    assert len(simplified.indices) <= 500
+    assert len(simplified.vertices) < len(mesh.vertices)
+    assert np.allclose(np.linalg.norm(simplified.vertices, axis=1), 1, atol=0.05)
+
+    vertices = simplified.vertices
+    triangles = simplified.indices.astype(np.int64)
+    normals = np.cross(
+        vertices[triangles[:, 1]] - vertices[triangles[:, 0]],
+        vertices[triangles[:, 2]] - vertices[triangles[:, 0]]
+    )
+    centers = vertices[triangles].mean(axis=1)
+    assert np.all((normals * centers).sum(axis=1) <= 1e-9)
+
+
+def test_simplify_preserves_boundary():
+    """
+    Tests that the vertices on an open boundary are kept in place.
+    """
+    mesh = make_grid(16)
+    simplified = mesh.simplify(10)
+    assert len(simplified.indices) < len(mesh.indices)
+
+    outline = mesh.vertices[:, [0, 2]]
+    on_boundary = np.any((outline == 0) | (outline == 1), axis=1)
+    boundary = {tuple(vertex) for vertex in mesh.vertices[on_boundary]}
+    assert boundary <= {tuple(vertex) for vertex in simplified.vertices}
+    assert np.allclose(simplified.vertices[:, 1], 0)
+
+
+def test_simplify_chain():
+    """
+    Tests that an LOD chain keeps the order of the targets and shrinks monotonically.
+    """
+    mesh = SphereMesh(24)
+    levels = mesh.simplify_chain([100, 800, 400])
+    counts = [len(level.indices) for level in levels]
+    assert counts[1] <= 800 and counts[2] <= 400
+    assert counts[1] > counts[2] >= counts[0]
+    assert mesh.simplify_chain([]) == []
+    assert len(Mesh([], []).simplify(10).indices) == 0
+
+
+OBJ_DATA = b"""# a quad, a negative-index triangle and attributes
+v 1 2 3
+v -1.5e0 .5 2.25E-1
+v 0 0 0 1
+vt 0.5 0.25
+vn 0 0 1
+v 4 4 4
+f 1/1/1 2/1/1 3/1/1 4/1/1
+f -1 -2 -3
+o object
+f 1//1 2//1 3//1\r
+"""
+
+
+def test_obj_parser():
+    """
+    Tests parsing records, fan triangulation and negative indices.
+    """
+    mesh = OBJMesh(OBJ_DATA)
+    assert np.allclose(mesh.vertices, [[1, 2, 3], [-1.5, 0.5, 0.225], [0, 0, 0], [4, 4, 4]])
+    assert mesh.indices.tolist() == [[0, 1, 2], [0, 2, 3], [3, 2, 1], [0, 1, 2]]
+    assert np.allclose(mesh.uvs, [[0.5, 0.25]])
+    assert np.allclose(mesh.normals, [[0, 0, 1]])
+    assert mesh.uv_indices.tolist() == [[0, 0, 0], [0, 0, 0], [-1, -1, -1], [-1, -1, -1]]
+    assert mesh.normal_indices.tolist() == [[0, 0, 0], [0, 0, 0], [-1, -1, -1], [0, 0, 0]]
+
+
+def test_obj_parser_sources(tmp_path, monkeypatch):
+    """
+    Tests that paths, binary and text streams and small chunks all parse the same.
+    """
+    import io
+
+    monkeypatch.setenv("TKENGINER_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "mesh.obj"
+    path.write_bytes(OBJ_DATA)
+    expected = OBJMesh(OBJ_DATA)
+    for source in [
+        str(path),
+        path,
+        io.BytesIO(OBJ_DATA),
+        io.StringIO(OBJ_DATA.decode()),
+        open(path)
+    ]:
+        mesh = OBJMesh(source)
+        assert np.array_equal(mesh.vertices, expected.vertices)
+        assert np.array_equal(mesh.indices, expected.indices)
+
+    mesh = OBJMesh(io.BytesIO(OBJ_DATA), chunk_size=5)
+    assert np.array_equal(mesh.indices, expected.indices)
+
+
+def test_obj_parser_invalid_index():
+    """
+    Tests that faces referring to missing vertices are rejected.
+    """
+    import pytest
+
+    with pytest.raises(ValueError):
+        OBJMesh(b"v 0 0 0\nf 1 2 3\n")
+
+
+def test_mesh_file(tmp_path):
+    """
+    Tests saving a mesh and mapping it back.
+    """
+    mesh = SphereMesh(8)
+    mesh.save(tmp_path / "sphere.tkmesh")
+    loaded = Mesh.load(tmp_path / "sphere.tkmesh")
+    assert isinstance(loaded, Mesh)
+    assert np.array_equal(loaded.vertices, mesh.vertices)
+    assert np.array_equal(loaded.indices, mesh.indices)
+    assert np.allclose(loaded.aabb_min, mesh.aabb_min)
+    assert np.isclose(loaded.bounding_radius, mesh.bounding_radius)
+    assert not loaded.vertices.flags.writeable
+
+    (tmp_path / "invalid.tkmesh").write_bytes(b"not a mesh" * 100)
+    import pytest
+    with pytest.raises(ValueError):
+        Mesh.load(tmp_path / "invalid.tkmesh")
+
+
+def test_obj_cache(tmp_path, monkeypatch):
+    """
+    Tests that OBJ files are parsed once and then loaded from the cache.
+    """
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("TKENGINER_CACHE_DIR", str(cache))
+    path = tmp_path / "mesh.obj"
+    path.write_bytes(OBJ_DATA)
+
+    parsed = OBJMesh(path)
+    assert len(list(cache.glob("*.tkmesh"))) == 1
+    cached = OBJMesh(path)
+    assert not cached.vertices.flags.writeable
+    for name in ("vertices", "indices", "uvs", "normals", "uv_indices", "normal_indices"):
+        assert np.array_equal(getattr(cached, name), getattr(parsed, name))
+
+    path.write_bytes(OBJ_DATA + b"v 9 9 9\n")
+    assert len(OBJMesh(path).vertices) == 5
+    assert len(list(cache.glob("*.tkmesh"))) == 2
+    assert len(OBJMesh(path, cache=False).vertices) == 5
+
+
+def test_optimize_welds_sphere():
+    """
+    Tests that optimizing a sphere welds its seam and poles and drops degenerate triangles.
+    """
+    mesh = SphereMesh(8).copy()
+    before = {tuple(sorted(map(tuple, triangle))) for triangle in mesh.vertices[mesh.indices].round(5)}
+    report = mesh.optimize()
+    assert report["vertices_before"] == 81 and report["vertices_after"] == 58
+    assert report["triangles_before"] == 128 and report["triangles_after"] == 112
+    assert report["acmr_after"] <= report["acmr_before"]
+    assert len(mesh.vertices) == 58 and len(mesh.indices) == 112
+    assert np.all(np.diff(np.maximum.accumulate(mesh.indices.reshape(-1))) <= 1)
+
+    after = {tuple(sorted(map(tuple, triangle))) for triangle in mesh.vertices[mesh.indices].round(5)}
+    assert after <= before
+
+
+def test_optimize_keeps_attributes():
+    """
+    Tests that the per-corner attributes of an OBJ mesh follow its triangles.
+    """
+    mesh = OBJMesh(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nv 1 0 0\nvt 0 0\nvt 1 1\n"
+                   b"f 1/1 2/1 3/1\nf 2/2 4/2 3/2\nf 3/2 4/1 1/2\n", cache=False)
+    report = mesh.optimize()
+    assert report["vertices_after"] == 3 and report["triangles_after"] == 2
+    assert sorted(mesh.uv_indices.tolist()) == [[0, 0, 0], [1, 0, 1]]
+
+
+def test_primitives_are_shared():
+    """
+    Tests that identical primitives share one read-only instance until it is freed.
+    """
+    import gc
+    import weakref
+    import pytest
+
+    spheres = [SphereMesh(9) for _ in range(1000)]
+    assert all(sphere is spheres[0] for sphere in spheres)
+    assert SphereMesh(segments=9) is spheres[0]
+    assert SphereMesh(10) is not spheres[0]
+    assert CubeMesh() is CubeMesh()
+    assert not spheres[0].vertices.flags.writeable
+    with pytest.raises(ValueError):
+        spheres[0].optimize()
+
+    copy = spheres[0].copy()
+    assert isinstance(copy, SphereMesh) and not copy.shared
+    copy.vertices[0] = 0
+    assert not np.array_equal(copy.vertices, spheres[0].vertices)
+
+    reference = weakref.ref(spheres[0])
+    del spheres
+    gc.collect()
+    assert reference() is None
@@ -2,6 +2,8 @@
 Tests for the node module.
 """
 
+import numpy as np
+
 from tkenginer.node import *
 from tkenginer.transform import *
 from tkenginer.mesh import *
@@ -49,7 +51,7 @@ def test_node_traverse_single():
     
     assert len(nodes) == 1
     assert nodes[0][0] is node
-    assert nodes[0][1] == transform
+    assert np.allclose(nodes[0][1], transform.get_matrix())
 
 def test_node_traverse_with_children():
     """
@@ -65,9 +67,116 @@ def test_node_traverse_with_children():
     
     assert len(nodes) == 2
     assert nodes[0][0] is parent
-    assert nodes[0][1] == parent_transform
+    assert np.allclose(nodes[0][1], parent_transform.get_matrix())
     
     assert nodes[1][0] is child
     
     expected_global_transform = parent_transform @ child_transform
-    assert nodes[1][1] == expected_global_transform
+    assert np.allclose(nodes[1][1], expected_global_transform.get_matrix(), atol=1e-6)
+
+def test_node_traverse_caches_world_matrices():
+    """
+    Tests that world matrices are reused until a transform in the chain changes.
+    """
+    child = Node(transform=Transform(position=[0, 1, 0]))
+    parent = Node(transform=Transform(position=[1, 0, 0]), children=[child])
+
+    first = [matrix for _, matrix in parent.traverse()]
+    second = [matrix for _, matrix in parent.traverse()]
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+
+    parent.transform.position[0] = 5
+    third = [matrix for _, matrix in parent.traverse()]
+    assert third[0] is not first[0]
+    assert third[1] is not first[1]
+    assert np.allclose(third[1][:3, 3], [5, 1, 0])
+
+def make_uniforms(width: int = 64, height: int = 64) -> dict:
+    """
+    Creates frame uniforms for a camera at the origin looking down -z.
+    """
+    from tkenginer import math
+    view_projection_matrix = math.get_projection_matrix(90.0, width, height, 0.1, 100.0) @ \
+        math.get_view_matrix(np.zeros(3, dtype=np.float32), np.pi, 0.0)
+    return {
+        "view_projection_matrix": view_projection_matrix,
+        "frustum_planes": math.get_frustum_planes(view_projection_matrix),
+        "width": width,
+        "height": height,
+        "buffer": np.zeros((height, width, 4), dtype=np.uint8),
+        "zbuffer": np.full((height, width), np.inf, dtype=np.float32)
+    }
+
+def test_instanced_node_matches_separate_nodes():
+    """
+    Tests that an instanced node draws the same frame as one node per instance.
+    """
+    transforms = [Transform(position=[x, 0, -4], rotation=[0.3, x, 0]) for x in (-1.5, 0, 1.5)]
+    instances = np.array([t.get_matrix() for t in transforms])
+
+    expected = make_uniforms()
+    for node, matrix in Node(children=[Node(mesh=CubeMesh(), transform=t) for t in transforms]).traverse():
+        if node.mesh is not None:
+            node.draw(expected, matrix)
+
+    uniforms = make_uniforms()
+    node = InstancedNode(CubeMesh(), instances)
+    for drawn, matrix in node.traverse():
+        drawn.draw(uniforms, matrix)
+
+    assert node.visible_instances == 3
+    assert np.any(uniforms["buffer"])
+    np.testing.assert_array_equal(uniforms["buffer"], expected["buffer"])
+
+def test_instanced_node_culls_and_colors_instances():
+    """
+    Tests per-instance culling and per-instance colors.
+    """
+    instances = np.array([
+        Transform(position=[0, 0, -4]).get_matrix(),
+        Transform(position=[0, 0, 4]).get_matrix(),
+    ])
+    colors = np.array([[255, 0, 0, 255], [0, 255, 0, 255]], dtype=np.uint8)
+    node = InstancedNode(CubeMesh(), instances, colors)
+    uniforms = make_uniforms()
+    node.draw(uniforms, node.get_world_matrix())
+
+    assert node.visible_instances == 1
+    assert tuple(uniforms["buffer"][32, 32]) == (255, 0, 0, 255)
+    aabb_min, aabb_max, _, _ = node.get_bounds()
+    assert np.allclose(aabb_min, [-0.5, -0.5, -4.5])
+    assert np.allclose(aabb_max, [0.5, 0.5, 4.5])
+
+def test_lod_node_selects_level_with_hysteresis():
+    """
+    Tests that LOD levels follow the screen size but do not flip around a threshold.
+    """
+    node = LODNode.from_generator(SphereMesh, [16, 8, 4], [100, 30], hysteresis=0.1)
+    assert node.select_level(200) == 0
+    assert node.select_level(95) == 0
+    assert node.select_level(85) == 1
+    assert node.select_level(105) == 1
+    assert node.select_level(115) == 0
+    assert node.select_level(5) == 2
+    assert node.mesh is node.levels[2]
+    assert node.level_changes == 3
+
+def test_lod_node_screen_size():
+    """
+    Tests that the projected size shrinks with distance and drives the drawn level.
+    """
+    uniforms = make_uniforms()
+    from tkenginer import math
+    uniforms["view_matrix"] = math.get_view_matrix(np.zeros(3, dtype=np.float32), np.pi, 0.0)
+    uniforms["projection_matrix"] = math.get_projection_matrix(90.0, 64, 64, 0.1, 100.0)
+
+    node = LODNode.from_generator(SphereMesh, [16, 8], [20])
+    near = node.get_screen_size(uniforms, Transform(position=[0, 0, -2]).get_matrix())
+    far = node.get_screen_size(uniforms, Transform(position=[0, 0, -20]).get_matrix())
+    assert np.isclose(near, 32)
+    assert np.isclose(far, 3.2)
+
+    node.draw(uniforms, Transform(position=[0, 0, -20]).get_matrix())
+    assert node.level == 1
+    assert np.any(uniforms["buffer"])
@@ -0,0 +1,84 @@
+"""
+Tests for the profiler module.
+"""
+
+import time
+import numpy as np
+
+from tkenginer.profiler import *
+
+
+def test_nested_stages_are_exclusive():
+    """
+    Tests that nested stages are not counted twice.
+    """
+    profiler = Profiler(enabled=True)
+    with profiler.frame():
+        with profiler.stage("outer"):
+            time.sleep(0.002)
+            with profiler.stage("inner"):
+                time.sleep(0.004)
+        with profiler.stage("inner"):
+            time.sleep(0.004)
+
+    frame = profiler.get_times("frame")[-1]
+    outer = profiler.get_times("outer")[-1]
+    inner = profiler.get_times("inner")[-1]
+    assert 0.002 <= outer < 0.006
+    assert inner >= 0.008
+    assert np.isclose(outer + inner + profiler.get_times("other")[-1], frame)
+
+
+def test_rolling_window_and_stats():
+    """
+    Tests that only the most recent frames are kept and summarized.
+    """
+    profiler = Profiler(enabled=True, window=4)
+    for i in range(6):
+        with profiler.frame():
+            with profiler.frame():
+                pass
+            if i % 2 == 0:
+                with profiler.stage("even"):
+                    pass
+    assert profiler.frames == 6
+    assert len(profiler.get_times("frame")) == 4
+    assert (profiler.get_times("even") > 0).tolist() == [True, False, True, False]
+    assert len(profiler.get_times("missing")) == 4
+
+    stats = profiler.get_stats((50, 99))
+    assert set(stats["frame"]) == {"mean", "last", "p50", "p99"}
+    assert "frame" in profiler.get_overlay_text()
+
+
+def test_disabled_profiler_records_nothing():
+    """
+    Tests that a disabled profiler hands out the shared no-op context.
+    """
+    profiler = Profiler()
+    assert profiler.stage("stage") is DISABLED
+    assert profiler.frame() is DISABLED
+    with profiler.frame():
+        with profiler.stage("stage"):
+            pass
+    assert profiler.frames == 0 and profiler.get_stats() == {}
+
+
+def test_engine_stages():
+    """
+    Tests that a profiled engine reports the stages of its frames.
+    """
+    from tkenginer.engine import Engine
+    from tkenginer.node import Node
+    from tkenginer.mesh import CubeMesh
+    from tkenginer.transform import Transform
+
+    scene = Node(children=[Node(mesh=CubeMesh(), transform=Transform(position=[0, 0, -3]))])
+    engine = Engine(headless=True, width=64, height=48, scene=scene, profiler_overlay=True)
+    for _ in range(3):
+        engine.render_frame(0.0)
+    stats = engine.profiler.get_stats()
+    for stage in ("frame", "clear", "traversal", "node_update", "culling", "vertex",
+                  "raster", "update", "overlay"):
+        assert stage in stats
+    assert engine.profiler.frames == 3
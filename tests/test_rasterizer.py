@@ -0,0 +1,98 @@
+"""
+Tests for the rasterizer module.
+"""
+
+import numpy as np
+
+from tkenginer.rasterizer import *
+
+
+def make_frame(width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Creates an empty color and depth buffer.
+    """
+    return (
+        np.zeros((height, width, 4), dtype=np.uint8),
+        np.full((height, width), np.inf, dtype=np.float32)
+    )
+
+
+def random_batch(rng: np.random.Generator, count: int, width: int, height: int) -> tuple:
+    """
+    Creates a batch of random triangles, roughly half of them front-facing.
+    """
+    screen_coords = np.stack([
+        rng.integers(-20, width + 20, count * 3),
+        rng.integers(-20, height + 20, count * 3)
+    ], axis=1).astype(np.int32)
+    w_coords = rng.uniform(-0.5, 10.0, (count * 3, 1)).astype(np.float32)
+    indices = np.arange(count * 3, dtype=np.uint32).reshape(count, 3)
+    colors = rng.integers(0, 256, (count * 3, 4)).astype(np.uint8)
+    return screen_coords, w_coords, indices, colors
+
+
+def render(rasterizer: Rasterizer, batches: list, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Renders batches of triangles with the given rasterizer.
+    """
+    buffer, zbuffer = make_frame(width, height)
+    rasterizer.begin(buffer, zbuffer)
+    for batch in batches:
+        rasterizer.submit(*batch)
+    rasterizer.end()
+    return buffer, zbuffer
+
+
+def test_tiled_matches_immediate():
+    """
+    Tests that the tiled rasterizer produces exactly the same frame as the immediate one.
+    """
+    width, height = 100, 70
+    rng = np.random.default_rng(0)
+    batches = [random_batch(rng, 40, width, height) for _ in range(3)]
+
+    expected_buffer, expected_zbuffer = render(
+        ImmediateRasterizer(), batches, width, height)
+    buffer, zbuffer = render(TiledRasterizer(16), batches, width, height)
+
+    assert np.any(expected_buffer)
+    np.testing.assert_array_equal(buffer, expected_buffer)
+    np.testing.assert_array_equal(zbuffer, expected_zbuffer)
+
+
+def test_tiled_empty_frame():
+    """
+    Tests that ending a frame without submissions leaves the buffers untouched.
+    """
+    buffer, zbuffer = render(TiledRasterizer(), [], 10, 10)
+    assert not np.any(buffer)
+    assert np.all(np.isinf(zbuffer))
+
+
+def test_processes_match_immediate():
+    """
+    Tests that the process rasterizer produces exactly the same frame as the immediate
+    one, both into its own shared targets and into other buffers.
+    """
+    width, height = 100, 70
+    rng = np.random.default_rng(1)
+    batches = [random_batch(rng, 40, width, height) for _ in range(3)]
+    expected_buffer, expected_zbuffer = render(
+        ImmediateRasterizer(), batches, width, height)
+
+    rasterizer = ProcessRasterizer(processes=2, tile_size=16)
+    try:
+        buffer, zbuffer = render(rasterizer, batches, width, height)
+        np.testing.assert_array_equal(buffer, expected_buffer)
+        np.testing.assert_array_equal(zbuffer, expected_zbuffer)
+
+        target = rasterizer.create_target(width, height)
+        rasterizer.begin(target.buffer, target.zbuffer)
+        for batch in batches:
+            rasterizer.submit(*batch)
+        rasterizer.end()
+        np.testing.assert_array_equal(target.buffer, expected_buffer)
+        np.testing.assert_array_equal(target.zbuffer, expected_zbuffer)
+        assert len(rasterizer.get_bands(width, height)) == 5
+    finally:
+        rasterizer.close()
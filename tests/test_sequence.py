@@ -0,0 +1,94 @@
+"""
+Tests for the sequence module.
+"""
+
+import io
+import os
+import numpy as np
+import pytest
+
+from PIL import Image
+from tkenginer.sequence import *
+from tkenginer.mesh import CubeMesh
+from tkenginer.transform import Transform
+from tkenginer import math
+
+
+def make_scene() -> Node:
+    """
+    Creates a scene with a cube off to the side of the origin.
+    """
+    return Node(children=[Node(mesh=CubeMesh(), transform=Transform(position=[1, 0, -4]))])
+
+
+def test_look_angles():
+    """
+    Tests that a camera with the calculated angles looks at the target.
+    """
+    position = np.array([1.0, 2.0, 3.0])
+    target = np.array([-2.0, 0.5, -1.0])
+    yaw, pitch = get_look_angles(position, target)
+    front, _, _ = math.get_camera_vectors(yaw, pitch)
+    expected = (target - position) / np.linalg.norm(target - position)
+    np.testing.assert_allclose(front, expected, atol=1e-6)
+
+
+def test_camera_path():
+    """
+    Tests interpolating keyframes, wrapping yaw and clamping times.
+    """
+    path = CameraPath([0, 2], [[0, 0, 0], [2, 4, 6]], [3.0, -3.0], [0.0, 0.5])
+    position, yaw, pitch = path.sample(1.0)
+    np.testing.assert_allclose(position, [1, 2, 3])
+    assert yaw == pytest.approx(np.pi)
+    assert pitch == pytest.approx(0.25)
+    np.testing.assert_allclose(path.sample(5.0)[0], [2, 4, 6])
+
+    orbit = CameraPath.orbit([0, 0, -4], 3, height=1, duration=2)
+    assert orbit.duration == 2
+    for time in (0.0, 0.7, 1.3):
+        position, yaw, pitch = orbit.sample(time)
+        front, _, _ = math.get_camera_vectors(yaw, pitch)
+        to_center = np.array([0, 0, -4]) - position
+        assert np.dot(front, to_center / np.linalg.norm(to_center)) > 0.999
+
+    with pytest.raises(ValueError):
+        CameraPath([1, 0], [[0, 0, 0]] * 2, [0, 0], [0, 0])
+
+
+def test_iter_sequence():
+    """
+    Tests that the camera follows the path from frame to frame.
+    """
+    path = CameraPath([0, 0.5], [[0, 0, 0], [0, 0, 0]], [np.pi, np.pi / 2], [0, 0])
+    frames = [
+        frame.copy() for frame in iter_sequence(make_scene(), path, 3, width=32, height=24, fps=2)
+    ]
+    assert len(frames) == 3
+    assert frames[0][:, :, :3].any()
+    assert not np.array_equal(frames[0], frames[1])
+    np.testing.assert_array_equal(frames[1], frames[2])
+
+
+def test_sinks(tmp_path):
+    """
+    Tests writing raw and PNG frames and the reported statistics.
+    """
+    path = CameraPath.orbit([1, 0, -4], 3, duration=1)
+    stream = io.BytesIO()
+    report = render_sequence(make_scene(), path, 4, RawSink(stream, alpha=False), width=16, height=8)
+    assert len(stream.getvalue()) == 4 * 16 * 8 * 3
+    assert report["frames"] == 4 and report["fps"] > 0
+
+    sink = PNGSink(tmp_path, workers=2, queue_size=1)
+    frames = [frame.copy() for frame in iter_sequence(make_scene(), path, 4, width=16, height=8)]
+    report = render_sequence(make_scene(), path, 4, sink, width=16, height=8)
+    assert sink.frames == 4
+    assert report["wait_seconds"] >= 0
+    for index, frame in enumerate(frames):
+        saved = np.asarray(Image.open(tmp_path / f"frame_{index:05d}.png"))
+        np.testing.assert_array_equal(saved, frame)
+
+    sink = PNGSink(tmp_path, pattern=os.path.join("missing", "{}.png"))
+    with pytest.raises(OSError):
+        render_sequence(make_scene(), path, 2, sink, width=16, height=8)
@@ -125,3 +125,26 @@ def test_gimbal_lock_cases():
     m2 = t2.get_matrix()
     t2r = Transform.from_matrix(m2)
     assert_matrix_equal(m2, t2r.get_matrix())
+
+
+def test_get_matrix_cached():
+    """
+    Tests that the matrix is cached until the transform changes.
+    """
+    t = Transform(position=[1, 2, 3])
+    m1 = t.get_matrix()
+    assert t.get_matrix() is m1
+    assert not m1.flags.writeable
+
+    t.position += np.array([1, 0, 0], dtype=np.float32)
+    m2 = t.get_matrix()
+    assert m2 is not m1
+    assert np.allclose(m2[:3, 3], [2, 2, 3])
+
+    t.scale[1] = 2
+    m3 = t.get_matrix()
+    assert m3 is not m2
+    assert np.isclose(m3[1, 1], 2)
+
+    t.rotation = [0, 0, np.pi / 2]
+    assert_matrix_equal(t.get_matrix()[:3, :3] @ [1, 0, 0], [0, 1, 0])
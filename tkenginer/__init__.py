@@ -1,12 +1,71 @@
-from .transform import *
-from .material import *
-from .physics import *
-from .engine import *
-from .color import *
-from .node import *
-from .mesh import *
-from . import math
+"""
+TkEnginer, a software 3D renderer that presents its frames in tkinter.
+
+The names of the package are imported from their modules on first use (PEP 562),
+so importing it is cheap and numba, PIL and tkinter are only loaded once the parts
+that need them are used.
+"""
+
+import importlib
 
 SEMVER = "0.4.0-pre"
 VERSION = "0.4.0a1"
-# TODO: tests, docstrings
+
+EXPORTS = {
+    "transform": ("Transform",),
+    "material": ("Material", "MeshColorMaterial"),
+    "rasterizer": (
+        "Rasterizer", "ImmediateRasterizer", "TiledRasterizer", "ProcessRasterizer",
+        "RASTERIZERS", "draw_band"
+    ),
+    "physics": ("gravity",),
+    "engine": ("Engine",),
+    "color": ("Color", "Colors"),
+    "node": ("Node", "InstancedNode", "LODNode"),
+    "ecs": ("TransformArray", "TransformView"),
+    "bvh": (
+        "BVH", "SceneIndex", "build_bvh", "refit_bvh", "classify_aabb", "get_aabb_distance",
+        "query_bvh_aabb", "query_bvh_frustum", "query_bvh_nearest"
+    ),
+    "target": ("RenderTarget", "SharedRenderTarget", "SwapChain", "GROWTH"),
+    "mesh": (
+        "Mesh", "SharedMesh", "OBJMesh", "CubeMesh", "PlaneMesh", "PyramidMesh",
+        "PyramidWithSquareBaseMesh", "SphereMesh", "ConeMesh", "CylinderMesh", "OBJ_CACHE_SALT"
+    ),
+    "sequence": (
+        "CameraPath", "FrameSink", "RawSink", "PNGSink", "get_look_angles", "iter_sequence",
+        "render_sequence"
+    ),
+    "profiler": ("Profiler", "Frame", "Stage", "DISABLED"),
+    "resolution": ("ResolutionController",),
+    "shared": (
+        "SharedArrays", "SharedBlock", "attach", "attached", "get_layout", "get_views",
+        "release_block", "ALIGNMENT", "ATTACHED_LIMIT"
+    ),
+    "warmup": ("compile_kernels", "start_warmup")
+}
+"""
+The public names of the package, by the module they are imported from.
+"""
+
+ORIGINS = {name: module for module, names in EXPORTS.items() for name in names}
+
+__all__ = ["SEMVER", "VERSION", "math", *ORIGINS]
+
+
+def __getattr__(name: str):
+    if name in ORIGINS:
+        value = getattr(importlib.import_module(f".{ORIGINS[name]}", __name__), name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(ORIGINS))
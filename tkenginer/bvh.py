@@ -0,0 +1,607 @@
+"""
+This module provides a bounding volume hierarchy for spatial queries over the scene.
+"""
+
+import numpy as np
+import numba as nb
+
+from . import math
+from .node import Node
+
+
+@nb.njit(cache=True)
+def build_bvh(items_min, items_max, leaf_size):
+    """
+    Builds a bounding volume hierarchy over axis-aligned boxes.
+
+    Nodes are split at the median of the box centers along their longest axis.
+    Children are always stored after their parent, and every node covers a
+    contiguous run of the item order.
+
+    Args:
+        items_min: The minimum corners of the boxes as an (N, 3) array.
+        items_max: The maximum corners of the boxes as an (N, 3) array.
+        leaf_size: The largest number of boxes in a leaf.
+
+    Returns:
+        A tuple containing the item order, the node bounds (minimum and maximum corners),
+        the first child of each node (-1 for leaves), the parent of each node (-1 for the
+        root), the start and count of each node's run in the item order, and the leaf
+        containing each item.
+    """
+    count = items_min.shape[0]
+    capacity = max(2 * count, 1)
+    order = np.arange(count)
+    nodes_min = np.empty((capacity, 3), dtype=np.float32)
+    nodes_max = np.empty((capacity, 3), dtype=np.float32)
+    children = np.full(capacity, -1, dtype=np.int64)
+    parents = np.full(capacity, -1, dtype=np.int64)
+    starts = np.zeros(capacity, dtype=np.int64)
+    counts = np.zeros(capacity, dtype=np.int64)
+    item_leaves = np.zeros(count, dtype=np.int64)
+    centers = (items_min + items_max) * 0.5
+
+    node_count = 1
+    counts[0] = count
+    stack = np.empty(capacity, dtype=np.int64)
+    stack[0] = 0
+    size = 1
+    while size > 0:
+        size -= 1
+        node = stack[size]
+        start = starts[node]
+        end = start + counts[node]
+
+        for j in range(3):
+            nodes_min[node, j] = np.inf
+            nodes_max[node, j] = -np.inf
+        for k in range(start, end):
+            for j in range(3):
+                nodes_min[node, j] = min(nodes_min[node, j], items_min[order[k], j])
+                nodes_max[node, j] = max(nodes_max[node, j], items_max[order[k], j])
+
+        if end - start <= leaf_size:
+            for k in range(start, end):
+                item_leaves[order[k]] = node
+            continue
+
+        extent = nodes_max[node] - nodes_min[node]
+        axis = 0
+        if extent[1] > extent[axis]:
+            axis = 1
+        if extent[2] > extent[axis]:
+            axis = 2
+        keys = np.empty(end - start, dtype=np.float32)
+        for k in range(start, end):
+            keys[k - start] = centers[order[k], axis]
+        order[start:end] = order[start:end][np.argsort(keys)]
+
+        middle = (start + end) // 2
+        left = node_count
+        node_count += 2
+        children[node] = left
+        for child, child_start, child_end in ((left, start, middle), (left + 1, middle, end)):
+            parents[child] = node
+            starts[child] = child_start
+            counts[child] = child_end - child_start
+            stack[size] = child
+            size += 1
+
+    return (
+        order,
+        nodes_min[:node_count].copy(),
+        nodes_max[:node_count].copy(),
+        children[:node_count].copy(),
+        parents[:node_count].copy(),
+        starts[:node_count].copy(),
+        counts[:node_count].copy(),
+        item_leaves
+    )
+
+
+@nb.njit(cache=True)
+def refit_bvh(items_min, items_max, order, nodes_min, nodes_max, children, parents, starts, counts, item_leaves, items) -> None:
+    """
+    Updates the node bounds of a bounding volume hierarchy after some boxes changed.
+
+    Only the leaves containing the changed boxes and their ancestors are recomputed.
+
+    Args:
+        items_min: The minimum corners of the boxes as an (N, 3) array.
+        items_max: The maximum corners of the boxes as an (N, 3) array.
+        order, nodes_min, nodes_max, children, parents, starts, counts, item_leaves:
+            The hierarchy, as returned by build_bvh.
+        items: The indices of the boxes that changed.
+    """
+    dirty = np.zeros(nodes_min.shape[0], dtype=np.bool_)
+    for item in items:
+        node = item_leaves[item]
+        while node >= 0 and not dirty[node]:
+            dirty[node] = True
+            node = parents[node]
+
+    for node in range(nodes_min.shape[0] - 1, -1, -1):
+        if not dirty[node]:
+            continue
+        left = children[node]
+        if left < 0:
+            for j in range(3):
+                nodes_min[node, j] = np.inf
+                nodes_max[node, j] = -np.inf
+            for k in range(starts[node], starts[node] + counts[node]):
+                for j in range(3):
+                    nodes_min[node, j] = min(
+                        nodes_min[node, j], items_min[order[k], j])
+                    nodes_max[node, j] = max(
+                        nodes_max[node, j], items_max[order[k], j])
+        else:
+            for j in range(3):
+                nodes_min[node, j] = min(
+                    nodes_min[left, j], nodes_min[left + 1, j])
+                nodes_max[node, j] = max(
+                    nodes_max[left, j], nodes_max[left + 1, j])
+
+
+@nb.njit(cache=True)
+def classify_aabb(planes, aabb_min, aabb_max) -> int:
+    """
+    Classifies an axis-aligned box against a frustum.
+
+    Args:
+        planes: The frustum planes, as returned by math.get_frustum_planes.
+        aabb_min: The minimum corner of the box.
+        aabb_max: The maximum corner of the box.
+
+    Returns:
+        0 if the box is outside, 1 if it intersects the boundary and 2 if it is fully inside.
+    """
+    inside = True
+    for i in range(planes.shape[0]):
+        far = planes[i, 3]
+        near = planes[i, 3]
+        for j in range(3):
+            if planes[i, j] >= 0:
+                far += planes[i, j] * aabb_max[j]
+                near += planes[i, j] * aabb_min[j]
+            else:
+                far += planes[i, j] * aabb_min[j]
+                near += planes[i, j] * aabb_max[j]
+        if far < 0:
+            return 0
+        if near < 0:
+            inside = False
+    return 2 if inside else 1
+
+
+@nb.njit(cache=True)
+def query_bvh_frustum(planes, items_min, items_max, order, nodes_min, nodes_max, children, starts, counts):
+    """
+    Finds the boxes at least partially inside a frustum.
+
+    Subtrees fully inside the frustum are accepted without testing their boxes.
+
+    Args:
+        planes: The frustum planes, as returned by math.get_frustum_planes.
+        items_min: The minimum corners of the boxes as an (N, 3) array.
+        items_max: The maximum corners of the boxes as an (N, 3) array.
+        order, nodes_min, nodes_max, children, starts, counts: The hierarchy, as returned by build_bvh.
+
+    Returns:
+        The indices of the boxes inside the frustum, in ascending order.
+    """
+    found = np.empty(items_min.shape[0], dtype=np.int64)
+    found_count = 0
+    if nodes_min.shape[0] == 0 or items_min.shape[0] == 0:
+        return found[:0]
+
+    stack = np.empty(nodes_min.shape[0], dtype=np.int64)
+    stack[0] = 0
+    size = 1
+    while size > 0:
+        size -= 1
+        node = stack[size]
+        result = classify_aabb(planes, nodes_min[node], nodes_max[node])
+        if result == 0:
+            continue
+        if result == 2:
+            for k in range(starts[node], starts[node] + counts[node]):
+                found[found_count] = order[k]
+                found_count += 1
+        elif children[node] < 0:
+            for k in range(starts[node], starts[node] + counts[node]):
+                item = order[k]
+                if math.is_aabb_in_frustum(planes, items_min[item], items_max[item]):
+                    found[found_count] = item
+                    found_count += 1
+        else:
+            stack[size] = children[node]
+            stack[size + 1] = children[node] + 1
+            size += 2
+    return np.sort(found[:found_count])
+
+
+@nb.njit(cache=True)
+def query_bvh_aabb(query_min, query_max, items_min, items_max, order, nodes_min, nodes_max, children, starts, counts):
+    """
+    Finds the boxes overlapping an axis-aligned box.
+
+    Args:
+        query_min: The minimum corner of the query box.
+        query_max: The maximum corner of the query box.
+        items_min: The minimum corners of the boxes as an (N, 3) array.
+        items_max: The maximum corners of the boxes as an (N, 3) array.
+        order, nodes_min, nodes_max, children, starts, counts: The hierarchy, as returned by build_bvh.
+
+    Returns:
+        The indices of the overlapping boxes, in ascending order.
+    """
+    found = np.empty(items_min.shape[0], dtype=np.int64)
+    found_count = 0
+    if nodes_min.shape[0] == 0 or items_min.shape[0] == 0:
+        return found[:0]
+
+    stack = np.empty(nodes_min.shape[0], dtype=np.int64)
+    stack[0] = 0
+    size = 1
+    while size > 0:
+        size -= 1
+        node = stack[size]
+        overlaps = True
+        for j in range(3):
+            if nodes_min[node, j] > query_max[j] or nodes_max[node, j] < query_min[j]:
+                overlaps = False
+        if not overlaps:
+            continue
+        if children[node] >= 0:
+            stack[size] = children[node]
+            stack[size + 1] = children[node] + 1
+            size += 2
+            continue
+        for k in range(starts[node], starts[node] + counts[node]):
+            item = order[k]
+            overlaps = True
+            for j in range(3):
+                if items_min[item, j] > query_max[j] or items_max[item, j] < query_min[j]:
+                    overlaps = False
+            if overlaps:
+                found[found_count] = item
+                found_count += 1
+    return np.sort(found[:found_count])
+
+
+@nb.njit(cache=True)
+def get_aabb_distance(point, aabb_min, aabb_max) -> float:
+    """
+    Calculates the distance from a point to an axis-aligned box.
+
+    Args:
+        point: The point.
+        aabb_min: The minimum corner of the box.
+        aabb_max: The maximum corner of the box.
+
+    Returns:
+        The distance, or 0 if the point is inside the box.
+    """
+    distance = 0.0
+    for j in range(3):
+        if point[j] < aabb_min[j]:
+            distance += (aabb_min[j] - point[j]) ** 2
+        elif point[j] > aabb_max[j]:
+            distance += (point[j] - aabb_max[j]) ** 2
+    return np.sqrt(distance)
+
+
+@nb.njit(cache=True)
+def query_bvh_nearest(point, items_min, items_max, order, nodes_min, nodes_max, children, starts, counts):
+    """
+    Finds the box nearest to a point.
+
+    Args:
+        point: The point.
+        items_min: The minimum corners of the boxes as an (N, 3) array.
+        items_max: The maximum corners of the boxes as an (N, 3) array.
+        order, nodes_min, nodes_max, children, starts, counts: The hierarchy, as returned by build_bvh.
+
+    Returns:
+        A tuple containing the index of the nearest box (-1 if there are none) and its distance.
+    """
+    best = -1
+    best_distance = np.inf
+    if nodes_min.shape[0] == 0 or items_min.shape[0] == 0:
+        return best, best_distance
+
+    stack = np.empty(nodes_min.shape[0], dtype=np.int64)
+    distances = np.empty(nodes_min.shape[0], dtype=np.float64)
+    stack[0] = 0
+    distances[0] = get_aabb_distance(point, nodes_min[0], nodes_max[0])
+    size = 1
+    while size > 0:
+        size -= 1
+        node = stack[size]
+        if distances[size] >= best_distance:
+            continue
+        left = children[node]
+        if left < 0:
+            for k in range(starts[node], starts[node] + counts[node]):
+                item = order[k]
+                distance = get_aabb_distance(
+                    point, items_min[item], items_max[item])
+                if distance < best_distance:
+                    best = item
+                    best_distance = distance
+            continue
+        left_distance = get_aabb_distance(
+            point, nodes_min[left], nodes_max[left])
+        right_distance = get_aabb_distance(
+            point, nodes_min[left + 1], nodes_max[left + 1])
+        if left_distance < right_distance:
+            stack[size], distances[size] = left + 1, right_distance
+            stack[size + 1], distances[size + 1] = left, left_distance
+        else:
+            stack[size], distances[size] = left, left_distance
+            stack[size + 1], distances[size + 1] = left + 1, right_distance
+        size += 2
+    return best, best_distance
+
+
+class BVH:
+    """
+    A bounding volume hierarchy over axis-aligned boxes.
+
+    Moving boxes is handled by refitting the existing hierarchy, which is much
+    cheaper than rebuilding it. Rebuild when the set of boxes changes.
+    """
+
+    def __init__(self, items_min: np.ndarray = None, items_max: np.ndarray = None, leaf_size: int = 4) -> None:
+        """
+        Initializes the BVH.
+
+        Args:
+            items_min: The minimum corners of the boxes as an (N, 3) array.
+            items_max: The maximum corners of the boxes as an (N, 3) array.
+            leaf_size: The largest number of boxes in a leaf.
+        """
+        self.leaf_size = leaf_size
+        self.build(
+            items_min if items_min is not None else np.zeros(
+                (0, 3), dtype=np.float32),
+            items_max if items_max is not None else np.zeros(
+                (0, 3), dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        """
+        Returns the number of boxes in the hierarchy.
+        """
+        return len(self.items_min)
+
+    def build(self, items_min: np.ndarray, items_max: np.ndarray) -> None:
+        """
+        Rebuilds the hierarchy from scratch.
+
+        Args:
+            items_min: The minimum corners of the boxes as an (N, 3) array.
+            items_max: The maximum corners of the boxes as an (N, 3) array.
+        """
+        self.items_min = np.array(items_min, dtype=np.float32).reshape(-1, 3)
+        self.items_max = np.array(items_max, dtype=np.float32).reshape(-1, 3)
+        (
+            self.order,
+            self.nodes_min,
+            self.nodes_max,
+            self.children,
+            self.parents,
+            self.starts,
+            self.counts,
+            self.item_leaves
+        ) = build_bvh(self.items_min, self.items_max, self.leaf_size)
+        if len(self.items_min) == 0:
+            self.nodes_min = self.nodes_min[:0]
+            self.nodes_max = self.nodes_max[:0]
+
+    def update(self, items: np.ndarray, items_min: np.ndarray, items_max: np.ndarray) -> None:
+        """
+        Moves some boxes and refits the hierarchy around them.
+
+        Args:
+            items: The indices of the boxes that moved.
+            items_min: The new minimum corners of those boxes.
+            items_max: The new maximum corners of those boxes.
+        """
+        items = np.asarray(items, dtype=np.int64)
+        if len(items) == 0:
+            return
+        self.items_min[items] = items_min
+        self.items_max[items] = items_max
+        refit_bvh(
+            self.items_min,
+            self.items_max,
+            self.order,
+            self.nodes_min,
+            self.nodes_max,
+            self.children,
+            self.parents,
+            self.starts,
+            self.counts,
+            self.item_leaves,
+            items
+        )
+
+    def query_frustum(self, planes: np.ndarray) -> np.ndarray:
+        """
+        Finds the boxes at least partially inside a frustum.
+
+        Args:
+            planes: The frustum planes, as returned by math.get_frustum_planes.
+
+        Returns:
+            The indices of the boxes, in ascending order.
+        """
+        return query_bvh_frustum(
+            planes,
+            self.items_min,
+            self.items_max,
+            self.order,
+            self.nodes_min,
+            self.nodes_max,
+            self.children,
+            self.starts,
+            self.counts
+        )
+
+    def query_aabb(self, aabb_min: np.ndarray, aabb_max: np.ndarray) -> np.ndarray:
+        """
+        Finds the boxes overlapping an axis-aligned box.
+
+        Args:
+            aabb_min: The minimum corner of the query box.
+            aabb_max: The maximum corner of the query box.
+
+        Returns:
+            The indices of the boxes, in ascending order.
+        """
+        return query_bvh_aabb(
+            np.asarray(aabb_min, dtype=np.float32),
+            np.asarray(aabb_max, dtype=np.float32),
+            self.items_min,
+            self.items_max,
+            self.order,
+            self.nodes_min,
+            self.nodes_max,
+            self.children,
+            self.starts,
+            self.counts
+        )
+
+    def nearest(self, point: np.ndarray) -> tuple[int, float]:
+        """
+        Finds the box nearest to a point.
+
+        Args:
+            point: The point.
+
+        Returns:
+            A tuple containing the index of the nearest box (-1 if there are none) and its distance.
+        """
+        return query_bvh_nearest(
+            np.asarray(point, dtype=np.float32),
+            self.items_min,
+            self.items_max,
+            self.order,
+            self.nodes_min,
+            self.nodes_max,
+            self.children,
+            self.starts,
+            self.counts
+        )
+
+
+class SceneIndex:
+    """
+    Keeps a BVH over the world-space bounds of the mesh nodes of a scene.
+    """
+
+    def __init__(self, leaf_size: int = 4) -> None:
+        """
+        Initializes the SceneIndex.
+
+        Args:
+            leaf_size: The largest number of nodes in a leaf of the BVH.
+        """
+        self.bvh = BVH(leaf_size=leaf_size)
+        self.nodes: list[Node] = list()
+        self.keys: list[tuple[np.ndarray, np.ndarray]] = list()
+
+    def get_world_bounds(self, node: Node, world_matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculates the world-space bounding box of a mesh node.
+
+        Args:
+            node: The node.
+            world_matrix: The world matrix of the node.
+
+        Returns:
+            A tuple containing the minimum and maximum corners of the box.
+        """
+        world_min, world_max, _, _ = math.transform_bounds(
+            world_matrix, *node.get_bounds())
+        return world_min, world_max
+
+    def update(self, items: list[tuple[Node, np.ndarray]]) -> None:
+        """
+        Brings the index up to date with the scene.
+
+        The BVH is rebuilt when nodes were added or removed, refitted around the
+        nodes whose world matrix or bounds changed, and left alone otherwise.
+
+        Args:
+            items: The mesh nodes of the scene and their world matrices.
+        """
+        keys = [(world_matrix, node.get_bounds()[0])
+                for node, world_matrix in items]
+        if len(items) != len(self.nodes) or any(
+            node is not known for (node, _), known in zip(items, self.nodes)
+        ):
+            bounds = [self.get_world_bounds(node, world_matrix)
+                      for node, world_matrix in items]
+            self.nodes = [node for node, _ in items]
+            self.keys = keys
+            self.bvh.build(
+                np.array([bound[0] for bound in bounds],
+                         dtype=np.float32).reshape(-1, 3),
+                np.array([bound[1] for bound in bounds],
+                         dtype=np.float32).reshape(-1, 3)
+            )
+            return
+
+        moved = [
+            i for i, (key, known) in enumerate(zip(keys, self.keys))
+            if key[0] is not known[0] or key[1] is not known[1]
+        ]
+        if not moved:
+            return
+        bounds = [self.get_world_bounds(*items[i]) for i in moved]
+        self.keys = keys
+        self.bvh.update(
+            moved,
+            np.array([bound[0] for bound in bounds], dtype=np.float32),
+            np.array([bound[1] for bound in bounds], dtype=np.float32)
+        )
+
+    def query_frustum(self, planes: np.ndarray) -> list[Node]:
+        """
+        Finds the nodes at least partially inside a frustum.
+
+        Args:
+            planes: The frustum planes, as returned by math.get_frustum_planes.
+
+        Returns:
+            The nodes, in scene order.
+        """
+        return [self.nodes[i] for i in self.bvh.query_frustum(planes)]
+
+    def query_aabb(self, aabb_min: np.ndarray, aabb_max: np.ndarray) -> list[Node]:
+        """
+        Finds the nodes whose bounds overlap an axis-aligned box.
+
+        Args:
+            aabb_min: The minimum corner of the query box.
+            aabb_max: The maximum corner of the query box.
+
+        Returns:
+            The nodes, in scene order.
+        """
+        return [self.nodes[i] for i in self.bvh.query_aabb(aabb_min, aabb_max)]
+
+    def nearest(self, point: np.ndarray) -> tuple[Node, float]:
+        """
+        Finds the node whose bounds are nearest to a point.
+
+        Args:
+            point: The point.
+
+        Returns:
+            A tuple containing the nearest node (None if there are none) and its distance.
+        """
+        index, distance = self.bvh.nearest(point)
+        return (self.nodes[index] if index >= 0 else None), distance
@@ -0,0 +1,300 @@
+"""
+This module provides structure-of-arrays storage for the transforms of many entities.
+"""
+
+import numpy as np
+
+from . import math
+from .transform import Transform
+from .node import Node
+
+
+class TransformArray:
+    """
+    Stores the transforms of many entities in contiguous arrays.
+
+    Positions, rotations and scales live in (N, 3) float32 arrays and every entity has
+    an optional parent. update() builds the local and world matrices of all entities
+    at once.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Initializes the TransformArray.
+
+        Args:
+            capacity: The number of entities to allocate storage for up front.
+        """
+        self.count = 0
+        self._positions = np.zeros((capacity, 3), dtype=np.float32)
+        self._rotations = np.zeros((capacity, 3), dtype=np.float32)
+        self._scales = np.ones((capacity, 3), dtype=np.float32)
+        self._parents = np.full(capacity, -1, dtype=np.int64)
+        self._local_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._world_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._order = None
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        The positions of the entities as an (N, 3) array.
+        """
+        return self._positions[:self.count]
+
+    @property
+    def rotations(self) -> np.ndarray:
+        """
+        The rotations (pitch, yaw, roll) of the entities in radians as an (N, 3) array.
+        """
+        return self._rotations[:self.count]
+
+    @property
+    def scales(self) -> np.ndarray:
+        """
+        The scales of the entities as an (N, 3) array.
+        """
+        return self._scales[:self.count]
+
+    @property
+    def parents(self) -> np.ndarray:
+        """
+        The index of each entity's parent, or -1 for roots. Use set_parent to change it.
+        """
+        return self._parents[:self.count]
+
+    @property
+    def local_matrices(self) -> np.ndarray:
+        """
+        The local matrices of the entities as an (N, 4, 4) array, as of the last update.
+        """
+        return self._local_matrices[:self.count]
+
+    @property
+    def world_matrices(self) -> np.ndarray:
+        """
+        The world matrices of the entities as an (N, 4, 4) array, as of the last update.
+        """
+        return self._world_matrices[:self.count]
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Makes sure storage for at least the given number of entities is allocated.
+
+        Args:
+            capacity: The number of entities to allocate storage for.
+        """
+        if capacity <= len(self._positions):
+            return
+
+        def grow(array: np.ndarray, fill: float) -> np.ndarray:
+            grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            return grown
+
+        self._positions = grow(self._positions, 0)
+        self._rotations = grow(self._rotations, 0)
+        self._scales = grow(self._scales, 1)
+        self._parents = grow(self._parents, -1)
+        self._local_matrices = grow(self._local_matrices, 0)
+        self._world_matrices = grow(self._world_matrices, 0)
+
+    def create(
+        self,
+        position: list[float] = None,
+        rotation: list[float] = None,
+        scale: list[float] = None,
+        parent: int = -1
+    ) -> int:
+        """
+        Creates a new entity.
+
+        Args:
+            position: The position as a list of 3 floats (x, y, z).
+            rotation: The rotation as a list of 3 floats (pitch, yaw, roll) in radians.
+            scale: The scale as a list of 3 floats (x, y, z).
+            parent: The index of the parent entity, or -1 for a root.
+
+        Returns:
+            The index of the new entity.
+        """
+        if self.count == len(self._positions):
+            self.reserve(max(2 * len(self._positions), 1))
+
+        index = self.count
+        self.count += 1
+        self._positions[index] = position if position is not None else 0.0
+        self._rotations[index] = rotation if rotation is not None else 0.0
+        self._scales[index] = scale if scale is not None else 1.0
+        self.set_parent(index, parent)
+        return index
+
+    def create_many(
+        self,
+        positions: np.ndarray,
+        rotations: np.ndarray = None,
+        scales: np.ndarray = None,
+        parents: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Creates many entities at once.
+
+        Args:
+            positions: The positions as an (N, 3) array.
+            rotations: The rotations as an (N, 3) array, or None for no rotation.
+            scales: The scales as an (N, 3) array, or None for a scale of 1.
+            parents: The parent indices as an (N,) array, or None for roots.
+
+        Returns:
+            The indices of the new entities.
+        """
+        count = len(positions)
+        if self.count + count > len(self._positions):
+            self.reserve(max(self.count + count, 2 * len(self._positions)))
+
+        indices = np.arange(self.count, self.count + count)
+        self._positions[indices] = positions
+        self._rotations[indices] = rotations if rotations is not None else 0.0
+        self._scales[indices] = scales if scales is not None else 1.0
+        self._parents[indices] = parents if parents is not None else -1
+        self.count += count
+        self._order = None
+        return indices
+
+    def set_parent(self, index: int, parent: int) -> None:
+        """
+        Changes the parent of an entity.
+
+        Args:
+            index: The index of the entity.
+            parent: The index of the new parent entity, or -1 to make it a root.
+        """
+        if parent >= self.count:
+            raise IndexError(f"parent {parent} does not exist")
+        self._parents[index] = parent
+        self._order = None
+
+    def update(self) -> np.ndarray:
+        """
+        Builds the local and world matrices of every entity.
+
+        Returns:
+            The world matrices as an (N, 4, 4) array.
+        """
+        math.compose_matrices(
+            self.positions,
+            self.rotations,
+            self.scales,
+            self.local_matrices
+        )
+        if self._order is None:
+            self._order = math.get_hierarchy_order(self.parents)
+        math.resolve_hierarchy(
+            self._order,
+            self.parents,
+            self.local_matrices,
+            self.world_matrices
+        )
+        return self.world_matrices
+
+    def view(self, index: int) -> "TransformView":
+        """
+        Returns a Transform that reads and writes the given entity.
+
+        Args:
+            index: The index of the entity.
+
+        Returns:
+            A TransformView of the entity.
+        """
+        return TransformView(self, index)
+
+    def attach(self, node: Node, parent: int = -1) -> int:
+        """
+        Moves the transforms of a scene graph into this store.
+
+        Every node in the tree gets an entity mirroring its place in the hierarchy and
+        its transform is replaced by a view of that entity, so the scene keeps working
+        as before.
+
+        Args:
+            node: The root node of the tree to attach.
+            parent: The index of the entity to attach the tree under, or -1 for none.
+
+        Returns:
+            The index of the entity created for the root node.
+        """
+        transform = node.transform
+        index = self.create(
+            transform.position,
+            transform.rotation,
+            transform.scale,
+            parent
+        )
+        node.transform = self.view(index)
+        for child in node.children:
+            self.attach(child, index)
+        return index
+
+
+class TransformView(Transform):
+    """
+    A Transform whose position, rotation and scale live in a TransformArray.
+    """
+
+    def __init__(self, store: TransformArray, index: int) -> None:
+        """
+        Initializes the view.
+
+        Args:
+            store: The store holding the entity.
+            index: The index of the entity.
+        """
+        self.store = store
+        self.index = index
+        self._matrix = None
+        self._matrix_key = None
+
+    @property
+    def _position(self) -> np.ndarray:
+        return self.store._positions[self.index]
+
+    @property
+    def _rotation(self) -> np.ndarray:
+        return self.store._rotations[self.index]
+
+    @property
+    def _scale(self) -> np.ndarray:
+        return self.store._scales[self.index]
+
+    @property
+    def position(self) -> np.typing.NDArray[np.float32]:
+        """
+        The position as an array of 3 floats (x, y, z).
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: list[float]) -> None:
+        self.store._positions[self.index] = value
+
+    @property
+    def rotation(self) -> np.typing.NDArray[np.float32]:
+        """
+        The rotation as an array of 3 floats (pitch, yaw, roll) in radians.
+        """
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: list[float]) -> None:
+        self.store._rotations[self.index] = value
+
+    @property
+    def scale(self) -> np.typing.NDArray[np.float32]:
+        """
+        The scale as an array of 3 floats (x, y, z).
+        """
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: list[float]) -> None:
+        self.store._scales[self.index] = value
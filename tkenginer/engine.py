@@ -2,19 +2,33 @@
 This module contains the core Engine class for the TkEnginer.
 """
 
-import tkinter as tk
+import threading
 import numpy as np
 import time
 
-from PIL import Image, ImageTk
+from PIL import Image
 from .node import *
 from . import math
 from .color import *
+from .rasterizer import *
+from .bvh import *
+from .target import *
+from .profiler import *
+from .resolution import *
+from .warmup import start_warmup
 
 
 class Engine:
     """
     The main engine class that manages the window, rendering, and user input.
+
+    A headless engine has no window and never imports tkinter, so it also runs
+    on machines without a display; frames are rendered by calling render_frame().
+
+    A threaded engine renders on a background thread, so that slow frames do not
+    hold up input and window events. update() and the scene then run on that
+    thread, while the main thread handles events and presents the newest finished
+    frame. The numba kernels release the GIL, so both threads make progress.
     """
 
     def __init__(
@@ -27,7 +41,18 @@ class Engine:
         near: float = 0.01,
         far: float = 100,
         clear_color: Color = Colors.BLACK,
-        scene: Node = None
+        scene: Node = None,
+        rasterizer: "str | Rasterizer" = "immediate",
+        frustum_culling: bool = True,
+        headless: bool = False,
+        profile: bool = False,
+        profiler_overlay: bool = False,
+        alpha: bool = True,
+        threaded: bool = False,
+        buffers: int = 3,
+        render_scale: float = 1.0,
+        dynamic_resolution: bool = False,
+        warmup: bool = True
     ) -> None:
         """
         Initializes the Engine.
@@ -42,22 +67,69 @@ class Engine:
             far: The far clipping plane.
             clear_color: The color to clear the screen with.
             scene: The root node of the scene graph.
+            rasterizer: The rasterizer to draw with, either an instance or the name of
+                a built-in one ("immediate", "tiled" or "processes"). Render targets are
+                created by the rasterizer.
+            frustum_culling: Whether to skip meshes whose bounds are outside the view frustum,
+                using a BVH over the scene that is refitted as nodes move.
+            headless: Whether to render offscreen only, without creating a window.
+            profile: Whether to time the stages of every frame with the profiler.
+            profiler_overlay: Whether to draw the profiler statistics over every frame.
+                Enables profiling.
+            alpha: Whether to present frames with their alpha channel. Presenting them
+                opaque is cheaper when the clear color and materials are opaque anyway.
+            threaded: Whether to render on a background thread.
+            buffers: The number of frames in flight when threaded: 2 for double buffering,
+                where rendering waits for every frame to be presented, or 3 for triple
+                buffering, where it never waits and frames that are never presented are dropped.
+            render_scale: The fraction of the window width and height frames are rendered
+                at. Smaller frames are upscaled when presented.
+            dynamic_resolution: Whether to adjust the render scale every frame to hold
+                the target frame rate, with a ResolutionController in resolution_controller.
+            warmup: Whether to compile the kernels of the render path on a background
+                thread while the window and scene are set up, see warmup.start_warmup().
         """
-
-        self.window = tk.Tk()
-        self.window.title(title)
-        self.window.geometry(f"{width}x{height}")
+        if warmup:
+            start_warmup()
+
+        self.headless = headless
+        self.alpha = alpha
+        self.window = None
+        self.canvas = None
+        if not headless:
+            from .window import Window
+
+            self.window = Window(title, width, height)
+            self.canvas = self.window.canvas
+        self.rasterizer = RASTERIZERS[rasterizer]() if isinstance(
+            rasterizer, str) else rasterizer
+        self.threaded = threaded
+        self.swap_chain = SwapChain(
+            width, height, buffers, self.rasterizer.create_target) if threaded else None
+        self.target = self.swap_chain.front if threaded else self.rasterizer.create_target(width, height)
+        self.render_thread = None
+        self.render_error = None
+        self.pending_size = None
+        self.render_scale = render_scale
+        self.resolution_controller = ResolutionController(
+            1 / fps, max_scale=max(render_scale, 1.0)) if dynamic_resolution else None
+        self.upscale_filter = Image.NEAREST
+        self.input_time = None
+        self.frame_input_time = None
+        self.present_time = None
+        self.running = False
         self.frame_time = 1000 / fps
         self.fov = fov
         self.near = near
         self.far = far
         self.clear_color = clear_color
+        self.frustum_culling = frustum_culling
+        self.scene_index = SceneIndex()
+        self.visible_nodes = 0
+        self.culled_nodes = 0
+        self.profiler = Profiler(enabled=profile or profiler_overlay)
+        self.profiler_overlay = profiler_overlay
 
-        self.canvas = tk.Canvas(
-            self.window,
-            highlightthickness=0
-        )
-        self.canvas.pack(fill=tk.BOTH, expand=True)
         self.init(width, height)
         self.last_time = time.time()
 
@@ -70,36 +142,61 @@ class Engine:
         self.pressed_keys: set[str] = set()
         self.mouse: list[int] = None
 
-        self.window.bind("<KeyPress>", self.key_pressed)
-        self.window.bind("<KeyRelease>", self.key_released)
-        self.window.bind("<ButtonPress>", self.button_pressed)
-        self.window.bind("<ButtonRelease>", self.button_released)
-        self.window.bind("<Motion>", self.mouse_moved)
-        self.window.bind("<Configure>", self.window_resized)
+        if self.window is not None:
+            self.window.bind("<KeyPress>", self.key_pressed)
+            self.window.bind("<KeyRelease>", self.key_released)
+            self.window.bind("<ButtonPress>", self.button_pressed)
+            self.window.bind("<ButtonRelease>", self.button_released)
+            self.window.bind("<Motion>", self.mouse_moved)
+            self.window.bind("<Configure>", self.window_resized)
 
     def init(self, width: int, height: int) -> None:
         """
         Initializes the rendering buffers and projection matrix.
 
+        Frames are rendered at the output size times the render scale.
+
         Args:
-            width: The width of the window.
-            height: The height of the window.
+            width: The width of the output.
+            height: The height of the output.
         """
-        self.width = width
-        self.height = height
+        self.output_width = width
+        self.output_height = height
+        self.width = max(1, round(width * self.render_scale))
+        self.height = max(1, round(height * self.render_scale))
         self.projection_matrix = math.get_projection_matrix(
-            self.fov,
+            float(self.fov),
             self.width,
             self.height,
-            self.near,
-            self.far
+            float(self.near),
+            float(self.far)
         )
-        self.buffer = np.zeros((self.height, self.width, 4), dtype=np.uint8)
-        self.zbuffer = np.full((self.height, self.width),
-                               np.inf, dtype=np.float32)
-        self.image = Image.fromarray(self.buffer, "RGBA")
-        self.photo = ImageTk.PhotoImage(self.image)
-        self.canvas.create_image(0, 0, image=self.photo, anchor="nw")
+        self.target.resize(self.width, self.height)
+        self.set_target(self.target)
+
+    def set_render_scale(self, scale: float) -> None:
+        """
+        Changes the render scale from the next frame on.
+
+        Args:
+            scale: The fraction of the output width and height to render at.
+        """
+        self.render_scale = scale
+        self.pending_size = (self.output_width, self.output_height)
+
+    def set_target(self, target: RenderTarget) -> None:
+        """
+        Makes frames render into a target, resizing it to the frame size if needed.
+
+        Args:
+            target: The target.
+        """
+        if (target.width, target.height) != (self.width, self.height):
+            target.resize(self.width, self.height)
+        self.target = target
+        self.buffer = target.buffer
+        self.zbuffer = target.zbuffer
+        self.image = target.image
 
     def update(self, delta: float) -> None:
         """
@@ -134,11 +231,78 @@ class Engine:
     def run(self) -> None:
         """
         Starts the engine's main loop.
+
+        A headless engine renders frames at the target frame rate until stop() is called.
+
+        Raises:
+            Exception: Any error raised while rendering on the background thread.
         """
-        self.loop()
-        self.window.mainloop()
+        self.running = True
+        if self.threaded:
+            self.render_thread = threading.Thread(
+                target=self.render_loop, name="tkenginer-render", daemon=True)
+            self.render_thread.start()
+
+        if self.window is None:
+            while self.running:
+                start = time.time()
+                if self.threaded:
+                    self.present()
+                else:
+                    self.render_frame()
+                time.sleep(max(0.0, self.frame_time / 1000 - (time.time() - start)))
+        else:
+            self.loop()
+            self.window.mainloop()
+
+        if self.render_thread is not None:
+            self.render_thread.join()
+            self.render_thread = None
+        if self.render_error is not None:
+            error, self.render_error = self.render_error, None
+            raise error
+
+    def render_loop(self) -> None:
+        """
+        Renders frames into the swap chain at the target frame rate until the engine stops.
+        """
+        try:
+            while self.running:
+                start = time.time()
+                target = self.swap_chain.acquire()
+                if target is None:
+                    break
+                self.set_target(target)
+                self.render_frame()
+                self.swap_chain.submit(target, self.frame_input_time)
+                time.sleep(max(0.0, self.frame_time / 1000 - (time.time() - start)))
+        except BaseException as error:
+            self.render_error = error
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Stops the main loop, closing the window if there is one.
 
-    def key_pressed(self, event: tk.Event) -> None:
+        When called from the render thread, the window is closed by the main thread
+        shortly after.
+        """
+        self.running = False
+        if self.swap_chain is not None:
+            self.swap_chain.close()
+        if self.window is not None and threading.current_thread() is threading.main_thread():
+            self.window.destroy()
+            self.window = None
+
+    def mark_input(self) -> None:
+        """
+        Remembers when the oldest input not yet seen by a frame arrived, to measure
+        input latency.
+        """
+        if self.input_time is None:
+            self.input_time = time.perf_counter()
+
+    def key_pressed(self, event: "tkinter.Event") -> None:
         """
         Callback for when a key is pressed.
 
@@ -146,8 +310,9 @@ class Engine:
             event: The tkinter event.
         """
         self.pressed_keys.add(event.keysym)
+        self.mark_input()
 
-    def key_released(self, event: tk.Event) -> None:
+    def key_released(self, event: "tkinter.Event") -> None:
         """
         Callback for when a key is released.
 
@@ -155,8 +320,9 @@ class Engine:
             event: The tkinter event.
         """
         self.pressed_keys.discard(event.keysym)
+        self.mark_input()
 
-    def button_pressed(self, event: tk.Event) -> None:
+    def button_pressed(self, event: "tkinter.Event") -> None:
         """
         Callback for when a mouse button is pressed.
 
@@ -164,8 +330,9 @@ class Engine:
             event: The tkinter event.
         """
         self.pressed_keys.add(f"mouse_{event.num}")
+        self.mark_input()
 
-    def button_released(self, event: tk.Event) -> None:
+    def button_released(self, event: "tkinter.Event") -> None:
         """
         Callback for when a mouse button is released.
 
@@ -173,8 +340,9 @@ class Engine:
             event: The tkinter event.
         """
         self.pressed_keys.discard(f"mouse_{event.num}")
+        self.mark_input()
 
-    def mouse_moved(self, event: tk.Event) -> None:
+    def mouse_moved(self, event: "tkinter.Event") -> None:
         """
         Callback for when the mouse is moved.
 
@@ -182,58 +350,170 @@ class Engine:
             event: The tkinter event.
         """
         self.mouse = [event.x, event.y]
+        self.mark_input()
 
-    def window_resized(self, event: tk.Event) -> None:
+    def window_resized(self, event: "tkinter.Event") -> None:
         """
-        Callback for when the window is resized.
+        Callback for when the window is resized. The frame is resized before the next
+        frame is rendered, so a burst of events while the window is dragged costs a
+        single resize.
 
         Args:
             event: The tkinter event.
         """
-        self.init(event.width, event.height)
+        # The binding on the window also receives the events of its widgets.
+        if event.widget is not self.window:
+            return
+        if (event.width, event.height) != (self.output_width, self.output_height):
+            self.pending_size = (event.width, event.height)
 
-    def loop(self) -> None:
-        """
-        The main rendering loop.
+    def render_frame(self, delta: float = None) -> np.ndarray:
         """
-        now = time.time()
-        delta = now - self.last_time
-
-        self.image.paste("black", (0, 0, self.width, self.height))
-        self.buffer[:, :, :] = self.clear_color.to_tuple()
-        self.zbuffer[:, :] = np.inf
+        Updates the scene and renders it into the buffer.
 
-        view_matrix = math.get_view_matrix(self.position, self.yaw, self.pitch)
+        The rendered frame is also available as a PIL image in image, which shares
+        its memory with the buffer and which update() can draw over. Frames are
+        rendered at the render scale; with dynamic resolution, the time this takes
+        sets the scale of the next frame.
 
-        for node, global_transform in self.scene.traverse():
-            node.update(delta)
-            if node.mesh is None:
-                continue
+        Args:
+            delta: The time step to update the scene with, in seconds. Defaults to the
+                time since the last frame.
 
-            mvp_matrix = self.projection_matrix @ view_matrix @ global_transform.get_matrix()
+        Returns:
+            The color buffer as an (height, width, 4) array of RGBA values.
+        """
+        now = time.time()
+        if delta is None:
+            delta = now - self.last_time
+        profiler = self.profiler
+        if self.pending_size is not None:
+            size, self.pending_size = self.pending_size, None
+            self.init(*size)
+        self.frame_input_time, self.input_time = self.input_time, None
+        start = time.perf_counter()
+
+        with profiler.frame():
+            with profiler.stage("clear"):
+                self.target.clear(self.clear_color.to_tuple())
+
+            view_matrix = math.get_view_matrix(self.position, float(self.yaw), float(self.pitch))
+            view_projection_matrix = self.projection_matrix @ view_matrix
+            frustum_planes = math.get_frustum_planes(view_projection_matrix)
+            self.culled_nodes = 0
+
+            items = list()
+            with profiler.stage("traversal"):
+                for node, world_matrix in self.scene.traverse():
+                    with profiler.stage("node_update"):
+                        node.update(delta)
+                    if node.mesh is not None:
+                        items.append((node, world_matrix))
+
+            if self.frustum_culling:
+                with profiler.stage("culling"):
+                    self.scene_index.update(items)
+                    visible = self.scene_index.bvh.query_frustum(frustum_planes)
+                    self.culled_nodes = len(items) - len(visible)
+                    items = [items[i] for i in visible]
+            self.visible_nodes = len(items)
+
+            with profiler.stage("raster"):
+                self.rasterizer.begin(self.buffer, self.zbuffer)
 
             uniforms = {
-                "mvp_matrix": mvp_matrix,
+                "view_matrix": view_matrix,
+                "projection_matrix": self.projection_matrix,
+                "view_projection_matrix": view_projection_matrix,
+                "frustum_planes": frustum_planes if self.frustum_culling else None,
                 "width": self.width,
                 "height": self.height,
                 "buffer": self.buffer,
-                "zbuffer": self.zbuffer
+                "zbuffer": self.zbuffer,
+                "rasterizer": self.rasterizer,
+                "profiler": profiler
             }
 
-            vertices, indices = node.mesh.get_data()
+            with profiler.stage("vertex"):
+                for node, world_matrix in items:
+                    node.draw(uniforms, world_matrix)
 
-            node.material.process(
-                uniforms,
-                vertices=vertices,
-                indices=indices,
-                colors=None
-            )
+            with profiler.stage("raster"):
+                self.rasterizer.end()
 
-        self.image = Image.fromarray(self.buffer, "RGBA")
-        self.update(delta)
-        self.photo.paste(self.image)
+            with profiler.stage("update"):
+                self.update(delta)
+            if self.profiler_overlay:
+                with profiler.stage("overlay"):
+                    profiler.draw_overlay(self.image)
 
+        if self.resolution_controller is not None:
+            scale = self.resolution_controller.update(
+                self.render_scale, time.perf_counter() - start)
+            if scale != self.render_scale:
+                self.set_render_scale(scale)
         self.last_time = now
+        return self.buffer
+
+    def present(self) -> "Image.Image | None":
+        """
+        Shows the newest finished frame in the window, if there is one, and records
+        input latency and the time between presented frames in the profiler.
+
+        Frames rendered below the window size are upscaled with upscale_filter,
+        nearest-neighbor by default, since smoothing filters cost more than they save.
+
+        Returns:
+            The image of the frame at the render resolution, or None if a threaded
+            engine has not finished a frame since the last call.
+        """
+        if self.swap_chain is not None:
+            taken = self.swap_chain.take()
+            if taken is None:
+                return None
+            target, input_time = taken
+        else:
+            target, input_time = self.target, self.frame_input_time
+
+        if self.window is not None:
+            size = (self.output_width, self.output_height)
+            image = target.image
+            if image.size != size:
+                image = image.resize(size, self.upscale_filter)
+            if self.window.frame is None or self.window.frame.size != size:
+                self.window.resize(*size, "RGBA" if self.alpha else "RGB")
+                self.photo = self.window.photo
+            self.window.present(image)
+
+        now = time.perf_counter()
+        if input_time is not None:
+            self.profiler.add_sample("input_latency", now - input_time)
+        if self.present_time is not None:
+            self.profiler.add_sample("present_interval", now - self.present_time)
+        self.present_time = now
+        return target.image
+
+    def loop(self) -> None:
+        """
+        The main rendering loop.
+        """
+        if not self.running:
+            self.stop()
+            return
+        now = time.time()
+
+        if self.threaded:
+            start = time.perf_counter()
+            if self.present() is not None:
+                self.profiler.add_sample("present", time.perf_counter() - start)
+        else:
+            with self.profiler.frame():
+                self.render_frame()
+                with self.profiler.stage("present"):
+                    self.present()
+            if self.window is None:
+                return
+
         self.window.after(
             max(1, int(self.frame_time - 1000 * (time.time() - now))),
             self.loop
@@ -6,6 +6,7 @@ import numpy as np
 
 from . import math
 from .color import *
+from .profiler import DISABLED
 
 
 class Material:  # TODO: add more built-in materials (lighting, texture)
@@ -41,67 +42,117 @@ class Material:  # TODO: add more built-in materials (lighting, texture)
         """
         raise NotImplementedError
 
-    def process(self, uniforms: dict, **kwargs) -> None:
+    def vertex_batch(self, attributes: dict, uniforms: dict) -> tuple[np.ndarray, dict]:
         """
-        Processes a mesh and renders it to the screen.
+        Processes all vertices of a mesh at once.
+
+        The default implementation falls back to calling vertex() once per vertex,
+        so materials that only implement the per-vertex contract keep working.
+        Materials that care about throughput should override this with array code.
 
         Args:
+            attributes: The attributes of the vertices, each holding one entry per vertex.
             uniforms: The uniforms for the shader.
-            **kwargs: Additional data for the mesh (vertices, indices).
+
+        Returns:
+            A tuple containing the clip-space positions of the vertices as an (N, 4) array
+            and a dictionary of varyings, each holding one entry per vertex.
         """
-        vertices = kwargs["vertices"]
-        indices = kwargs["indices"]
+        positions = attributes["position"]
+        colors = attributes["color"]
 
-        attributes = {
+        positions_clip = np.empty((len(positions), 4), dtype=np.float32)
+        varyings = dict()
+
+        vertex_attributes = {
             "position": None,
             "color": None
         }
 
-        varyings_list = [dict() for _ in range(len(vertices))]
+        for i, position in enumerate(positions):
+            vertex_attributes["position"] = position
+            vertex_attributes["color"] = colors[i] if colors is not None else None
+
+            positions_clip[i], vertex_varyings = self.vertex(
+                vertex_attributes, uniforms)
+            for name, value in vertex_varyings.items():
+                varyings.setdefault(name, [None] * len(positions))[i] = value
 
-        positions_clip = np.empty((len(vertices), 4), dtype=np.float32)
+        return positions_clip, varyings
 
-        for i, vertex in enumerate(vertices):
-            attributes["position"] = vertex
-            attributes["color"] = None
+    def fragment_batch(self, varyings: dict, uniforms: dict) -> np.ndarray:
+        """
+        Processes the varyings of all vertices at once.
 
-            positions_clip[i], varyings_list[i] = self.vertex(
-                attributes, uniforms)
+        The default implementation falls back to calling fragment() once per vertex.
+
+        Args:
+            varyings: The varyings of the vertices, each holding one entry per vertex.
+            uniforms: The uniforms for the shader.
+
+        Returns:
+            The colors of the vertices as an (N, 4) array of uint8.
+        """
+        count = len(next(iter(varyings.values()))) if varyings else 0
+        colors = np.empty((count, 4), dtype=np.uint8)
+        for i in range(count):
+            colors[i] = self.fragment(
+                {name: values[i] for name, values in varyings.items()},
+                uniforms
+            ).to_numpy()
+        return colors
+
+    def process(self, uniforms: dict, **kwargs) -> None:
+        """
+        Processes a mesh and renders it to the screen.
+
+        Args:
+            uniforms: The uniforms for the shader.
+            **kwargs: Additional data for the mesh (vertices, indices, colors).
+        """
+        vertices = kwargs["vertices"]
+        indices = kwargs["indices"]
+
+        if len(vertices) == 0 or len(indices) == 0:
+            return
+
+        attributes = {
+            "position": vertices,
+            "color": kwargs.get("colors")
+        }
+
+        positions_clip, varyings = self.vertex_batch(attributes, uniforms)
+        colors = np.ascontiguousarray(
+            self.fragment_batch(varyings, uniforms), dtype=np.uint8)
 
         screen_coords, w_coords = math.clip_to_screen(
-            positions_clip,
+            np.ascontiguousarray(positions_clip, dtype=np.float32),
             uniforms["width"],
             uniforms["height"]
         )
 
-        for triangle in indices:
-            w0, w1, w2 = w_coords[triangle[0],
-                                  0], w_coords[triangle[1], 0], w_coords[triangle[2], 0]
-            if w0 <= 0 or w1 <= 0 or w2 <= 0:
-                continue
-
-            p0, p1, p2 = screen_coords[triangle[0]
-                                       ], screen_coords[triangle[1]], screen_coords[triangle[2]]
+        profiler = uniforms.get("profiler")
+        with profiler.stage("raster") if profiler is not None else DISABLED:
+            rasterizer = uniforms.get("rasterizer")
+            if rasterizer is not None:
+                rasterizer.submit(screen_coords, w_coords, indices, colors)
+                return
 
-            if math.is_back_facing(p0, p1, p2):
-                continue
-
-            c0 = self.fragment(varyings_list[triangle[0]], uniforms).to_numpy()
-            c1 = self.fragment(varyings_list[triangle[1]], uniforms).to_numpy()
-            c2 = self.fragment(varyings_list[triangle[2]], uniforms).to_numpy()
-
-            math.draw_triangle(
+            math.draw_mesh(
                 uniforms["buffer"],
                 uniforms["zbuffer"],
-                p0, p1, p2,
-                c0, c1, c2,
-                w0, w1, w2
+                screen_coords,
+                w_coords,
+                indices,
+                colors
             )
 
 
 class MeshColorMaterial(Material):
     """
     A simple material that renders a mesh with a solid color.
+
+    Per-vertex colors passed to process() take precedence over the material's color.
     """
 
     def __init__(self, color: Color = Colors.WHITE):
@@ -146,3 +197,40 @@ class MeshColorMaterial(Material):
             The color of the fragment.
         """
         return varyings["color"]
+
+    def vertex_batch(self, attributes: dict, uniforms: dict) -> tuple[np.ndarray, dict]:
+        """
+        Processes all vertices of a mesh at once.
+
+        Args:
+            attributes: The attributes of the vertices, each holding one entry per vertex.
+            uniforms: The uniforms for the shader.
+
+        Returns:
+            A tuple containing the clip-space positions of the vertices as an (N, 4) array
+            and a dictionary of varyings, each holding one entry per vertex.
+        """
+        positions = attributes["position"]
+        colors = attributes["color"]
+
+        positions_clip = math.transform_vertices(
+            positions, uniforms["mvp_matrix"])
+
+        varyings = {
+            "color": colors if colors is not None else np.broadcast_to(
+                self.color.to_numpy(), (len(positions), 4))
+        }
+        return positions_clip, varyings
+
+    def fragment_batch(self, varyings: dict, uniforms: dict) -> np.ndarray:
+        """
+        Processes the varyings of all vertices at once.
+
+        Args:
+            varyings: The varyings of the vertices, each holding one entry per vertex.
+            uniforms: The uniforms for the shader.
+
+        Returns:
+            The colors of the vertices as an (N, 4) array of uint8.
+        """
+        return varyings["color"]
@@ -105,7 +105,7 @@ def transform_vertex(vertex: np.ndarray, mvp_matrix: np.ndarray) -> np.ndarray:
     return vertex_clip
 
 
-@nb.njit(cache=True)
+@nb.njit(cache=True, nogil=True)
 def transform_vertices(vertices: np.ndarray, mvp_matrix: np.ndarray) -> np.ndarray:
     """
     Transforms multiple vertices by a matrix.
@@ -125,11 +125,13 @@ def transform_vertices(vertices: np.ndarray, mvp_matrix: np.ndarray) -> np.ndarr
     return vertices_clip
 
 
-@nb.njit(cache=True)
+@nb.njit(cache=True, nogil=True)
 def clip_to_screen(vertices_clip: np.ndarray, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
     """
     Converts clip-space coordinates to screen coordinates.
 
+    Screen coordinates keep their subpixel precision; pixel (x, y) covers [x, x + 1) x [y, y + 1).
+
     Args:
         vertices_clip: The vertices in clip space.
         width: The width of the viewport.
@@ -140,11 +142,9 @@ def clip_to_screen(vertices_clip: np.ndarray, width: int, height: int) -> tuple[
     """
     w_coords = vertices_clip[:, 3:4]
     vertices_ndc = vertices_clip[:, :3] / w_coords
-    screen_coords = np.empty((len(vertices_ndc), 2), dtype=np.int32)
-    screen_coords[:, 0] = ((vertices_ndc[:, 0] + 1) *
-                           0.5 * width).astype(np.int32)
-    screen_coords[:, 1] = (
-        (1 - (vertices_ndc[:, 1] + 1) * 0.5) * height).astype(np.int32)
+    screen_coords = np.empty((len(vertices_ndc), 2), dtype=np.float32)
+    screen_coords[:, 0] = (vertices_ndc[:, 0] + 1) * 0.5 * width
+    screen_coords[:, 1] = (1 - (vertices_ndc[:, 1] + 1) * 0.5) * height
     return screen_coords, w_coords
 
 
@@ -222,11 +222,152 @@ def is_back_facing(p0, p1, p2) -> bool:
     return float(edge1[0]) * float(edge2[1]) - float(edge1[1]) * float(edge2[0]) >= 0
 
 
-@nb.njit(cache=True, parallel=True)
+SUBPIXEL_BITS = 4
+"""
+The number of fractional bits of the fixed-point screen coordinates used for rasterization.
+"""
+
+SUBPIXEL_SCALE = 1 << SUBPIXEL_BITS
+"""
+The number of fixed-point steps per pixel.
+"""
+
+GUARD_BAND = 1 << 22
+"""
+The largest screen coordinate, in pixels, of a triangle that will be rasterized.
+"""
+
+
+@nb.njit(cache=True)
+def is_top_left_edge(x0: int, y0: int, x1: int, y1: int) -> bool:
+    """
+    Checks if an edge is a top or a left edge of a clockwise (on screen) triangle.
+
+    Pixels whose centers lie exactly on a shared edge belong to the triangle for which
+    the edge is a top or a left edge, so they are drawn exactly once.
+
+    Args:
+        x0, y0: The fixed-point start of the edge.
+        x1, y1: The fixed-point end of the edge.
+
+    Returns:
+        True if the edge is a top or a left edge, False otherwise.
+    """
+    return (y0 == y1 and x1 > x0) or y1 < y0
+
+
+@nb.njit(cache=True, nogil=True)
+def rasterize_triangle(buffer, zbuffer, p0, p1, p2, c0, c1, c2, w0, w1, w2, x_start, y_start, x_end, y_end):
+    """
+    Draws a filled and depth-tested triangle on the calling thread.
+
+    The vertices are snapped to fixed-point subpixel coordinates and the edge functions
+    and perspective terms are set up once, then stepped incrementally across the
+    covered pixels. Shared edges follow the top-left fill rule. Only pixels inside the
+    given region are touched, which makes this suitable for calling many times from
+    other compiled code.
+
+    Args:
+        buffer: The color buffer to draw to.
+        zbuffer: The depth buffer for depth testing.
+        p0, p1, p2: The screen-space vertices of the triangle.
+        c0, c1, c2: The colors of the vertices.
+        w0, w1, w2: The w-coordinates of the vertices.
+        x_start, y_start: The top-left corner of the region to draw to.
+        x_end, y_end: The exclusive bottom-right corner of the region to draw to.
+    """
+    for value in (p0[0], p0[1], p1[0], p1[1], p2[0], p2[1]):
+        if not abs(value) < GUARD_BAND:
+            return
+
+    x0 = np.int64(np.floor(p0[0] * SUBPIXEL_SCALE + 0.5))
+    y0 = np.int64(np.floor(p0[1] * SUBPIXEL_SCALE + 0.5))
+    x1 = np.int64(np.floor(p1[0] * SUBPIXEL_SCALE + 0.5))
+    y1 = np.int64(np.floor(p1[1] * SUBPIXEL_SCALE + 0.5))
+    x2 = np.int64(np.floor(p2[0] * SUBPIXEL_SCALE + 0.5))
+    y2 = np.int64(np.floor(p2[1] * SUBPIXEL_SCALE + 0.5))
+
+    area = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+    if area == 0:
+        return
+    if area < 0:
+        x1, y1, x2, y2 = x2, y2, x1, y1
+        c1, c2 = c2, c1
+        w1, w2 = w2, w1
+        area = -area
+
+    half = SUBPIXEL_SCALE // 2
+    min_x = max((min(x0, x1, x2) - half + SUBPIXEL_SCALE - 1) >>
+                SUBPIXEL_BITS, x_start)
+    max_x = min((max(x0, x1, x2) - half) >> SUBPIXEL_BITS, x_end - 1)
+    min_y = max((min(y0, y1, y2) - half + SUBPIXEL_SCALE - 1) >>
+                SUBPIXEL_BITS, y_start)
+    max_y = min((max(y0, y1, y2) - half) >> SUBPIXEL_BITS, y_end - 1)
+    if min_x > max_x or min_y > max_y:
+        return
+
+    bias0 = 0 if is_top_left_edge(x1, y1, x2, y2) else -1
+    bias1 = 0 if is_top_left_edge(x2, y2, x0, y0) else -1
+    bias2 = 0 if is_top_left_edge(x0, y0, x1, y1) else -1
+
+    step_x0 = (y1 - y2) * SUBPIXEL_SCALE
+    step_x1 = (y2 - y0) * SUBPIXEL_SCALE
+    step_x2 = (y0 - y1) * SUBPIXEL_SCALE
+    step_y0 = (x2 - x1) * SUBPIXEL_SCALE
+    step_y1 = (x0 - x2) * SUBPIXEL_SCALE
+    step_y2 = (x1 - x0) * SUBPIXEL_SCALE
+
+    px = min_x * SUBPIXEL_SCALE + half
+    py = min_y * SUBPIXEL_SCALE + half
+    row0 = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+    row1 = (x0 - x2) * (py - y2) - (y0 - y2) * (px - x2)
+    row2 = (x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)
+
+    channels = buffer.shape[2]
+    scale0 = 1.0 / (w0 * area)
+    scale1 = 1.0 / (w1 * area)
+    scale2 = 1.0 / (w2 * area)
+
+    for y in range(min_y, max_y + 1):
+        e0 = row0
+        e1 = row1
+        e2 = row2
+        for x in range(min_x, max_x + 1):
+            if e0 + bias0 >= 0 and e1 + bias1 >= 0 and e2 + bias2 >= 0:
+                l0 = e0 * scale0
+                l1 = e1 * scale1
+                l2 = e2 * scale2
+                inv_w_interp = l0 + l1 + l2
+
+                if inv_w_interp > 0:
+                    w_interp = 1.0 / inv_w_interp
+
+                    if w_interp < zbuffer[y, x]:
+                        zbuffer[y, x] = w_interp
+
+                        for ch in range(channels):
+                            val = (l0 * c0[ch] + l1 * c1[ch] +
+                                   l2 * c2[ch]) * w_interp + 0.5
+                            if val < 0:
+                                val = 0
+                            elif val > 255:
+                                val = 255
+                            buffer[y, x, ch] = val
+            e0 += step_x0
+            e1 += step_x1
+            e2 += step_x2
+        row0 += step_y0
+        row1 += step_y1
+        row2 += step_y2
+
+
+@nb.njit(cache=True, parallel=True, nogil=True)
 def draw_triangle(buffer, zbuffer, p0, p1, p2, c0, c1, c2, w0, w1, w2):
     """
     Draws a filled, textured, and depth-tested triangle.
 
+    The rows of the triangle are rasterized in parallel.
+
     Args:
         buffer: The color buffer to draw to.
         zbuffer: The depth buffer for depth testing.
@@ -235,35 +376,509 @@ def draw_triangle(buffer, zbuffer, p0, p1, p2, c0, c1, c2, w0, w1, w2):
         w0, w1, w2: The w-coordinates of the vertices.
     """
     height, width, channels = buffer.shape
-    min_x = max(int(min(p0[0], p1[0], p2[0])), 0)
-    max_x = min(int(max(p0[0], p1[0], p2[0])), width - 1)
-    min_y = max(int(min(p0[1], p1[1], p2[1])), 0)
-    max_y = min(int(max(p0[1], p1[1], p2[1])), height - 1)
+    min_y = max(int(np.floor(min(p0[1], p1[1], p2[1]))), 0)
+    max_y = min(int(np.ceil(max(p0[1], p1[1], p2[1]))), height - 1)
 
     for y in nb.prange(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            u, v, w = barycentric_weights(x + 0.5, y + 0.5, p0, p1, p2)
-            if u >= 0 and v >= 0 and w >= 0:
+        rasterize_triangle(
+            buffer, zbuffer,
+            p0, p1, p2,
+            c0, c1, c2,
+            w0, w1, w2,
+            0, y, width, y + 1
+        )
 
-                inv_w0 = 1.0 / w0
-                inv_w1 = 1.0 / w1
-                inv_w2 = 1.0 / w2
 
-                inv_w_interp = u * inv_w0 + v * inv_w1 + w * inv_w2
+@nb.njit(cache=True, nogil=True)
+def draw_mesh(buffer, zbuffer, screen_coords, w_coords, indices, colors) -> int:
+    """
+    Culls and draws every triangle of a mesh in a single call.
 
-                if inv_w_interp == 0:
-                    continue
+    Triangles with a vertex behind the camera and back-facing triangles are skipped.
 
-                w_interp = 1.0 / inv_w_interp
+    Args:
+        buffer: The color buffer to draw to.
+        zbuffer: The depth buffer for depth testing.
+        screen_coords: The screen-space vertices as an (N, 2) array.
+        w_coords: The w-coordinates of the vertices as an (N, 1) array.
+        indices: The triangles as an (M, 3) array of vertex indices.
+        colors: The colors of the vertices as an (N, 4) array.
+
+    Returns:
+        The number of triangles drawn.
+    """
+    height, width = zbuffer.shape
+    drawn = 0
+    for t in range(indices.shape[0]):
+        i0 = indices[t, 0]
+        i1 = indices[t, 1]
+        i2 = indices[t, 2]
+
+        w0 = w_coords[i0, 0]
+        w1 = w_coords[i1, 0]
+        w2 = w_coords[i2, 0]
+        if w0 <= 0 or w1 <= 0 or w2 <= 0:
+            continue
+
+        p0 = screen_coords[i0]
+        p1 = screen_coords[i1]
+        p2 = screen_coords[i2]
+        if is_back_facing(p0, p1, p2):
+            continue
+
+        rasterize_triangle(
+            buffer, zbuffer,
+            p0, p1, p2,
+            colors[i0], colors[i1], colors[i2],
+            w0, w1, w2,
+            0, 0, width, height
+        )
+        drawn += 1
+    return drawn
+
+
+@nb.njit(cache=True, nogil=True)
+def bin_triangles(screen_coords, w_coords, indices, width, height, tile_size):
+    """
+    Sorts the triangles of a frame into the screen tiles they overlap.
+
+    Triangles with a vertex behind the camera, back-facing triangles and triangles
+    outside the screen are not put into any tile. Within a tile, triangles keep
+    their submission order.
+
+    Args:
+        screen_coords: The screen-space vertices as an (N, 2) array.
+        w_coords: The w-coordinates of the vertices as an (N, 1) array.
+        indices: The triangles as an (M, 3) array of vertex indices.
+        width: The width of the screen.
+        height: The height of the screen.
+        tile_size: The width and height of a tile in pixels.
+
+    Returns:
+        A tuple containing the offsets of each tile's run in the triangle list
+        (one more entry than there are tiles, in row-major order) and the triangle list.
+    """
+    tiles_x = (width + tile_size - 1) // tile_size
+    tiles_y = (height + tile_size - 1) // tile_size
+    count = indices.shape[0]
+
+    tile_bounds = np.full((count, 4), -1, dtype=np.int32)
+    offsets = np.zeros(tiles_x * tiles_y + 1, dtype=np.int64)
+
+    for t in range(count):
+        i0 = indices[t, 0]
+        i1 = indices[t, 1]
+        i2 = indices[t, 2]
+
+        if w_coords[i0, 0] <= 0 or w_coords[i1, 0] <= 0 or w_coords[i2, 0] <= 0:
+            continue
+
+        p0 = screen_coords[i0]
+        p1 = screen_coords[i1]
+        p2 = screen_coords[i2]
+        if is_back_facing(p0, p1, p2):
+            continue
+
+        min_x = max(int(min(p0[0], p1[0], p2[0])), 0)
+        max_x = min(int(max(p0[0], p1[0], p2[0])), width - 1)
+        min_y = max(int(min(p0[1], p1[1], p2[1])), 0)
+        max_y = min(int(max(p0[1], p1[1], p2[1])), height - 1)
+        if min_x > max_x or min_y > max_y:
+            continue
+
+        tile_bounds[t, 0] = min_x // tile_size
+        tile_bounds[t, 1] = min_y // tile_size
+        tile_bounds[t, 2] = max_x // tile_size
+        tile_bounds[t, 3] = max_y // tile_size
+        for ty in range(tile_bounds[t, 1], tile_bounds[t, 3] + 1):
+            for tx in range(tile_bounds[t, 0], tile_bounds[t, 2] + 1):
+                offsets[ty * tiles_x + tx + 1] += 1
+
+    for tile in range(tiles_x * tiles_y):
+        offsets[tile + 1] += offsets[tile]
+
+    triangles = np.empty(offsets[-1], dtype=np.int64)
+    cursors = offsets[:-1].copy()
+    for t in range(count):
+        if tile_bounds[t, 0] < 0:
+            continue
+        for ty in range(tile_bounds[t, 1], tile_bounds[t, 3] + 1):
+            for tx in range(tile_bounds[t, 0], tile_bounds[t, 2] + 1):
+                tile = ty * tiles_x + tx
+                triangles[cursors[tile]] = t
+                cursors[tile] += 1
+
+    return offsets, triangles
+
+
+@nb.njit(cache=True, nogil=True)
+def draw_tile(buffer, zbuffer, screen_coords, w_coords, indices, colors, offsets, triangles, tile_size, tile) -> None:
+    """
+    Draws the binned triangles of one screen tile, touching only its pixels.
+
+    Args:
+        buffer: The color buffer to draw to.
+        zbuffer: The depth buffer for depth testing.
+        screen_coords: The screen-space vertices as an (N, 2) array.
+        w_coords: The w-coordinates of the vertices as an (N, 1) array.
+        indices: The triangles as an (M, 3) array of vertex indices.
+        colors: The colors of the vertices as an (N, 4) array.
+        offsets: The tile offsets returned by bin_triangles.
+        triangles: The triangle list returned by bin_triangles.
+        tile_size: The width and height of a tile in pixels.
+        tile: The row-major index of the tile.
+    """
+    height, width = zbuffer.shape
+    tiles_x = (width + tile_size - 1) // tile_size
+    x_start = (tile % tiles_x) * tile_size
+    y_start = (tile // tiles_x) * tile_size
+    x_end = min(x_start + tile_size, width)
+    y_end = min(y_start + tile_size, height)
+
+    for k in range(offsets[tile], offsets[tile + 1]):
+        t = triangles[k]
+        i0 = indices[t, 0]
+        i1 = indices[t, 1]
+        i2 = indices[t, 2]
+        rasterize_triangle(
+            buffer, zbuffer,
+            screen_coords[i0], screen_coords[i1], screen_coords[i2],
+            colors[i0], colors[i1], colors[i2],
+            w_coords[i0, 0], w_coords[i1, 0], w_coords[i2, 0],
+            x_start, y_start, x_end, y_end
+        )
+
+
+@nb.njit(cache=True, parallel=True, nogil=True)
+def draw_tiles(buffer, zbuffer, screen_coords, w_coords, indices, colors, offsets, triangles, tile_size):
+    """
+    Draws binned triangles, rasterizing the screen tiles in parallel.
 
-                if w_interp < zbuffer[y, x]:
-                    zbuffer[y, x] = w_interp
+    Every tile is drawn by exactly one thread and only touches its own pixels,
+    so no synchronization between threads is needed.
 
-                    for ch in range(channels):
-                        val = (u * c0[ch] * inv_w0 + v * c1[ch] *
-                               inv_w1 + w * c2[ch] * inv_w2) * w_interp
-                        if val < 0:
-                            val = 0
-                        elif val > 255:
-                            val = 255
-                        buffer[y, x, ch] = val
+    Args:
+        buffer: The color buffer to draw to.
+        zbuffer: The depth buffer for depth testing.
+        screen_coords: The screen-space vertices as an (N, 2) array.
+        w_coords: The w-coordinates of the vertices as an (N, 1) array.
+        indices: The triangles as an (M, 3) array of vertex indices.
+        colors: The colors of the vertices as an (N, 4) array.
+        offsets: The tile offsets returned by bin_triangles.
+        triangles: The triangle list returned by bin_triangles.
+        tile_size: The width and height of a tile in pixels.
+    """
+    for tile in nb.prange(offsets.shape[0] - 1):
+        draw_tile(buffer, zbuffer, screen_coords, w_coords, indices,
+                  colors, offsets, triangles, tile_size, tile)
+
+
+@nb.njit(cache=True, nogil=True)
+def draw_tile_range(buffer, zbuffer, screen_coords, w_coords, indices, colors, offsets, triangles, tile_size, start, end):
+    """
+    Draws the binned triangles of a range of screen tiles on the calling thread.
+
+    Args:
+        buffer: The color buffer to draw to.
+        zbuffer: The depth buffer for depth testing.
+        screen_coords: The screen-space vertices as an (N, 2) array.
+        w_coords: The w-coordinates of the vertices as an (N, 1) array.
+        indices: The triangles as an (M, 3) array of vertex indices.
+        colors: The colors of the vertices as an (N, 4) array.
+        offsets: The tile offsets returned by bin_triangles.
+        triangles: The triangle list returned by bin_triangles.
+        tile_size: The width and height of a tile in pixels.
+        start: The row-major index of the first tile.
+        end: The row-major index after the last tile.
+    """
+    for tile in range(start, end):
+        draw_tile(buffer, zbuffer, screen_coords, w_coords, indices,
+                  colors, offsets, triangles, tile_size, tile)
+
+
+@nb.njit(cache=True, parallel=True, nogil=True)
+def compose_matrices(positions, rotations, scales, out) -> None:
+    """
+    Builds the transformation matrices of many transforms at once.
+
+    Each matrix is translation @ rotation_z @ rotation_y @ rotation_x @ scale, the same
+    as Transform.get_matrix.
+
+    Args:
+        positions: The positions as an (N, 3) array.
+        rotations: The rotations (pitch, yaw, roll) in radians as an (N, 3) array.
+        scales: The scales as an (N, 3) array.
+        out: The (N, 4, 4) array to write the matrices to.
+    """
+    for i in nb.prange(positions.shape[0]):
+        cx = np.cos(rotations[i, 0])
+        sx = np.sin(rotations[i, 0])
+        cy = np.cos(rotations[i, 1])
+        sy = np.sin(rotations[i, 1])
+        cz = np.cos(rotations[i, 2])
+        sz = np.sin(rotations[i, 2])
+        scale_x = scales[i, 0]
+        scale_y = scales[i, 1]
+        scale_z = scales[i, 2]
+
+        out[i, 0, 0] = cz * cy * scale_x
+        out[i, 0, 1] = (cz * sy * sx - sz * cx) * scale_y
+        out[i, 0, 2] = (cz * sy * cx + sz * sx) * scale_z
+        out[i, 0, 3] = positions[i, 0]
+        out[i, 1, 0] = sz * cy * scale_x
+        out[i, 1, 1] = (sz * sy * sx + cz * cx) * scale_y
+        out[i, 1, 2] = (sz * sy * cx - cz * sx) * scale_z
+        out[i, 1, 3] = positions[i, 1]
+        out[i, 2, 0] = -sy * scale_x
+        out[i, 2, 1] = cy * sx * scale_y
+        out[i, 2, 2] = cy * cx * scale_z
+        out[i, 2, 3] = positions[i, 2]
+        out[i, 3, 0] = 0
+        out[i, 3, 1] = 0
+        out[i, 3, 2] = 0
+        out[i, 3, 3] = 1
+
+
+@nb.njit(cache=True)
+def get_hierarchy_order(parents) -> np.ndarray:
+    """
+    Sorts the entries of a hierarchy so that every parent comes before its children.
+
+    Args:
+        parents: The index of each entry's parent, or -1 for roots.
+
+    Returns:
+        The entry indices in topological order.
+    """
+    count = parents.shape[0]
+    depths = np.full(count, -1, dtype=np.int64)
+    stack = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        size = 0
+        node = i
+        while node >= 0 and depths[node] < 0:
+            if size == count:
+                raise ValueError("hierarchy contains a cycle")
+            stack[size] = node
+            size += 1
+            node = parents[node]
+        depth = depths[node] if node >= 0 else -1
+        while size > 0:
+            size -= 1
+            depth += 1
+            depths[stack[size]] = depth
+    return np.argsort(depths, kind="mergesort")
+
+
+@nb.njit(cache=True, nogil=True)
+def resolve_hierarchy(order, parents, local_matrices, world_matrices) -> None:
+    """
+    Computes the world matrices of a hierarchy from the local matrices.
+
+    Args:
+        order: The entry indices in topological order, as returned by get_hierarchy_order.
+        parents: The index of each entry's parent, or -1 for roots.
+        local_matrices: The local matrices as an (N, 4, 4) array.
+        world_matrices: The (N, 4, 4) array to write the world matrices to.
+    """
+    for i in order:
+        parent = parents[i]
+        if parent < 0:
+            world_matrices[i] = local_matrices[i]
+            continue
+        for row in range(4):
+            for col in range(4):
+                world_matrices[i, row, col] = (
+                    world_matrices[parent, row, 0] * local_matrices[i, 0, col] +
+                    world_matrices[parent, row, 1] * local_matrices[i, 1, col] +
+                    world_matrices[parent, row, 2] * local_matrices[i, 2, col] +
+                    world_matrices[parent, row, 3] * local_matrices[i, 3, col]
+                )
+
+
+@nb.njit(cache=True)
+def get_frustum_planes(matrix: np.ndarray) -> np.ndarray:
+    """
+    Extracts the six frustum planes from a view-projection matrix.
+
+    Args:
+        matrix: The view-projection matrix (projection @ view).
+
+    Returns:
+        A (6, 4) array of normalized planes (a, b, c, d), ordered left, right, bottom,
+        top, near, far. A point p is inside a plane when a * x + b * y + c * z + d >= 0.
+    """
+    planes = np.empty((6, 4), dtype=np.float32)
+    for i in range(3):
+        for j in range(4):
+            planes[2 * i, j] = matrix[3, j] + matrix[i, j]
+            planes[2 * i + 1, j] = matrix[3, j] - matrix[i, j]
+    for i in range(6):
+        norm = np.sqrt(planes[i, 0] ** 2 + planes[i, 1]
+                       ** 2 + planes[i, 2] ** 2)
+        if norm > 0:
+            planes[i] /= norm
+    return planes
+
+
+@nb.njit(cache=True)
+def transform_bounds(matrix, aabb_min, aabb_max, center, radius):
+    """
+    Transforms a bounding box and a bounding sphere by a matrix.
+
+    Args:
+        matrix: The 4x4 transformation matrix.
+        aabb_min: The minimum corner of the axis-aligned bounding box.
+        aabb_max: The maximum corner of the axis-aligned bounding box.
+        center: The center of the bounding sphere.
+        radius: The radius of the bounding sphere.
+
+    Returns:
+        A tuple containing the minimum and maximum corners of an axis-aligned box
+        enclosing the transformed box, and the center and radius of the transformed sphere.
+    """
+    world_min = np.empty(3, dtype=np.float32)
+    world_max = np.empty(3, dtype=np.float32)
+    world_center = np.empty(3, dtype=np.float32)
+    scale = 0.0
+    for i in range(3):
+        world_min[i] = matrix[i, 3]
+        world_max[i] = matrix[i, 3]
+        world_center[i] = matrix[i, 3]
+        for j in range(3):
+            a = matrix[i, j] * aabb_min[j]
+            b = matrix[i, j] * aabb_max[j]
+            world_min[i] += min(a, b)
+            world_max[i] += max(a, b)
+            world_center[i] += matrix[i, j] * center[j]
+        column = np.sqrt(matrix[0, i] ** 2 + matrix[1, i]
+                         ** 2 + matrix[2, i] ** 2)
+        scale = max(scale, column)
+    return world_min, world_max, world_center, radius * scale
+
+
+@nb.njit(cache=True)
+def is_sphere_in_frustum(planes, center, radius) -> bool:
+    """
+    Checks if a sphere is at least partially inside a frustum.
+
+    Args:
+        planes: The frustum planes, as returned by get_frustum_planes.
+        center: The center of the sphere.
+        radius: The radius of the sphere.
+
+    Returns:
+        False if the sphere is entirely outside the frustum, True otherwise.
+    """
+    for i in range(planes.shape[0]):
+        distance = (planes[i, 0] * center[0] + planes[i, 1] * center[1] +
+                    planes[i, 2] * center[2] + planes[i, 3])
+        if distance < -radius:
+            return False
+    return True
+
+
+@nb.njit(cache=True)
+def is_aabb_in_frustum(planes, aabb_min, aabb_max) -> bool:
+    """
+    Checks if an axis-aligned box is at least partially inside a frustum.
+
+    The test is conservative: boxes near a frustum corner may be reported as
+    inside even though they are not.
+
+    Args:
+        planes: The frustum planes, as returned by get_frustum_planes.
+        aabb_min: The minimum corner of the box.
+        aabb_max: The maximum corner of the box.
+
+    Returns:
+        False if the box is entirely outside the frustum, True otherwise.
+    """
+    for i in range(planes.shape[0]):
+        distance = planes[i, 3]
+        for j in range(3):
+            if planes[i, j] >= 0:
+                distance += planes[i, j] * aabb_max[j]
+            else:
+                distance += planes[i, j] * aabb_min[j]
+        if distance < 0:
+            return False
+    return True
+
+
+@nb.njit(cache=True)
+def is_mesh_in_frustum(planes, matrix, aabb_min, aabb_max, center, radius) -> bool:
+    """
+    Checks if the bounds of a mesh are at least partially inside a frustum.
+
+    Args:
+        planes: The frustum planes, as returned by get_frustum_planes.
+        matrix: The model matrix of the mesh.
+        aabb_min: The minimum corner of the mesh's bounding box in model space.
+        aabb_max: The maximum corner of the mesh's bounding box in model space.
+        center: The center of the mesh's bounding sphere in model space.
+        radius: The radius of the mesh's bounding sphere in model space.
+
+    Returns:
+        False if the mesh is entirely outside the frustum, True otherwise.
+    """
+    world_min, world_max, world_center, world_radius = transform_bounds(
+        matrix, aabb_min, aabb_max, center, radius)
+    if not is_sphere_in_frustum(planes, world_center, world_radius):
+        return False
+    return is_aabb_in_frustum(planes, world_min, world_max)
+
+
+@nb.njit(cache=True, parallel=True, nogil=True)
+def cull_instances(planes, matrices, center, radius) -> np.ndarray:
+    """
+    Tests the bounding spheres of many instances of a mesh against a frustum.
+
+    Args:
+        planes: The frustum planes, as returned by get_frustum_planes.
+        matrices: The world matrices of the instances as an (N, 4, 4) array.
+        center: The center of the mesh's bounding sphere in model space.
+        radius: The radius of the mesh's bounding sphere in model space.
+
+    Returns:
+        A boolean array that is True for the instances at least partially inside the frustum.
+    """
+    count = matrices.shape[0]
+    visible = np.empty(count, dtype=np.bool_)
+    for i in nb.prange(count):
+        world_center = np.empty(3, dtype=np.float32)
+        scale = 0.0
+        for row in range(3):
+            world_center[row] = (matrices[i, row, 0] * center[0] + matrices[i, row, 1] * center[1] +
+                                 matrices[i, row, 2] * center[2] + matrices[i, row, 3])
+            column = np.sqrt(matrices[i, 0, row] ** 2 + matrices[i, 1, row] ** 2 +
+                             matrices[i, 2, row] ** 2)
+            scale = max(scale, column)
+        visible[i] = is_sphere_in_frustum(planes, world_center, radius * scale)
+    return visible
+
+
+@nb.njit(cache=True, parallel=True, nogil=True)
+def transform_instances(vertices, matrices) -> np.ndarray:
+    """
+    Transforms the vertices of a mesh by the matrices of many instances.
+
+    Args:
+        vertices: The vertices of the mesh as a (V, 3) array.
+        matrices: The matrices of the instances as an (N, 4, 4) array.
+
+    Returns:
+        The transformed vertices of every instance, one after another, as an (N * V, 3) array.
+    """
+    count = vertices.shape[0]
+    out = np.empty((matrices.shape[0] * count, 3), dtype=np.float32)
+    for i in nb.prange(matrices.shape[0]):
+        for v in range(count):
+            for row in range(3):
+                out[i * count + v, row] = (
+                    matrices[i, row, 0] * vertices[v, 0] +
+                    matrices[i, row, 1] * vertices[v, 1] +
+                    matrices[i, row, 2] * vertices[v, 2] +
+                    matrices[i, row, 3]
+                )
+    return out
@@ -4,6 +4,11 @@ This module provides classes for creating and manipulating 3D meshes.
 
 import numpy as np
 import io
+import os
+import inspect
+import weakref
+
+from . import meshfile, obj, optimize, simplify
 
 
 class Mesh:
@@ -11,6 +16,11 @@ class Mesh:
     A base class for 3D meshes.
     """
 
+    shared = False
+    """
+    Whether the mesh is a shared instance whose data must not be changed.
+    """
+
     def __init__(
         self,
         vertices: list[list[float]],
@@ -25,6 +35,25 @@ class Mesh:
         """
         self.vertices = np.array(vertices, dtype=np.float32)
         self.indices = np.array(indices, dtype=np.uint32)
+        self.compute_bounds()
+
+    def compute_bounds(self) -> None:
+        """
+        Computes the axis-aligned bounding box and the bounding sphere of the mesh.
+
+        This is done once at construction; call it again after changing the vertices.
+        """
+        if len(self.vertices) == 0:
+            self.aabb_min = np.zeros(3, dtype=np.float32)
+            self.aabb_max = np.zeros(3, dtype=np.float32)
+        else:
+            self.aabb_min = self.vertices.min(axis=0)
+            self.aabb_max = self.vertices.max(axis=0)
+
+        self.bounding_center = (self.aabb_min + self.aabb_max) / 2
+        self.bounding_radius = float(np.sqrt(
+            ((self.vertices - self.bounding_center) ** 2).sum(axis=1).max()
+        )) if len(self.vertices) else 0.0
 
     def get_data(self) -> tuple[np.ndarray, np.ndarray]:
         """
@@ -35,8 +64,183 @@ class Mesh:
         """
         return self.vertices, self.indices
 
+    def copy(self) -> "Mesh":
+        """
+        Returns a copy of the mesh with its own, writable arrays.
+
+        Returns:
+            The copy.
+        """
+        mesh = type(self).__new__(type(self))
+        for name, value in vars(self).items():
+            setattr(mesh, name, value.copy() if isinstance(value, np.ndarray) else value)
+        mesh.shared = False
+        return mesh
+
+    def save(self, path: "str | os.PathLike") -> None:
+        """
+        Saves the mesh in the binary mesh format.
+
+        Args:
+            path: The path to write to.
+        """
+        meshfile.write_mesh(path, vars(self))
+
+    @classmethod
+    def load(cls, path: "str | os.PathLike") -> "Mesh":
+        """
+        Loads a mesh saved with save().
+
+        The arrays are memory-mapped from the file rather than copied, so they are
+        read-only and loading costs the same for any mesh size.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            The mesh.
+        """
+        mesh = cls.__new__(cls)
+        vars(mesh).update(meshfile.read_mesh(path))
+        return mesh
+
+    def optimize(self, tolerance: float = 1e-6, cache_size: int = 32) -> dict[str, float]:
+        """
+        Cleans up the mesh and reorders it for memory locality, in place.
+
+        Vertices closer than the tolerance are welded, triangles that collapse to a
+        line or point and vertices no triangle uses are removed, triangles are
+        reordered so that consecutive triangles share vertices, and vertices are
+        reordered by first use.
+
+        Args:
+            tolerance: The distance below which vertices are welded, or 0 to only weld
+                identical positions.
+            cache_size: The size of the vertex cache to order the triangles for.
+
+        Returns:
+            A report of the vertex and triangle counts and the average cache miss
+            ratio (vertices fetched per triangle) before and after.
+
+        Raises:
+            ValueError: If the mesh is shared. Optimize a copy() of it instead.
+        """
+        if self.shared:
+            raise ValueError("shared meshes cannot be changed, optimize a copy() instead")
+
+        report = {
+            "vertices_before": len(self.vertices),
+            "triangles_before": len(self.indices),
+            "acmr_before": optimize.get_cache_miss_ratio(
+                self.indices.reshape(-1, 3), len(self.vertices), cache_size)
+        }
+
+        vertices, remap = optimize.weld_vertices(self.vertices.reshape(-1, 3), tolerance)
+        indices = remap[self.indices.reshape(-1, 3)] if len(vertices) else \
+            np.empty((0, 3), dtype=np.int64)
+        valid = (indices[:, 0] != indices[:, 1]) & (indices[:, 1] != indices[:, 2]) & \
+            (indices[:, 0] != indices[:, 2])
+        triangles = np.flatnonzero(valid)
+        triangles = triangles[optimize.order_triangles(indices[triangles], len(vertices), cache_size)]
+        indices = indices[triangles]
+
+        used, first = np.unique(indices.reshape(-1), return_index=True)
+        order = used[np.argsort(first)]
+        remap = np.empty(len(vertices), dtype=np.int64)
+        remap[order] = np.arange(len(order))
+
+        self.vertices = vertices[order].astype(np.float32)
+        self.indices = remap[indices].astype(np.uint32).reshape(-1, 3)
+        for name in ("uv_indices", "normal_indices"):
+            if hasattr(self, name):
+                setattr(self, name, getattr(self, name)[triangles])
+        self.compute_bounds()
+
+        report["vertices_after"] = len(self.vertices)
+        report["triangles_after"] = len(self.indices)
+        report["acmr_after"] = optimize.get_cache_miss_ratio(
+            self.indices, len(self.vertices), cache_size)
+        return report
+
+    def simplify(self, target_triangles: int, aggressiveness: float = 7.0) -> "Mesh":
+        """
+        Returns a simplified copy of the mesh using quadric error metrics.
+
+        Open boundaries are preserved, so the result may keep more triangles than
+        requested if the boundary does not allow going lower.
+
+        Args:
+            target_triangles: The number of triangles to reduce the mesh to.
+            aggressiveness: How quickly the collapse error threshold grows. Lower
+                values give better quality at the cost of speed.
+
+        Returns:
+            The simplified mesh.
+        """
+        return self.simplify_chain([target_triangles], aggressiveness)[0]
+
+    def simplify_chain(self, targets: list[int], aggressiveness: float = 7.0) -> list["Mesh"]:
+        """
+        Returns simplified copies of the mesh for several triangle counts at once.
+
+        The levels are produced by a single simplification run that is snapshotted as
+        it passes each target, which is much faster than simplifying from scratch for
+        every level and suits LODNode.
 
-class CubeMesh(Mesh):
+        Args:
+            targets: The triangle counts to reduce the mesh to.
+            aggressiveness: How quickly the collapse error threshold grows.
+
+        Returns:
+            The simplified meshes, in the order of the given targets.
+        """
+        order = sorted(range(len(targets)), key=lambda i: -targets[i])
+        if len(self.indices) == 0 or not targets:
+            return [Mesh(self.vertices, self.indices.reshape(-1, 3)) for _ in targets]
+
+        vertex_levels, index_levels = simplify.simplify_mesh(
+            self.vertices,
+            self.indices,
+            np.array([targets[i] for i in order], dtype=np.int64),
+            float(aggressiveness)
+        )
+        levels = [None] * len(targets)
+        for i, vertices, indices in zip(order, vertex_levels, index_levels):
+            levels[i] = Mesh(vertices, indices)
+        return levels
+
+
+class SharedMesh(type):
+    """
+    A metaclass for meshes that are fully determined by their constructor arguments.
+
+    Constructing such a mesh again with the same arguments returns the existing
+    instance, as long as it is still in use somewhere, so any number of nodes can
+    use the same primitive without duplicating its data. The arrays of shared
+    meshes are read-only; use copy() to get a mesh that can be changed.
+    """
+
+    def __init__(cls, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        cls._instances = weakref.WeakValueDictionary()
+        cls._signature = inspect.signature(cls.__init__)
+
+    def __call__(cls, *args, **kwargs) -> Mesh:
+        bound = cls._signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.values())[1:]
+        mesh = cls._instances.get(key)
+        if mesh is None:
+            mesh = super().__call__(*args, **kwargs)
+            for array in vars(mesh).values():
+                if isinstance(array, np.ndarray):
+                    array.flags.writeable = False
+            mesh.shared = True
+            cls._instances[key] = mesh
+        return mesh
+
+
+class CubeMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a cube.
     """
@@ -66,7 +270,7 @@ class CubeMesh(Mesh):
         super().__init__(vertices, indices)
 
 
-class PyramidMesh(Mesh):
+class PyramidMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a pyramid with a triangular base.
     """
@@ -90,7 +294,7 @@ class PyramidMesh(Mesh):
         super().__init__(vertices, indices)
 
 
-class PyramidWithSquareBaseMesh(Mesh):
+class PyramidWithSquareBaseMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a pyramid with a square base.
     """
@@ -117,7 +321,7 @@ class PyramidWithSquareBaseMesh(Mesh):
         super().__init__(vertices, indices)
 
 
-class SphereMesh(Mesh):
+class SphereMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a sphere.
     """
@@ -129,31 +333,24 @@ class SphereMesh(Mesh):
         Args:
             segments: The number of segments to use for the sphere.
         """
-        vertices = []
-        indices = []
-
-        for i in range(segments + 1):
-            latitude = np.pi * i / segments
-            for j in range(segments + 1):
-                longitude = 2 * np.pi * j / segments
-                vertices.append([
-                    np.sin(latitude) * np.cos(longitude),
-                    np.cos(latitude),
-                    np.sin(latitude) * np.sin(longitude),
-                ])
-
-        for i in range(segments):
-            for j in range(segments):
-                x = i * (segments + 1) + j
-                y = x + segments + 1
-                indices.extend([
-                    [x, y, x + 1],
-                    [y, y + 1, x + 1]
-                ])
+        latitude, longitude = np.meshgrid(
+            np.pi * np.arange(segments + 1) / segments,
+            2 * np.pi * np.arange(segments + 1) / segments,
+            indexing="ij"
+        )
+        vertices = np.stack([
+            np.sin(latitude) * np.cos(longitude),
+            np.cos(latitude),
+            np.sin(latitude) * np.sin(longitude)
+        ], axis=-1).reshape(-1, 3)
+
+        x = (np.arange(segments)[:, None] * (segments + 1) + np.arange(segments)).reshape(-1)
+        y = x + segments + 1
+        indices = np.stack([x, y, x + 1, y, y + 1, x + 1], axis=1).reshape(-1, 3)
         super().__init__(vertices, indices)
 
 
-class ConeMesh(Mesh):
+class ConeMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a cone.
     """
@@ -165,32 +362,25 @@ class ConeMesh(Mesh):
         Args:
             segments: The number of segments to use for the cone base.
         """
-        top_vertex = [0.0, 0.5, 0.0]
-        base_vertices = []
-
-        for i in range(segments):
-            angle = 2 * np.pi * i / segments
-            x = 0.5 * np.cos(angle)
-            z = 0.5 * np.sin(angle)
-            base_vertices.append([x, -0.5, z])
-
-        base_center = [0.0, -0.5, 0.0]
-        vertices = [top_vertex] + base_vertices + [base_center]
-
-        indices = []
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            indices.append([0, i + 1, next_i + 1])
-
-        base_center_idx = len(vertices) - 1
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            indices.append([base_center_idx, next_i + 1, i + 1])
-
+        angles = 2 * np.pi * np.arange(segments) / segments
+        base_vertices = np.stack([
+            0.5 * np.cos(angles),
+            np.full(segments, -0.5),
+            0.5 * np.sin(angles)
+        ], axis=1)
+        vertices = np.concatenate([[[0.0, 0.5, 0.0]], base_vertices, [[0.0, -0.5, 0.0]]])
+
+        current = np.arange(segments) + 1
+        following = (np.arange(segments) + 1) % segments + 1
+        base_center_idx = segments + 1
+        indices = np.concatenate([
+            np.stack([np.zeros(segments, dtype=np.int64), current, following], axis=1),
+            np.stack([np.full(segments, base_center_idx), following, current], axis=1)
+        ])
         super().__init__(vertices, indices)
 
 
-class CylinderMesh(Mesh):
+class CylinderMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a cylinder.
     """
@@ -202,47 +392,32 @@ class CylinderMesh(Mesh):
         Args:
             segments: The number of segments to use for the cylinder caps.
         """
-        top_center = [0.0, 0.5, 0.0]
-        bottom_center = [0.0, -0.5, 0.0]
-        top_vertices = []
-        bottom_vertices = []
-
-        for i in range(segments):
-            angle = 2 * np.pi * i / segments
-            x = 0.5 * np.cos(angle)
-            z = 0.5 * np.sin(angle)
-            top_vertices.append([x, 0.5, z])
-            bottom_vertices.append([x, -0.5, z])
-
-        vertices = [top_center] + top_vertices + \
-            [bottom_center] + bottom_vertices
-
-        indices = []
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            indices.append([0, i + 1, next_i + 1])
-
-        bottom_center_idx = len(top_vertices) + 1
-        bottom_vertex_start = bottom_center_idx + 1
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            indices.append(
-                [bottom_center_idx, bottom_vertex_start + next_i, bottom_vertex_start + i])
-
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            top_idx = i + 1
-            next_top_idx = next_i + 1
-            bottom_idx = bottom_vertex_start + i
-            next_bottom_idx = bottom_vertex_start + next_i
-
-            indices.append([top_idx, bottom_idx, next_top_idx])
-            indices.append([next_top_idx, bottom_idx, next_bottom_idx])
-
+        angles = 2 * np.pi * np.arange(segments) / segments
+        x = 0.5 * np.cos(angles)
+        z = 0.5 * np.sin(angles)
+        top_vertices = np.stack([x, np.full(segments, 0.5), z], axis=1)
+        bottom_vertices = np.stack([x, np.full(segments, -0.5), z], axis=1)
+        vertices = np.concatenate([
+            [[0.0, 0.5, 0.0]],
+            top_vertices,
+            [[0.0, -0.5, 0.0]],
+            bottom_vertices
+        ])
+
+        top = np.arange(segments) + 1
+        next_top = (np.arange(segments) + 1) % segments + 1
+        bottom_center_idx = segments + 1
+        bottom = top + bottom_center_idx
+        next_bottom = next_top + bottom_center_idx
+        indices = np.concatenate([
+            np.stack([np.zeros(segments, dtype=np.int64), top, next_top], axis=1),
+            np.stack([np.full(segments, bottom_center_idx), next_bottom, bottom], axis=1),
+            np.stack([top, bottom, next_top, next_top, bottom, next_bottom], axis=1).reshape(-1, 3)
+        ])
         super().__init__(vertices, indices)
 
 
-class PlaneMesh(Mesh):
+class PlaneMesh(Mesh, metaclass=SharedMesh):
     """
     A mesh representing a plane.
     """
@@ -264,39 +439,60 @@ class PlaneMesh(Mesh):
         super().__init__(vertices, indices)
 
 
+OBJ_CACHE_SALT = b"obj-1"
+"""
+Hashed along with OBJ files for their cache entries. Change it when the parser
+output changes to invalidate old entries.
+"""
+
+
 class OBJMesh(Mesh):
     """
     A mesh loaded from an OBJ file.
+
+    Besides the positions used for drawing, the texture coordinates and normals of
+    the file are kept in uvs and normals, and each triangle corner's indices into
+    them in uv_indices and normal_indices (-1 where a face does not give one).
     """
 
-    def __init__(self, file: io.TextIOWrapper) -> None:
+    def __init__(
+        self,
+        file: "str | os.PathLike | bytes | io.IOBase",
+        chunk_size: int = obj.CHUNK_SIZE,
+        cache: bool = True
+    ) -> None:
         """
         Initializes the mesh from an OBJ file.
 
-        Args:
-            file: A file-like object containing the OBJ data.
-        """
-        vertices = []
-        indices = []
-
-        with file:  # TODO: implement MTL parser?
-            for line in file:
-                parts = line.strip().split()
-                if not parts:
-                    continue
-                if parts[0] == "v":
-                    vertices.append([float(coord) for coord in parts[1:4]])
-                elif parts[0] == "f":
-                    buffer = [
-                        int(part.split("/")[0])
-                        -
-                        1 for part in parts[1:]
-                    ]
-                    if len(buffer) == 3:
-                        indices.append(buffer)
-                    elif len(buffer) > 3:
-                        for i in range(1, len(buffer) - 1):
-                            indices.append(
-                                [buffer[0], buffer[i], buffer[i + 1]])
+        Files given by path are cached in the binary mesh format, keyed by a hash of
+        their contents, and later loads map the cached copy instead of parsing.
 
-        super().__init__(vertices, indices)
+        Args:
+            file: A path, the file contents, or a binary or text stream containing the
+                OBJ data. Streams are closed once they have been read.
+            chunk_size: The number of bytes to parse at a time.
+            cache: Whether to use the cache for files given by path.
+        """
+        cache_path = None
+        if cache and isinstance(file, (str, os.PathLike)):
+            cache_path = meshfile.get_cache_path(file, OBJ_CACHE_SALT)
+            try:
+                vars(self).update(meshfile.read_mesh(cache_path))
+                return
+            except (OSError, ValueError):
+                pass
+
+        # TODO: implement MTL parser?
+        vertices, uvs, normals, faces = obj.parse_obj(file, chunk_size)
+        super().__init__(vertices, faces[:, :, 0])
+        self.uvs = uvs
+        self.normals = normals
+        self.uv_indices = faces[:, :, 1]
+        self.normal_indices = faces[:, :, 2]
+
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                self.save(cache_path)
+            except OSError:
+                pass
@@ -0,0 +1,217 @@
+"""
+This module provides a binary mesh format that loads without parsing, and the
+on-disk cache OBJMesh keeps its parsed files in.
+
+A mesh file is a fixed-size header followed by raw little-endian arrays, each
+starting on a 64-byte boundary, so the arrays can be memory-mapped in place.
+"""
+
+import os
+import hashlib
+import tempfile
+import numpy as np
+
+
+MAGIC = b"TKMESH\0\0"
+"""
+The bytes every mesh file starts with.
+"""
+
+FORMAT_VERSION = 1
+"""
+The version of the mesh file layout. Files of other versions are rejected.
+"""
+
+BLOCKS = (
+    ("vertices", "<f4", 3),
+    ("indices", "<u4", 3),
+    ("uvs", "<f4", 2),
+    ("normals", "<f4", 3),
+    ("uv_indices", "<i4", 3),
+    ("normal_indices", "<i4", 3)
+)
+"""
+The arrays stored in a mesh file, in order, with their types and row sizes.
+Empty arrays take no space.
+"""
+
+HEADER = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("reserved", "<u4"),
+    ("counts", "<u8", len(BLOCKS)),
+    ("aabb_min", "<f4", 3),
+    ("aabb_max", "<f4", 3),
+    ("bounding_center", "<f4", 3),
+    ("bounding_radius", "<f4")
+])
+"""
+The layout of the header at the start of a mesh file.
+"""
+
+ALIGNMENT = 64
+"""
+The byte boundary every array in a mesh file starts on.
+"""
+
+CACHE_DIR_VARIABLE = "TKENGINER_CACHE_DIR"
+"""
+The environment variable that overrides the cache directory.
+"""
+
+
+def get_block_offsets(counts: np.ndarray) -> list[int]:
+    """
+    Calculates where each array starts in a mesh file.
+
+    Args:
+        counts: The number of rows of each array.
+
+    Returns:
+        The byte offset of each array.
+    """
+    offsets = list()
+    offset = HEADER.itemsize
+    for (_, dtype, columns), count in zip(BLOCKS, counts):
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        offsets.append(offset)
+        offset += int(count) * columns * np.dtype(dtype).itemsize
+    return offsets
+
+
+def write_mesh(path: "str | os.PathLike", arrays: dict) -> None:
+    """
+    Writes a mesh file.
+
+    The file is written next to its destination first and then moved into place,
+    so readers never see a partial file.
+
+    Args:
+        path: The path to write to.
+        arrays: The mesh arrays by name, as in BLOCKS, and its bounds (aabb_min,
+            aabb_max, bounding_center and bounding_radius). Missing arrays are stored empty.
+    """
+    header = np.zeros((), dtype=HEADER)
+    header["magic"] = MAGIC
+    header["version"] = FORMAT_VERSION
+    blocks = list()
+    for name, dtype, columns in BLOCKS:
+        array = arrays.get(name)
+        if array is None:
+            array = np.empty((0, columns))
+        blocks.append(np.ascontiguousarray(array, dtype=dtype).reshape(-1, columns))
+    header["counts"] = [len(block) for block in blocks]
+    for name in ("aabb_min", "aabb_max", "bounding_center", "bounding_radius"):
+        header[name] = arrays[name]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(header.tobytes())
+            for block, offset in zip(blocks, get_block_offsets(header["counts"])):
+                file.write(b"\0" * (offset - file.tell()))
+                file.write(block.tobytes())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def read_mesh(path: "str | os.PathLike") -> dict:
+    """
+    Opens a mesh file.
+
+    The arrays are read-only views of a memory map of the file, so nothing is
+    read from disk until it is used.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        The mesh arrays by name, as in BLOCKS, and its bounds.
+
+    Raises:
+        ValueError: If the file is not a mesh file of the current version.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    if len(data) < HEADER.itemsize:
+        raise ValueError(f"{path} is not a mesh file")
+    header = data[:HEADER.itemsize].view(HEADER)[0]
+    if data[:len(MAGIC)].tobytes() != MAGIC:
+        raise ValueError(f"{path} is not a mesh file")
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(
+            f"{path} has format version {header['version']}, expected {FORMAT_VERSION}")
+
+    arrays = dict()
+    counts = header["counts"]
+    for (name, dtype, columns), count, offset in zip(BLOCKS, counts, get_block_offsets(counts)):
+        size = int(count) * columns * np.dtype(dtype).itemsize
+        if offset + size > len(data):
+            raise ValueError(f"{path} is truncated")
+        arrays[name] = np.asarray(
+            data[offset:offset + size].view(dtype).reshape(int(count), columns))
+    for name in ("aabb_min", "aabb_max", "bounding_center"):
+        arrays[name] = np.array(header[name], dtype=np.float32)
+    arrays["bounding_radius"] = float(header["bounding_radius"])
+    return arrays
+
+
+def get_cache_dir() -> str:
+    """
+    Returns the directory parsed meshes are cached in.
+
+    This is $TKENGINER_CACHE_DIR if set, otherwise tkenginer in the user cache
+    directory ($XDG_CACHE_HOME or ~/.cache).
+
+    Returns:
+        The path of the directory.
+    """
+    directory = os.environ.get(CACHE_DIR_VARIABLE)
+    if directory:
+        return directory
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "tkenginer")
+
+
+def get_cache_path(path: "str | os.PathLike", salt: bytes = b"") -> str:
+    """
+    Returns the cache file for the contents of a file.
+
+    Entries are keyed by a hash of the file contents. The hash is remembered for
+    the path, size and modification time of the file, so unchanged files are not
+    read again.
+
+    Args:
+        path: The path of the source file.
+        salt: Extra bytes to hash, such as the version of the parser that produced the entry.
+
+    Returns:
+        The path of the cache file, which may not exist yet.
+    """
+    directory = get_cache_dir()
+    stat = os.stat(path)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode() + salt,
+        digest_size=16
+    ).hexdigest()
+    key_path = os.path.join(directory, f"{key}.key")
+    try:
+        with open(key_path) as file:
+            return os.path.join(directory, file.read().strip())
+    except OSError:
+        pass
+
+    digest = hashlib.blake2b(salt, digest_size=16)
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+    name = f"{digest.hexdigest()}.tkmesh"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(key_path, "w") as file:
+            file.write(name)
+    except OSError:
+        pass
+    return os.path.join(directory, name)
@@ -2,6 +2,9 @@
 This module provides the Node class, which is the basic building block of a scene graph.
 """
 
+import numpy as np
+
+from . import math
 from .transform import *
 from .material import *
 from .mesh import *
@@ -26,6 +29,9 @@ class Node:
         self.material = material if material is not None else MeshColorMaterial()
         self.transform = transform if transform is not None else Transform()
         self.children = children if children is not None else list()
+        self.world_matrix: np.ndarray = None
+        self._parent_matrix = None
+        self._local_matrix = None
 
     def update(self, delta: float) -> None:
         """
@@ -36,17 +42,312 @@ class Node:
         """
         pass
 
-    def traverse(self, parent_transform=Transform()):
+    def get_bounds(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Returns the local-space bounds of what this node draws.
+
+        Returns:
+            A tuple containing the minimum and maximum corners of the axis-aligned
+            bounding box and the center and radius of the bounding sphere.
+        """
+        return (
+            self.mesh.aabb_min,
+            self.mesh.aabb_max,
+            self.mesh.bounding_center,
+            self.mesh.bounding_radius
+        )
+
+    def draw(self, uniforms: dict, world_matrix: np.ndarray) -> None:
+        """
+        Draws the mesh of this node.
+
+        Args:
+            uniforms: The uniforms of the frame, including the view_projection_matrix.
+            world_matrix: The world matrix of this node.
+        """
+        vertices, indices = self.mesh.get_data()
+
+        self.material.process(
+            dict(uniforms, mvp_matrix=uniforms["view_projection_matrix"] @ world_matrix),
+            vertices=vertices,
+            indices=indices,
+            colors=None
+        )
+
+    def get_world_matrix(self, parent_matrix: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the world matrix of this node.
+
+        The result is cached and only recomputed when the local transform or the
+        parent's world matrix changed, so the same read-only array is returned for
+        as long as neither does.
+
+        Args:
+            parent_matrix: The world matrix of the parent node, or None for a root node.
+
+        Returns:
+            The 4x4 world matrix.
+        """
+        local_matrix = self.transform.get_matrix()
+        if local_matrix is self._local_matrix and parent_matrix is self._parent_matrix:
+            return self.world_matrix
+
+        if parent_matrix is None:
+            world_matrix = local_matrix
+        else:
+            world_matrix = parent_matrix @ local_matrix
+            world_matrix.flags.writeable = False
+
+        self.world_matrix = world_matrix
+        self._parent_matrix = parent_matrix
+        self._local_matrix = local_matrix
+        return world_matrix
+
+    def traverse(self, parent_matrix: np.ndarray = None):
         """
         Traverses the scene graph starting from this node.
 
         Args:
-            parent_transform: The transform of the parent node.
+            parent_matrix: The world matrix of the parent node, or None for a root node.
 
         Yields:
-            A tuple containing the node and its global transform.
+            A tuple containing the node and its 4x4 world matrix.
         """
-        global_transform = parent_transform @ self.transform
-        yield self, global_transform
+        world_matrix = self.get_world_matrix(parent_matrix)
+        yield self, world_matrix
         for child in self.children:
-            yield from child.traverse(global_transform)
+            yield from child.traverse(world_matrix)
+
+
+class InstancedNode(Node):
+    """
+    A node that draws one mesh many times, each instance with its own transform.
+
+    All visible instances are transformed and rasterized in one batch.
+    """
+
+    def __init__(
+        self,
+        mesh: Mesh,
+        instances: np.ndarray,
+        colors: np.ndarray = None,
+        material: Material = None,
+        transform: Transform = None,
+        children: "Node" = None
+    ) -> None:
+        """
+        Initializes the instanced node.
+
+        Args:
+            mesh: The mesh to draw for every instance.
+            instances: The transforms of the instances relative to this node, either as an
+                (N, 4, 4) array of matrices or as a TransformArray, which is updated every frame.
+            colors: The colors of the instances as an (N, 4) array, or None to use the material's.
+            material: The material to use for rendering the mesh.
+            transform: The local transform of this node.
+            children: A list of child nodes.
+        """
+        super().__init__(mesh, material, transform, children)
+        self.instances = instances
+        self.colors = colors
+        self.visible_instances = 0
+
+    def get_instance_matrices(self) -> np.ndarray:
+        """
+        Returns the matrices of the instances relative to this node.
+
+        Returns:
+            The matrices as an (N, 4, 4) float32 array.
+        """
+        if isinstance(self.instances, np.ndarray):
+            return np.ascontiguousarray(self.instances, dtype=np.float32)
+        return self.instances.update()
+
+    def get_bounds(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Returns the local-space bounds enclosing every instance.
+
+        Returns:
+            A tuple containing the minimum and maximum corners of the axis-aligned
+            bounding box and the center and radius of the bounding sphere.
+        """
+        matrices = self.get_instance_matrices()
+        if len(matrices) == 0:
+            return super().get_bounds()
+
+        corners = np.array(np.meshgrid(
+            *zip(self.mesh.aabb_min, self.mesh.aabb_max), indexing="ij"
+        ), dtype=np.float32).reshape(3, -1).T
+        world_corners = matrices[:, None, :3, :3] @ corners[None, :, :, None]
+        world_corners = world_corners[..., 0] + matrices[:, None, :3, 3]
+        aabb_min = world_corners.reshape(-1, 3).min(axis=0)
+        aabb_max = world_corners.reshape(-1, 3).max(axis=0)
+        center = (aabb_min + aabb_max) / 2
+        return aabb_min, aabb_max, center, float(np.linalg.norm(aabb_max - center))
+
+    def draw(self, uniforms: dict, world_matrix: np.ndarray) -> None:
+        """
+        Culls the instances against the frustum and draws the visible ones in one batch.
+
+        Args:
+            uniforms: The uniforms of the frame, including the view_projection_matrix
+                and, optionally, the frustum_planes.
+            world_matrix: The world matrix of this node.
+        """
+        matrices = np.ascontiguousarray(
+            world_matrix @ self.get_instance_matrices(), dtype=np.float32)
+        colors = self.colors
+
+        planes = uniforms.get("frustum_planes")
+        if planes is not None and len(matrices):
+            visible = math.cull_instances(
+                planes,
+                matrices,
+                self.mesh.bounding_center,
+                self.mesh.bounding_radius
+            )
+            matrices = matrices[visible]
+            if colors is not None:
+                colors = colors[visible]
+
+        self.visible_instances = len(matrices)
+        vertices, indices = self.mesh.get_data()
+        if len(matrices) == 0 or len(vertices) == 0:
+            return
+
+        offsets = len(vertices) * np.arange(len(matrices), dtype=np.uint32)
+        self.material.process(
+            dict(uniforms, mvp_matrix=uniforms["view_projection_matrix"]),
+            vertices=math.transform_instances(vertices, matrices),
+            indices=(indices[None] + offsets[:, None, None]).reshape(-1, 3),
+            colors=np.repeat(np.asarray(colors, dtype=np.uint8), len(vertices), axis=0)
+            if colors is not None else None
+        )
+
+
+class LODNode(Node):
+    """
+    A node that switches between meshes of decreasing detail as it gets smaller on screen.
+
+    Levels are picked from the projected diameter of the bounding sphere, with
+    hysteresis so a node hovering around a threshold does not switch every frame.
+    """
+
+    def __init__(
+        self,
+        levels: list[Mesh],
+        thresholds: list[float],
+        hysteresis: float = 0.1,
+        material: Material = None,
+        transform: Transform = None,
+        children: "Node" = None
+    ) -> None:
+        """
+        Initializes the LOD node.
+
+        Args:
+            levels: The meshes to pick from, most detailed first.
+            thresholds: The screen sizes in pixels between consecutive levels, in decreasing
+                order. Level i is used while the node is at least thresholds[i] pixels tall.
+            hysteresis: How far, as a fraction of the threshold, the screen size has to move
+                past a threshold before the level changes.
+            material: The material to use for rendering the meshes.
+            transform: The local transform of this node.
+            children: A list of child nodes.
+        """
+        if len(thresholds) != len(levels) - 1:
+            raise ValueError("there must be exactly one threshold between each pair of levels")
+        super().__init__(levels[0], material, transform, children)
+        self.levels = levels
+        self.thresholds = thresholds
+        self.hysteresis = hysteresis
+        self.level = 0
+        self.screen_size = np.inf
+        self.level_changes = 0
+
+    @classmethod
+    def from_generator(
+        cls,
+        generator: type,
+        segments: list[int],
+        thresholds: list[float],
+        **kwargs
+    ) -> "LODNode":
+        """
+        Creates a LOD node from a parametric mesh and a ladder of segment counts.
+
+        Args:
+            generator: A callable creating a mesh from a segment count, such as SphereMesh.
+            segments: The segment counts of the levels, most detailed first.
+            thresholds: The screen sizes in pixels between consecutive levels.
+            **kwargs: Additional arguments for the LODNode.
+
+        Returns:
+            A new LODNode.
+        """
+        return cls([generator(count) for count in segments], thresholds, **kwargs)
+
+    def get_bounds(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Returns the local-space bounds of the most detailed level.
+
+        Returns:
+            A tuple containing the minimum and maximum corners of the axis-aligned
+            bounding box and the center and radius of the bounding sphere.
+        """
+        mesh = self.levels[0]
+        return mesh.aabb_min, mesh.aabb_max, mesh.bounding_center, mesh.bounding_radius
+
+    def get_screen_size(self, uniforms: dict, world_matrix: np.ndarray) -> float:
+        """
+        Calculates the projected diameter of the bounding sphere.
+
+        Args:
+            uniforms: The uniforms of the frame, including the view_matrix,
+                projection_matrix and height.
+            world_matrix: The world matrix of this node.
+
+        Returns:
+            The diameter in pixels, or infinity if the camera is inside the sphere.
+        """
+        _, _, center, radius = math.transform_bounds(
+            world_matrix, *self.get_bounds())
+        view_matrix = uniforms["view_matrix"]
+        depth = -(view_matrix[2, :3] @ center + view_matrix[2, 3])
+        if depth <= radius:
+            return np.inf
+        return float(radius * uniforms["projection_matrix"][1, 1] * uniforms["height"] / depth)
+
+    def select_level(self, screen_size: float) -> int:
+        """
+        Picks the level for a screen size, starting from the current level.
+
+        Args:
+            screen_size: The projected diameter of the bounding sphere in pixels.
+
+        Returns:
+            The index of the selected level.
+        """
+        level = self.level
+        while level > 0 and screen_size >= self.thresholds[level - 1] * (1 + self.hysteresis):
+            level -= 1
+        while level < len(self.thresholds) and screen_size < self.thresholds[level] * (1 - self.hysteresis):
+            level += 1
+
+        if level != self.level:
+            self.level_changes += 1
+        self.level = level
+        self.screen_size = screen_size
+        self.mesh = self.levels[level]
+        return level
+
+    def draw(self, uniforms: dict, world_matrix: np.ndarray) -> None:
+        """
+        Selects the level for the current screen size and draws it.
+
+        Args:
+            uniforms: The uniforms of the frame.
+            world_matrix: The world matrix of this node.
+        """
+        self.select_level(self.get_screen_size(uniforms, world_matrix))
+        super().draw(uniforms, world_matrix)
@@ -0,0 +1,315 @@
+"""
+This module provides a fast, streaming parser for Wavefront OBJ files.
+"""
+
+import io
+import os
+import numpy as np
+import numba as nb
+
+
+CHUNK_SIZE = 1 << 24
+"""
+The number of bytes read from a stream at a time.
+"""
+
+POWERS_OF_TEN = 10.0 ** np.arange(23)
+"""
+The powers of ten that are exact as floats, for parsing numbers.
+"""
+
+
+@nb.njit(cache=True)
+def is_space(c) -> bool:
+    """
+    Checks if a byte is a space or a tab.
+    """
+    return c == 32 or c == 9
+
+
+@nb.njit(cache=True)
+def is_line_end(c) -> bool:
+    """
+    Checks if a byte ends a line.
+    """
+    return c == 10 or c == 13
+
+
+@nb.njit(cache=True)
+def skip_spaces(data, i, n) -> int:
+    """
+    Skips spaces and tabs.
+
+    Args:
+        data: The bytes being parsed.
+        i: The current position.
+        n: The end of the data.
+
+    Returns:
+        The position of the next byte that is not a space or a tab.
+    """
+    while i < n and is_space(data[i]):
+        i += 1
+    return i
+
+
+@nb.njit(cache=True)
+def parse_float(data, i, n):
+    """
+    Parses a decimal number, with optional sign, fraction and exponent.
+
+    Args:
+        data: The bytes being parsed.
+        i: The position of the number.
+        n: The end of the data.
+
+    Returns:
+        A tuple containing the number and the position after it.
+    """
+    sign = 1.0
+    if i < n and (data[i] == 45 or data[i] == 43):
+        if data[i] == 45:
+            sign = -1.0
+        i += 1
+
+    mantissa = 0.0
+    exponent = 0
+    while i < n and 48 <= data[i] <= 57:
+        mantissa = mantissa * 10 + (data[i] - 48)
+        i += 1
+    if i < n and data[i] == 46:
+        i += 1
+        while i < n and 48 <= data[i] <= 57:
+            mantissa = mantissa * 10 + (data[i] - 48)
+            exponent -= 1
+            i += 1
+    if i < n and (data[i] == 101 or data[i] == 69):
+        i += 1
+        exponent_sign = 1
+        if i < n and (data[i] == 45 or data[i] == 43):
+            if data[i] == 45:
+                exponent_sign = -1
+            i += 1
+        value = 0
+        while i < n and 48 <= data[i] <= 57:
+            value = value * 10 + (data[i] - 48)
+            i += 1
+        exponent += exponent_sign * value
+
+    if -23 < exponent < 0:
+        return sign * mantissa / POWERS_OF_TEN[-exponent], i
+    if 0 <= exponent < 23:
+        return sign * mantissa * POWERS_OF_TEN[exponent], i
+    return sign * mantissa * 10.0 ** exponent, i
+
+
+@nb.njit(cache=True)
+def parse_index(data, i, n, count):
+    """
+    Parses a 1-based, possibly negative OBJ index.
+
+    Args:
+        data: The bytes being parsed.
+        i: The position of the index.
+        n: The end of the data.
+        count: The number of elements defined so far, for negative indices.
+
+    Returns:
+        A tuple containing the 0-based index, or -1 if there is none, and the position after it.
+    """
+    negative = False
+    if i < n and data[i] == 45:
+        negative = True
+        i += 1
+    value = 0
+    digits = 0
+    while i < n and 48 <= data[i] <= 57:
+        value = value * 10 + (data[i] - 48)
+        digits += 1
+        i += 1
+    if digits == 0:
+        return -1, i
+    if negative:
+        return count - value, i
+    return value - 1, i
+
+
+@nb.njit(cache=True)
+def grow(array, count):
+    """
+    Doubles the number of rows of an array.
+
+    Args:
+        array: The array.
+        count: The number of rows in use.
+
+    Returns:
+        A larger copy of the array.
+    """
+    grown = np.empty((2 * array.shape[0],) + array.shape[1:], dtype=array.dtype)
+    grown[:count] = array[:count]
+    return grown
+
+
+@nb.njit(cache=True)
+def parse_obj_chunk(data, vertices, vertex_count, uvs, uv_count, normals, normal_count, faces, face_count):
+    """
+    Parses the v, vt, vn and f records of a chunk of complete OBJ lines.
+
+    Polygons are triangulated as fans around their first corner. Every other
+    record is skipped.
+
+    Args:
+        data: The bytes of the chunk as a uint8 array.
+        vertices, uvs, normals: The growing (K, 3), (K, 2) and (K, 3) float32 arrays to append to.
+        vertex_count, uv_count, normal_count: The number of rows in use in each array.
+        faces: The growing (K, 3, 3) array of triangles to append to. Each corner holds
+            the position, UV and normal index, with -1 for a missing index.
+        face_count: The number of triangles in use.
+
+    Returns:
+        The arrays and counts, in the same order as the arguments.
+    """
+    n = data.shape[0]
+    i = 0
+    while i < n:
+        i = skip_spaces(data, i, n)
+        if i + 1 < n and data[i] == 118 and is_space(data[i + 1]):
+            if vertex_count == vertices.shape[0]:
+                vertices = grow(vertices, vertex_count)
+            i += 1
+            for j in range(3):
+                i = skip_spaces(data, i, n)
+                vertices[vertex_count, j], i = parse_float(data, i, n)
+            vertex_count += 1
+        elif i + 2 < n and data[i] == 118 and data[i + 1] == 116 and is_space(data[i + 2]):
+            if uv_count == uvs.shape[0]:
+                uvs = grow(uvs, uv_count)
+            i += 2
+            for j in range(2):
+                i = skip_spaces(data, i, n)
+                uvs[uv_count, j], i = parse_float(data, i, n)
+            uv_count += 1
+        elif i + 2 < n and data[i] == 118 and data[i + 1] == 110 and is_space(data[i + 2]):
+            if normal_count == normals.shape[0]:
+                normals = grow(normals, normal_count)
+            i += 2
+            for j in range(3):
+                i = skip_spaces(data, i, n)
+                normals[normal_count, j], i = parse_float(data, i, n)
+            normal_count += 1
+        elif i + 1 < n and data[i] == 102 and is_space(data[i + 1]):
+            i += 1
+            corners = 0
+            first_vertex = first_uv = first_normal = -1
+            previous_vertex = previous_uv = previous_normal = -1
+            while True:
+                i = skip_spaces(data, i, n)
+                if i >= n or is_line_end(data[i]) or data[i] == 35:
+                    break
+                uv = normal = -1
+                vertex, i = parse_index(data, i, n, vertex_count)
+                if i < n and data[i] == 47:
+                    uv, i = parse_index(data, i + 1, n, uv_count)
+                    if i < n and data[i] == 47:
+                        normal, i = parse_index(data, i + 1, n, normal_count)
+                while i < n and not is_space(data[i]) and not is_line_end(data[i]):
+                    i += 1
+
+                if corners == 0:
+                    first_vertex, first_uv, first_normal = vertex, uv, normal
+                elif corners >= 2:
+                    if face_count == faces.shape[0]:
+                        faces = grow(faces, face_count)
+                    faces[face_count, 0, 0] = first_vertex
+                    faces[face_count, 0, 1] = first_uv
+                    faces[face_count, 0, 2] = first_normal
+                    faces[face_count, 1, 0] = previous_vertex
+                    faces[face_count, 1, 1] = previous_uv
+                    faces[face_count, 1, 2] = previous_normal
+                    faces[face_count, 2, 0] = vertex
+                    faces[face_count, 2, 1] = uv
+                    faces[face_count, 2, 2] = normal
+                    face_count += 1
+                previous_vertex, previous_uv, previous_normal = vertex, uv, normal
+                corners += 1
+
+        while i < n and not is_line_end(data[i]):
+            i += 1
+        i += 1
+
+    return vertices, vertex_count, uvs, uv_count, normals, normal_count, faces, face_count
+
+
+def read_chunks(source: "str | os.PathLike | bytes | io.IOBase", chunk_size: int):
+    """
+    Reads OBJ data in chunks that end on line boundaries.
+
+    Args:
+        source: A path, the file contents, or a binary or text stream. Streams are closed
+            once they have been read.
+        chunk_size: The number of bytes to read at a time.
+
+    Yields:
+        The chunks as uint8 arrays.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield np.frombuffer(source, dtype=np.uint8)
+        return
+    if isinstance(source, (str, os.PathLike)):
+        source = open(source, "rb")
+
+    with source:
+        remainder = b""
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                remainder += chunk
+                continue
+            yield np.frombuffer(remainder + chunk[:end], dtype=np.uint8)
+            remainder = chunk[end:]
+        if remainder:
+            yield np.frombuffer(remainder, dtype=np.uint8)
+
+
+def parse_obj(
+    source: "str | os.PathLike | bytes | io.IOBase",
+    chunk_size: int = CHUNK_SIZE
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parses an OBJ file.
+
+    Args:
+        source: A path, the file contents, or a binary or text stream. Streams are closed
+            once they have been read.
+        chunk_size: The number of bytes to read at a time.
+
+    Returns:
+        A tuple containing the positions as an (N, 3) array, the texture coordinates
+        as an (N, 2) array, the normals as an (N, 3) array and the triangles as an
+        (M, 3, 3) array whose corners hold a position, UV and normal index each, with
+        -1 for missing indices.
+
+    Raises:
+        ValueError: If a face refers to a position that does not exist.
+    """
+    state = (
+        np.empty((1024, 3), dtype=np.float32), 0,
+        np.empty((1024, 2), dtype=np.float32), 0,
+        np.empty((1024, 3), dtype=np.float32), 0,
+        np.empty((1024, 3, 3), dtype=np.int64), 0
+    )
+    for chunk in read_chunks(source, chunk_size):
+        state = parse_obj_chunk(chunk, *state)
+
+    vertices, vertex_count, uvs, uv_count, normals, normal_count, faces, face_count = state
+    faces = faces[:face_count]
+    positions = faces[:, :, 0]
+    if len(positions) and (positions.min() < 0 or positions.max() >= vertex_count):
+        raise ValueError("face refers to a vertex that does not exist")
+    return vertices[:vertex_count], uvs[:uv_count], normals[:normal_count], faces
@@ -0,0 +1,171 @@
+"""
+This module provides index buffer optimization for meshes.
+"""
+
+import numpy as np
+import numba as nb
+
+
+def weld_vertices(vertices: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges vertices whose positions are equal up to a tolerance.
+
+    Positions are snapped to a grid with cells the size of the tolerance, and the
+    vertices falling in the same cell are merged into the first of them.
+
+    Args:
+        vertices: The vertex positions as an (N, 3) array.
+        tolerance: The size of the grid cells, or 0 to only merge identical positions.
+
+    Returns:
+        A tuple containing the merged vertices and the new index of every original vertex.
+    """
+    keys = vertices if tolerance <= 0 else np.round(vertices / tolerance).astype(np.int64)
+    _, first, remap = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return vertices[first], remap.reshape(-1)
+
+
+@nb.njit(cache=True)
+def get_vertex_score(cache_position, remaining, cache_size) -> float:
+    """
+    Scores a vertex for vertex cache ordering, after Tom Forsyth's "Linear-Speed
+    Vertex Cache Optimisation".
+
+    Args:
+        cache_position: The position of the vertex in the simulated cache, or -1.
+        remaining: The number of triangles using the vertex that are still to be emitted.
+        cache_size: The size of the simulated cache.
+
+    Returns:
+        The score, higher for vertices that should be used sooner.
+    """
+    if remaining == 0:
+        return -1.0
+    score = 0.0
+    if cache_position >= 0:
+        if cache_position < 3:
+            score = 0.75
+        else:
+            score = (1.0 - (cache_position - 3) / (cache_size - 3)) ** 1.5
+    return score + 2.0 / np.sqrt(remaining)
+
+
+@nb.njit(cache=True)
+def order_triangles(indices, vertex_count, cache_size):
+    """
+    Orders triangles so that consecutive triangles share vertices.
+
+    Triangles are emitted greedily by the score of their vertices in a simulated
+    LRU vertex cache, after Tom Forsyth's "Linear-Speed Vertex Cache Optimisation".
+
+    Args:
+        indices: The triangles as an (M, 3) array of vertex indices.
+        vertex_count: The number of vertices.
+        cache_size: The size of the simulated cache.
+
+    Returns:
+        The order to emit the triangles in.
+    """
+    triangle_count = indices.shape[0]
+    remaining = np.zeros(vertex_count, dtype=np.int64)
+    for t in range(triangle_count):
+        for j in range(3):
+            remaining[indices[t, j]] += 1
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    for v in range(vertex_count):
+        offsets[v + 1] = offsets[v] + remaining[v]
+    adjacency = np.empty(offsets[-1], dtype=np.int64)
+    cursors = offsets[:-1].copy()
+    for t in range(triangle_count):
+        for j in range(3):
+            v = indices[t, j]
+            adjacency[cursors[v]] = t
+            cursors[v] += 1
+
+    cache_positions = np.full(vertex_count, -1, dtype=np.int64)
+    vertex_scores = np.empty(vertex_count, dtype=np.float64)
+    for v in range(vertex_count):
+        vertex_scores[v] = get_vertex_score(-1, remaining[v], cache_size)
+    triangle_scores = np.empty(triangle_count, dtype=np.float64)
+    for t in range(triangle_count):
+        triangle_scores[t] = (vertex_scores[indices[t, 0]] + vertex_scores[indices[t, 1]] +
+                              vertex_scores[indices[t, 2]])
+
+    emitted = np.zeros(triangle_count, dtype=np.bool_)
+    order = np.empty(triangle_count, dtype=np.int64)
+    cache = np.empty(cache_size + 3, dtype=np.int64)
+    new_cache = np.empty(cache_size + 3, dtype=np.int64)
+    cache_length = 0
+    best = np.argmax(triangle_scores) if triangle_count else -1
+    scan = 0
+
+    for k in range(triangle_count):
+        if best < 0:
+            while emitted[scan]:
+                scan += 1
+            best = scan
+        t = best
+        emitted[t] = True
+        order[k] = t
+
+        length = 0
+        for j in range(3):
+            v = indices[t, j]
+            new_cache[length] = v
+            length += 1
+            remaining[v] -= 1
+        for i in range(cache_length):
+            v = cache[i]
+            if v != indices[t, 0] and v != indices[t, 1] and v != indices[t, 2]:
+                new_cache[length] = v
+                length += 1
+
+        for i in range(length):
+            v = new_cache[i]
+            cache_positions[v] = i if i < cache_size else -1
+            vertex_scores[v] = get_vertex_score(cache_positions[v], remaining[v], cache_size)
+
+        best = -1
+        best_score = -np.inf
+        for i in range(length):
+            v = new_cache[i]
+            for a in range(offsets[v], offsets[v + 1]):
+                u = adjacency[a]
+                if emitted[u]:
+                    continue
+                triangle_scores[u] = (vertex_scores[indices[u, 0]] + vertex_scores[indices[u, 1]] +
+                                      vertex_scores[indices[u, 2]])
+                if triangle_scores[u] > best_score:
+                    best_score = triangle_scores[u]
+                    best = u
+
+        cache_length = min(length, cache_size)
+        cache[:cache_length] = new_cache[:cache_length]
+
+    return order
+
+
+@nb.njit(cache=True)
+def get_cache_miss_ratio(indices, vertex_count, cache_size) -> float:
+    """
+    Calculates the average number of vertices a FIFO vertex cache misses per triangle.
+
+    Args:
+        indices: The triangles as an (M, 3) array of vertex indices.
+        vertex_count: The number of vertices.
+        cache_size: The size of the simulated cache.
+
+    Returns:
+        The average cache miss ratio, between 0.5 for an ideal grid and 3.
+    """
+    if indices.shape[0] == 0:
+        return 0.0
+    timestamps = np.full(vertex_count, -cache_size - 1, dtype=np.int64)
+    time = 0
+    for t in range(indices.shape[0]):
+        for j in range(3):
+            v = indices[t, j]
+            if time - timestamps[v] > cache_size:
+                timestamps[v] = time
+                time += 1
+    return time / indices.shape[0]
@@ -0,0 +1,247 @@
+"""
+This module provides a per-stage frame profiler.
+"""
+
+import collections
+import contextlib
+import time
+import numpy as np
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+DISABLED = contextlib.nullcontext()
+"""
+The context returned for stages and frames while profiling is disabled.
+"""
+
+
+class Stage:
+    """
+    A context that times one run of a stage.
+    """
+
+    __slots__ = ("profiler", "name", "start", "children")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "Stage":
+        self.children = 0.0
+        self.profiler.stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed - self.children
+
+
+class Frame:
+    """
+    A context that times a whole frame and records its stages when it ends.
+    """
+
+    __slots__ = ("profiler", "start")
+
+    def __init__(self, profiler: "Profiler") -> None:
+        self.profiler = profiler
+
+    def __enter__(self) -> "Frame":
+        self.profiler.depth += 1
+        if self.profiler.depth == 1:
+            self.profiler.current.clear()
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.depth -= 1
+        if self.profiler.depth == 0:
+            self.profiler.record(time.perf_counter() - self.start)
+
+
+class Profiler:
+    """
+    Times the stages of every frame and keeps a rolling window of the results.
+
+    Stages are timed with "with profiler.stage(name):" inside "with profiler.frame():".
+    Stages can nest, and the time of a stage excludes the stages nested in it, so
+    the stage times of a frame add up to at most its total. Time outside any stage
+    is reported as "other". While disabled, stage() and frame() return a shared
+    do-nothing context, so instrumented code costs next to nothing.
+
+    Stages and frames must be timed on a single thread. Measurements that do not
+    belong to a frame, such as input latency, can be added from any thread with
+    add_sample().
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 120) -> None:
+        """
+        Initializes the Profiler.
+
+        Args:
+            enabled: Whether to record timings.
+            window: The number of most recent frames to keep.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.font = None
+        self.overlay = None
+        self.overlay_time = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Discards every recorded frame.
+        """
+        self.history: dict[str, np.ndarray] = dict()
+        self.samples: dict[str, collections.deque] = dict()
+        self.frames = 0
+        self.current: dict[str, float] = dict()
+        self.stack: list[Stage] = list()
+        self.depth = 0
+
+    def stage(self, name: str) -> "Stage | contextlib.nullcontext":
+        """
+        Returns a context that times a stage of the current frame.
+
+        A stage can be entered any number of times per frame; the times add up.
+
+        Args:
+            name: The name of the stage.
+
+        Returns:
+            The context.
+        """
+        if not self.enabled:
+            return DISABLED
+        return Stage(self, name)
+
+    def frame(self) -> "Frame | contextlib.nullcontext":
+        """
+        Returns a context that times a frame. Nested frames count as part of the outermost one.
+
+        Returns:
+            The context.
+        """
+        if not self.enabled:
+            return DISABLED
+        return Frame(self)
+
+    def record(self, total: float) -> None:
+        """
+        Adds the stages timed since the frame started to the history.
+
+        Args:
+            total: The duration of the frame in seconds.
+        """
+        current = self.current
+        current["other"] = max(0.0, total - sum(current.values()))
+        current["frame"] = total
+        index = self.frames % self.window
+        for name in current.keys() - self.history.keys():
+            self.history[name] = np.zeros(self.window)
+        for name, history in self.history.items():
+            history[index] = current.get(name, 0.0)
+        self.frames += 1
+
+    def add_sample(self, name: str, value: float) -> None:
+        """
+        Records a time that is not a stage of a frame.
+
+        The most recent samples of every name are kept, as many as the window holds frames.
+
+        Args:
+            name: The name of the measurement.
+            value: The time in seconds.
+        """
+        if not self.enabled:
+            return
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples.setdefault(name, collections.deque(maxlen=self.window))
+        samples.append(value)
+
+    def get_times(self, name: str) -> np.ndarray:
+        """
+        Returns the recorded times of a stage or samples of a measurement, oldest first.
+
+        Args:
+            name: The name of the stage or measurement, or "frame" for the frame totals.
+
+        Returns:
+            The times in seconds of the frames in the window, or the samples.
+        """
+        samples = self.samples.get(name)
+        if samples is not None:
+            return np.array(samples.copy())
+        history = self.history.get(name)
+        if history is None:
+            return np.zeros(min(self.frames, self.window))
+        if self.frames <= self.window:
+            return history[:self.frames].copy()
+        return np.roll(history, -(self.frames % self.window))
+
+    def get_stats(self, percentiles: tuple[float, ...] = (50, 95, 99)) -> dict[str, dict[str, float]]:
+        """
+        Summarizes every stage and measurement over the window.
+
+        Args:
+            percentiles: The percentiles to calculate.
+
+        Returns:
+            For each stage and measurement, the mean, the last value and the requested
+            percentiles (as "p50" and so on) in milliseconds, from the slowest down.
+        """
+        stats = dict()
+        for name in list(self.history) + list(self.samples):
+            times = 1000 * self.get_times(name)
+            if len(times) == 0:
+                continue
+            stats[name] = {"mean": float(times.mean()), "last": float(times[-1])}
+            for percentile, value in zip(percentiles, np.percentile(times, percentiles)):
+                stats[name][f"p{percentile:g}"] = float(value)
+        return dict(sorted(stats.items(), key=lambda item: -item[1]["mean"]))
+
+    def get_overlay_text(self) -> str:
+        """
+        Formats the statistics for display.
+
+        Returns:
+            One line per stage with its mean and 95th percentile.
+        """
+        return "\n".join(
+            f"{name:<12}{stats['mean']:7.2f} ms  p95 {stats['p95']:7.2f}"
+            for name, stats in self.get_stats((95,)).items()
+        )
+
+    def draw_overlay(self, image: Image.Image, interval: float = 0.25) -> None:
+        """
+        Draws the statistics onto the bottom left of an image.
+
+        Rendering text is slow, so the overlay is only redrawn once per interval
+        and pasted from a cache in between.
+
+        Args:
+            image: The image to draw on.
+            interval: The time in seconds between updates of the overlay.
+        """
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time >= interval:
+            text = self.get_overlay_text()
+            if not text:
+                return
+            if self.font is None:
+                self.font = ImageFont.load_default()
+            left, top, right, bottom = ImageDraw.Draw(
+                Image.new("L", (1, 1))).multiline_textbbox((0, 0), text, self.font)
+            self.overlay = Image.new("RGBA", (right + 1, bottom + 1))
+            ImageDraw.Draw(self.overlay).multiline_text((0, 0), text, "white", self.font)
+            self.overlay_time = now
+        image.paste(self.overlay, (10, image.height - 10 - self.overlay.height), self.overlay)
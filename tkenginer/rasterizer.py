@@ -0,0 +1,368 @@
+"""
+This module provides the rasterizers that turn processed meshes into pixels.
+"""
+
+import multiprocessing
+import os
+import weakref
+import numpy as np
+
+from . import math
+from .target import *
+
+
+class Rasterizer:
+    """
+    Base class for rasterizers.
+
+    A rasterizer receives the screen-space triangles of every mesh drawn during a frame,
+    between a call to begin() and a call to end().
+    """
+
+    def create_target(self, width: int, height: int) -> RenderTarget:
+        """
+        Creates a render target suited to this rasterizer.
+
+        Args:
+            width: The width in pixels.
+            height: The height in pixels.
+
+        Returns:
+            The target.
+        """
+        return RenderTarget(width, height)
+
+    def begin(self, buffer: np.ndarray, zbuffer: np.ndarray) -> None:
+        """
+        Starts a new frame.
+
+        Args:
+            buffer: The color buffer to draw to.
+            zbuffer: The depth buffer for depth testing.
+        """
+        self.buffer = buffer
+        self.zbuffer = zbuffer
+
+    def submit(
+        self,
+        screen_coords: np.ndarray,
+        w_coords: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray
+    ) -> None:
+        """
+        Submits the triangles of a mesh.
+
+        Args:
+            screen_coords: The screen-space vertices as an (N, 2) array.
+            w_coords: The w-coordinates of the vertices as an (N, 1) array.
+            indices: The triangles as an (M, 3) array of vertex indices.
+            colors: The colors of the vertices as an (N, 4) array.
+        """
+        raise NotImplementedError
+
+    def end(self) -> None:
+        """
+        Finishes the frame, making sure every submitted triangle has been drawn.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Frees the resources of the rasterizer. It can still be used afterwards.
+        """
+        pass
+
+
+class ImmediateRasterizer(Rasterizer):
+    """
+    A rasterizer that draws every mesh as soon as it is submitted.
+    """
+
+    def submit(
+        self,
+        screen_coords: np.ndarray,
+        w_coords: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray
+    ) -> None:
+        """
+        Submits the triangles of a mesh and draws them right away.
+
+        Args:
+            screen_coords: The screen-space vertices as an (N, 2) array.
+            w_coords: The w-coordinates of the vertices as an (N, 1) array.
+            indices: The triangles as an (M, 3) array of vertex indices.
+            colors: The colors of the vertices as an (N, 4) array.
+        """
+        math.draw_mesh(
+            self.buffer,
+            self.zbuffer,
+            screen_coords,
+            w_coords,
+            indices,
+            colors
+        )
+
+
+class TiledRasterizer(Rasterizer):
+    """
+    A rasterizer that collects the triangles of a whole frame, bins them into
+    screen tiles and draws the tiles in parallel.
+    """
+
+    def __init__(self, tile_size: int = 32) -> None:
+        """
+        Initializes the TiledRasterizer.
+
+        Args:
+            tile_size: The width and height of a tile in pixels.
+        """
+        self.tile_size = tile_size
+        self.batches: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = list()
+
+    def begin(self, buffer: np.ndarray, zbuffer: np.ndarray) -> None:
+        """
+        Starts a new frame.
+
+        Args:
+            buffer: The color buffer to draw to.
+            zbuffer: The depth buffer for depth testing.
+        """
+        super().begin(buffer, zbuffer)
+        self.batches.clear()
+
+    def submit(
+        self,
+        screen_coords: np.ndarray,
+        w_coords: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray
+    ) -> None:
+        """
+        Submits the triangles of a mesh to be drawn at the end of the frame.
+
+        Args:
+            screen_coords: The screen-space vertices as an (N, 2) array.
+            w_coords: The w-coordinates of the vertices as an (N, 1) array.
+            indices: The triangles as an (M, 3) array of vertex indices.
+            colors: The colors of the vertices as an (N, 4) array.
+        """
+        self.batches.append((screen_coords, w_coords, indices, colors))
+
+    def collect(self) -> "tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None":
+        """
+        Merges the triangles submitted during the frame into a single mesh.
+
+        Returns:
+            A tuple containing the screen-space vertices, their w-coordinates, the
+            triangles and the vertex colors, or None if nothing was submitted.
+        """
+        if not self.batches:
+            return None
+
+        vertex_offsets = np.cumsum(
+            [0] + [len(batch[0]) for batch in self.batches[:-1]])
+        screen_coords = np.concatenate([batch[0] for batch in self.batches])
+        w_coords = np.concatenate([batch[1] for batch in self.batches])
+        indices = np.concatenate([
+            batch[2].astype(np.int64) + offset
+            for batch, offset in zip(self.batches, vertex_offsets)
+        ])
+        colors = np.concatenate([batch[3] for batch in self.batches])
+        self.batches.clear()
+        return screen_coords, w_coords, indices, colors
+
+    def end(self) -> None:
+        """
+        Bins every triangle submitted during the frame and draws the tiles.
+        """
+        mesh = self.collect()
+        if mesh is None:
+            return
+
+        screen_coords, w_coords, indices, colors = mesh
+        height, width = self.zbuffer.shape
+        offsets, triangles = math.bin_triangles(
+            screen_coords,
+            w_coords,
+            indices,
+            width,
+            height,
+            self.tile_size
+        )
+        math.draw_tiles(
+            self.buffer,
+            self.zbuffer,
+            screen_coords,
+            w_coords,
+            indices,
+            colors,
+            offsets,
+            triangles,
+            self.tile_size
+        )
+
+
+def draw_band(frame: tuple, mesh: tuple, tile_size: int, start: int, end: int) -> None:
+    """
+    Draws a range of tiles for a ProcessRasterizer, in a worker process.
+
+    Args:
+        frame: The layout of the shared color and depth buffers.
+        mesh: The layout of the shared triangles and their tile bins.
+        tile_size: The width and height of a tile in pixels.
+        start: The row-major index of the first tile.
+        end: The row-major index after the last tile.
+    """
+    target = attach(frame)
+    arrays = attach(mesh)
+    math.draw_tile_range(
+        target["buffer"],
+        target["zbuffer"],
+        arrays["screen_coords"],
+        arrays["w_coords"],
+        arrays["indices"],
+        arrays["colors"],
+        arrays["offsets"],
+        arrays["triangles"],
+        tile_size,
+        start,
+        end
+    )
+
+
+class ProcessRasterizer(TiledRasterizer):
+    """
+    A rasterizer that collects the triangles of a whole frame, bins them into
+    screen tiles and draws bands of tile rows in worker processes.
+
+    The workers read the binned triangles from shared memory and draw straight into
+    the buffers of targets made by create_target(), so no pixels are copied; other
+    buffers are copied through shared memory. The workers are started with the
+    "spawn" method on first use, so scripts using this rasterizer need an
+    if __name__ == "__main__" guard.
+    """
+
+    def __init__(self, processes: int = None, tile_size: int = 32, bands_per_process: int = 4) -> None:
+        """
+        Initializes the ProcessRasterizer.
+
+        Args:
+            processes: The number of worker processes. Defaults to the number of CPUs.
+            tile_size: The width and height of a tile in pixels.
+            bands_per_process: The number of bands per worker a frame is split into,
+                so that workers finishing early can take over more bands.
+        """
+        super().__init__(tile_size)
+        self.processes = processes or os.cpu_count() or 1
+        self.bands_per_process = bands_per_process
+        self.pool = None
+        self.finalizer = None
+        self.mesh = SharedArrays()
+        self.frame = SharedArrays()
+        self.targets = weakref.WeakSet()
+
+    def create_target(self, width: int, height: int) -> SharedRenderTarget:
+        """
+        Creates a render target in shared memory, which the workers draw into directly.
+
+        Args:
+            width: The width in pixels.
+            height: The height in pixels.
+
+        Returns:
+            The target.
+        """
+        target = SharedRenderTarget(width, height)
+        self.targets.add(target)
+        return target
+
+    def get_bands(self, width: int, height: int) -> list[tuple[int, int]]:
+        """
+        Splits the tiles of the screen into bands of whole tile rows.
+
+        Args:
+            width: The width of the screen.
+            height: The height of the screen.
+
+        Returns:
+            The range of row-major tile indices of each band.
+        """
+        tiles_x = (width + self.tile_size - 1) // self.tile_size
+        tiles_y = (height + self.tile_size - 1) // self.tile_size
+        count = max(1, min(tiles_y, self.processes * self.bands_per_process))
+        rows = np.linspace(0, tiles_y, count + 1).astype(np.int64)
+        return [(int(start) * tiles_x, int(end) * tiles_x) for start, end in zip(rows[:-1], rows[1:])]
+
+    def end(self) -> None:
+        """
+        Bins every triangle submitted during the frame and has the workers draw the bands.
+        """
+        mesh = self.collect()
+        if mesh is None:
+            return
+
+        screen_coords, w_coords, indices, colors = mesh
+        height, width = self.zbuffer.shape
+        offsets, triangles = math.bin_triangles(
+            screen_coords,
+            w_coords,
+            indices,
+            width,
+            height,
+            self.tile_size
+        )
+        layout = self.mesh.write({
+            "screen_coords": screen_coords,
+            "w_coords": w_coords,
+            "indices": indices,
+            "colors": colors,
+            "offsets": offsets,
+            "triangles": triangles
+        })
+
+        target = next((target for target in self.targets if target.buffer is self.buffer), None)
+        if target is not None:
+            frame = target.layout
+        else:
+            views = self.frame.allocate({
+                "buffer": (self.buffer.shape, self.buffer.dtype),
+                "zbuffer": (self.zbuffer.shape, self.zbuffer.dtype)
+            })
+            views["buffer"][...] = self.buffer
+            views["zbuffer"][...] = self.zbuffer
+            frame = self.frame.layout
+
+        if self.pool is None:
+            self.pool = multiprocessing.get_context("spawn").Pool(self.processes)
+            self.finalizer = weakref.finalize(self, self.pool.terminate)
+        self.pool.starmap(
+            draw_band,
+            [(frame, layout, self.tile_size, start, end) for start, end in self.get_bands(width, height)],
+            chunksize=1
+        )
+
+        if target is None:
+            self.buffer[...] = views["buffer"]
+            self.zbuffer[...] = views["zbuffer"]
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and frees the shared memory of the rasterizer.
+        """
+        if self.pool is not None:
+            self.finalizer()
+            self.pool = None
+        self.mesh.release()
+        self.frame.release()
+
+
+RASTERIZERS = {
+    "immediate": ImmediateRasterizer,
+    "tiled": TiledRasterizer,
+    "processes": ProcessRasterizer
+}
+"""
+The built-in rasterizers, by name.
+"""
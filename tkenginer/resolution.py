@@ -0,0 +1,82 @@
+"""
+This module provides the controller that scales the render resolution to hold
+a target frame time.
+"""
+
+import numpy as np
+
+
+class ResolutionController:
+    """
+    Picks the render scale, the fraction of the output width and height frames are
+    rendered at, from measured frame times.
+
+    Frame time is assumed to grow with the number of pixels, so the scale is
+    corrected by the square root of the ratio between the target and the smoothed
+    frame time. The scale moves in steps and only when it would change by a whole
+    step, so it settles instead of reallocating buffers every frame.
+    """
+
+    def __init__(
+        self,
+        target_time: float,
+        min_scale: float = 0.25,
+        max_scale: float = 1.0,
+        step: float = 0.05,
+        smoothing: float = 0.2,
+        headroom: float = 0.9
+    ) -> None:
+        """
+        Initializes the ResolutionController.
+
+        Args:
+            target_time: The frame time to hold in seconds.
+            min_scale: The smallest scale to render at.
+            max_scale: The largest scale to render at.
+            step: The granularity of the scale.
+            smoothing: The weight of the newest frame time in the running average.
+            headroom: The fraction of the target time to aim for, leaving room for
+                work that does not scale with the resolution.
+        """
+        self.target_time = target_time
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.average = None
+
+    def reset(self) -> None:
+        """
+        Forgets the measured frame times.
+        """
+        self.average = None
+
+    def update(self, scale: float, frame_time: float) -> float:
+        """
+        Adds the time of a frame and returns the scale to render the next one at.
+
+        Args:
+            scale: The scale the frame was rendered at.
+            frame_time: The time the frame took in seconds.
+
+        Returns:
+            The new scale, which is the given scale if it should not change.
+        """
+        if self.average is None:
+            self.average = frame_time
+        else:
+            self.average += self.smoothing * (frame_time - self.average)
+        if self.average <= 0:
+            return scale
+
+        desired = scale * np.sqrt(self.headroom * self.target_time / self.average)
+        desired = min(max(desired, self.min_scale), self.max_scale)
+        desired = round(round(desired / self.step) * self.step, 6)
+        desired = min(max(desired, self.min_scale), self.max_scale)
+        if abs(desired - scale) < self.step / 2:
+            return scale
+        # Expect the next frames to take as long as the pixel count suggests, so the
+        # average does not keep pushing the scale the same way while it catches up.
+        self.average *= (desired / scale) ** 2
+        return float(desired)
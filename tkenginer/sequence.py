@@ -0,0 +1,408 @@
+"""
+This module provides offline rendering of frame sequences, such as turntables
+and camera fly-throughs, and the sinks the frames are streamed to.
+"""
+
+import concurrent.futures
+import io
+import os
+import queue
+import time
+import numpy as np
+
+from PIL import Image
+from .engine import *
+from .node import *
+
+
+def get_look_angles(position: np.ndarray, target: np.ndarray) -> tuple[float, float]:
+    """
+    Calculates the yaw and pitch of a camera looking at a point.
+
+    Args:
+        position: The position of the camera.
+        target: The point to look at.
+
+    Returns:
+        A tuple containing the yaw and the pitch in radians, as used by math.get_view_matrix.
+    """
+    direction = np.asarray(target, dtype=np.float64) - np.asarray(position, dtype=np.float64)
+    length = np.linalg.norm(direction)
+    if length == 0:
+        return 0.0, 0.0
+    direction /= length
+    return float(np.arctan2(direction[0], direction[2])), float(np.arcsin(direction[1]))
+
+
+class CameraPath:
+    """
+    Camera keyframes, interpolated linearly in between.
+
+    Yaw is interpolated along the shorter way around the circle.
+    """
+
+    def __init__(self, times: list[float], positions: list, yaws: list[float], pitches: list[float]) -> None:
+        """
+        Initializes the CameraPath.
+
+        Args:
+            times: The time of each keyframe in seconds, in increasing order.
+            positions: The position of the camera at each keyframe.
+            yaws: The yaw of the camera at each keyframe in radians.
+            pitches: The pitch of the camera at each keyframe in radians.
+
+        Raises:
+            ValueError: If there are no keyframes, their lengths differ or the times decrease.
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self.yaws = np.unwrap(np.asarray(yaws, dtype=np.float64))
+        self.pitches = np.asarray(pitches, dtype=np.float64)
+        if len(self.times) == 0:
+            raise ValueError("a camera path needs at least one keyframe")
+        if not len(self.times) == len(self.positions) == len(self.yaws) == len(self.pitches):
+            raise ValueError("every keyframe needs a time, position, yaw and pitch")
+        if np.any(np.diff(self.times) < 0):
+            raise ValueError("keyframe times must not decrease")
+
+    @classmethod
+    def orbit(
+        cls,
+        center: list[float],
+        radius: float,
+        height: float = 0.0,
+        duration: float = 1.0,
+        turns: float = 1.0,
+        keyframes: int = 64
+    ) -> "CameraPath":
+        """
+        Creates a path circling a point at a constant height while looking at it, for turntables.
+
+        Args:
+            center: The point to circle.
+            radius: The distance from the point in the horizontal plane.
+            height: The height of the camera above the point.
+            duration: The time one pass of the path takes in seconds.
+            turns: The number of times to go around.
+            keyframes: The number of keyframes per turn.
+
+        Returns:
+            The path.
+        """
+        center = np.asarray(center, dtype=np.float64)
+        count = max(2, int(np.ceil(keyframes * abs(turns))) + 1)
+        angles = np.linspace(0, 2 * np.pi * turns, count)
+        positions = center + np.stack([
+            radius * np.sin(angles),
+            np.full(count, height),
+            radius * np.cos(angles)
+        ], axis=1)
+        yaws, pitches = zip(*(get_look_angles(position, center) for position in positions))
+        return cls(np.linspace(0, duration, count), positions, yaws, pitches)
+
+    @property
+    def duration(self) -> float:
+        """
+        The time of the last keyframe.
+        """
+        return float(self.times[-1])
+
+    def sample(self, time: float) -> tuple[np.ndarray, float, float]:
+        """
+        Calculates the camera at a point in time. Times outside the path are clamped.
+
+        Args:
+            time: The time in seconds.
+
+        Returns:
+            A tuple containing the position, yaw and pitch of the camera.
+        """
+        position = np.array([
+            np.interp(time, self.times, self.positions[:, axis]) for axis in range(3)
+        ], dtype=np.float32)
+        return (
+            position,
+            float(np.interp(time, self.times, self.yaws)),
+            float(np.interp(time, self.times, self.pitches))
+        )
+
+
+class FrameSink:
+    """
+    Base class for destinations of rendered frames.
+
+    Sinks record how long write() was blocked waiting for earlier frames to be
+    consumed (back-pressure) in wait_time, and the number of frames written in frames.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the FrameSink.
+        """
+        self.frames = 0
+        self.wait_time = 0.0
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Consumes a frame. The frame may be overwritten once this returns.
+
+        Args:
+            frame: The frame as a (height, width, 4) array of RGBA values.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Finishes writing every frame.
+        """
+        pass
+
+    def __enter__(self) -> "FrameSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RawSink(FrameSink):
+    """
+    A sink that writes the raw pixels of every frame to a stream, such as the
+    standard input of an encoder (for ffmpeg: -f rawvideo -pix_fmt rgba).
+    """
+
+    def __init__(self, stream: "str | os.PathLike | io.IOBase", alpha: bool = True) -> None:
+        """
+        Initializes the RawSink.
+
+        Args:
+            stream: A binary stream or the path of a file to write to. Files opened
+                from a path are closed with the sink.
+            alpha: Whether to write RGBA pixels rather than RGB.
+        """
+        super().__init__()
+        self.owned = isinstance(stream, (str, os.PathLike))
+        self.stream = open(stream, "wb") if self.owned else stream
+        self.alpha = alpha
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Writes a frame, blocking while the stream does not accept more data.
+
+        Args:
+            frame: The frame as a (height, width, 4) array of RGBA values.
+        """
+        data = frame if self.alpha else frame[:, :, :3]
+        start = time.perf_counter()
+        self.stream.write(memoryview(np.ascontiguousarray(data)).cast("B"))
+        self.wait_time += time.perf_counter() - start
+        self.frames += 1
+
+    def close(self) -> None:
+        """
+        Flushes the stream, closing it if the sink opened it.
+        """
+        self.stream.flush()
+        if self.owned:
+            self.stream.close()
+
+
+class PNGSink(FrameSink):
+    """
+    A sink that saves every frame as a numbered PNG file, encoding them on a pool
+    of background threads.
+
+    Frames are copied into a fixed number of slots; write() blocks while every slot
+    is waiting to be encoded.
+    """
+
+    def __init__(
+        self,
+        directory: "str | os.PathLike",
+        pattern: str = "frame_{:05d}.png",
+        workers: int = None,
+        queue_size: int = None,
+        compress_level: int = 1
+    ) -> None:
+        """
+        Initializes the PNGSink.
+
+        Args:
+            directory: The directory to save to. It is created if needed.
+            pattern: The file name pattern, formatted with the frame number.
+            workers: The number of encoding threads. Defaults to the number of CPUs.
+            queue_size: The number of frames that can wait to be encoded. Defaults to
+                twice the number of workers.
+            compress_level: The zlib compression level, from 0 (none) to 9 (smallest).
+        """
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.pattern = pattern
+        self.compress_level = compress_level
+        workers = workers or os.cpu_count() or 1
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers, "tkenginer-png")
+        self.slots = queue.Queue()
+        self.slot_count = queue_size or 2 * workers
+        self.futures: list[concurrent.futures.Future] = list()
+
+    def save(self, slot: np.ndarray, path: str) -> None:
+        """
+        Encodes a frame, on a worker thread, and frees its slot.
+
+        Args:
+            slot: The copy of the frame.
+            path: The path to save to.
+        """
+        try:
+            Image.fromarray(slot, "RGBA").save(path, compress_level=self.compress_level)
+        finally:
+            self.slots.put(slot)
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Queues a frame to be saved, blocking while every slot is in use.
+
+        Args:
+            frame: The frame as a (height, width, 4) array of RGBA values.
+
+        Raises:
+            Exception: Any error raised while saving an earlier frame.
+        """
+        if self.slot_count > 0:
+            self.slot_count -= 1
+            slot = np.empty_like(frame)
+        else:
+            start = time.perf_counter()
+            slot = self.slots.get()
+            self.wait_time += time.perf_counter() - start
+            if slot.shape != frame.shape:
+                slot = np.empty_like(frame)
+        self.check()
+        slot[...] = frame
+        path = os.path.join(self.directory, self.pattern.format(self.frames))
+        self.futures.append(self.executor.submit(self.save, slot, path))
+        self.frames += 1
+
+    def check(self) -> None:
+        """
+        Raises the first error of the frames saved so far, forgetting the saved frames.
+        """
+        pending = list()
+        for future in self.futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self.futures = pending
+
+    def close(self) -> None:
+        """
+        Waits for every frame to be saved.
+
+        Raises:
+            Exception: Any error raised while saving a frame.
+        """
+        self.executor.shutdown(wait=True)
+        self.check()
+
+
+def iter_sequence(
+    scene: Node,
+    path: CameraPath,
+    frames: int,
+    width: int = 1280,
+    height: int = 720,
+    fps: float = 30,
+    engine: Engine = None,
+    **options
+):
+    """
+    Renders a sequence of frames as fast as possible, without pacing.
+
+    Frame i shows the camera at i / fps seconds along the path, and the scene is
+    updated with a time step of 1 / fps.
+
+    Args:
+        scene: The root node of the scene.
+        path: The camera path.
+        frames: The number of frames.
+        width: The width of the frames.
+        height: The height of the frames.
+        fps: The frame rate of the sequence.
+        engine: A headless engine to render with. One is created if not given.
+        **options: Further arguments for the Engine, such as rasterizer or clear_color.
+
+    Yields:
+        The frames as (height, width, 4) arrays of RGBA values. The array is reused
+        for the next frame, so it needs to be copied to keep it.
+    """
+    if engine is None:
+        engine = Engine(headless=True, width=width, height=height, fps=fps, scene=scene, **options)
+    else:
+        engine.scene = scene
+        if (engine.width, engine.height) != (width, height):
+            engine.init(width, height)
+    for index in range(frames):
+        engine.position, engine.yaw, engine.pitch = path.sample(index / fps)
+        yield engine.render_frame(1 / fps)
+
+
+def render_sequence(
+    scene: Node,
+    path: CameraPath,
+    frames: int,
+    sink: FrameSink = None,
+    width: int = 1280,
+    height: int = 720,
+    fps: float = 30,
+    engine: Engine = None,
+    **options
+) -> dict[str, float]:
+    """
+    Renders a sequence of frames as fast as possible and streams them to a sink.
+
+    Args:
+        scene: The root node of the scene.
+        path: The camera path.
+        frames: The number of frames.
+        sink: The sink to write the frames to, which is closed at the end. Frames are
+            only rendered if not given.
+        width: The width of the frames.
+        height: The height of the frames.
+        fps: The frame rate of the sequence.
+        engine: A headless engine to render with. One is created if not given.
+        **options: Further arguments for the Engine, such as rasterizer or clear_color.
+
+    Returns:
+        A report with the number of frames, the total time in seconds, the frames
+        per second, the time spent rendering, the time spent in sink.write(), the
+        part of it blocked on back-pressure and the time taken to close the sink.
+    """
+    render_time = write_time = 0.0
+    start = time.perf_counter()
+    sequence = iter_sequence(scene, path, frames, width, height, fps, engine, **options)
+    while True:
+        frame_start = time.perf_counter()
+        frame = next(sequence, None)
+        render_time += time.perf_counter() - frame_start
+        if frame is None:
+            break
+        if sink is not None:
+            write_start = time.perf_counter()
+            sink.write(frame)
+            write_time += time.perf_counter() - write_start
+
+    close_start = time.perf_counter()
+    if sink is not None:
+        sink.close()
+    end = time.perf_counter()
+    total = end - start
+    return {
+        "frames": frames,
+        "seconds": total,
+        "fps": frames / total if total > 0 else 0.0,
+        "render_seconds": render_time,
+        "write_seconds": write_time,
+        "wait_seconds": sink.wait_time if sink is not None else 0.0,
+        "close_seconds": end - close_start
+    }
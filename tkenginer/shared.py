@@ -0,0 +1,191 @@
+"""
+This module provides named arrays in shared memory, for handing frames and
+geometry to worker processes without copying them.
+"""
+
+import collections
+import os
+import weakref
+import numpy as np
+
+from multiprocessing import shared_memory
+
+
+ALIGNMENT = 64
+"""
+The byte boundary every shared array starts on.
+"""
+
+ATTACHED_LIMIT = 8
+"""
+The number of shared memory blocks a process keeps attached to at a time.
+"""
+
+
+class SharedBlock(shared_memory.SharedMemory):
+    """
+    Shared memory that can be closed while arrays still view it.
+
+    The mapping is then released once the last of those arrays is gone, instead
+    of close() failing.
+    """
+
+    def close(self) -> None:
+        try:
+            super().close()
+        except BufferError:
+            self._buf = None
+            self._mmap = None
+            if getattr(self, "_fd", -1) >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+
+def release_block(block: SharedBlock) -> None:
+    """
+    Closes a shared memory block and removes its name, so it is freed once no
+    process maps it anymore.
+
+    Args:
+        block: The block.
+    """
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+    block.close()
+
+
+def get_layout(specs: dict) -> tuple[tuple, int]:
+    """
+    Places arrays one after another in a block of memory.
+
+    Args:
+        specs: The shape and type of each array, by name.
+
+    Returns:
+        A tuple containing the name, type, shape and byte offset of every array, and
+        the number of bytes they take up.
+    """
+    entries = list()
+    offset = 0
+    for name, (shape, dtype) in specs.items():
+        dtype = np.dtype(dtype)
+        entries.append((name, dtype.str, tuple(int(size) for size in shape), offset))
+        offset += -(-int(np.prod(shape)) * dtype.itemsize // ALIGNMENT) * ALIGNMENT
+    return tuple(entries), offset
+
+
+def get_views(block: SharedBlock, entries: tuple) -> dict:
+    """
+    Creates arrays viewing a shared memory block.
+
+    Args:
+        block: The block.
+        entries: The arrays in the block, as returned by get_layout().
+
+    Returns:
+        The arrays by name.
+    """
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+        for name, dtype, shape, offset in entries
+    }
+
+
+class SharedArrays:
+    """
+    A set of arrays in a shared memory block that is reused while it is large enough.
+
+    Other processes open the arrays with attach(), given the layout.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the SharedArrays.
+        """
+        self.block = None
+        self.layout = None
+        self.finalizer = None
+
+    @property
+    def capacity(self) -> int:
+        """
+        The size of the shared memory block in bytes.
+        """
+        return 0 if self.block is None else self.block.size
+
+    def allocate(self, specs: dict, growth: float = 1.25) -> dict:
+        """
+        Lays out arrays in the block, replacing it with a larger one if needed.
+
+        The contents of the arrays are undefined.
+
+        Args:
+            specs: The shape and type of each array, by name.
+            growth: How much larger than needed a new block is made, so that slowly
+                growing arrays do not need a new block every time.
+
+        Returns:
+            The arrays by name.
+        """
+        entries, size = get_layout(specs)
+        if size > self.capacity:
+            self.release()
+            self.block = SharedBlock(create=True, size=max(int(size * growth), ALIGNMENT))
+            self.finalizer = weakref.finalize(self, release_block, self.block)
+        self.layout = (self.block.name, entries)
+        return get_views(self.block, entries)
+
+    def write(self, arrays: dict) -> tuple:
+        """
+        Copies arrays into the block.
+
+        Args:
+            arrays: The arrays by name.
+
+        Returns:
+            The layout to attach to them with.
+        """
+        views = self.allocate({name: (array.shape, array.dtype) for name, array in arrays.items()})
+        for name, array in arrays.items():
+            views[name][...] = array
+        return self.layout
+
+    def release(self) -> None:
+        """
+        Frees the block. Arrays already handed out stay valid.
+        """
+        if self.finalizer is not None:
+            self.finalizer()
+        self.block = None
+        self.layout = None
+        self.finalizer = None
+
+
+attached: "collections.OrderedDict[str, SharedBlock]" = collections.OrderedDict()
+"""
+The blocks this process is attached to, least recently used first.
+"""
+
+
+def attach(layout: tuple) -> dict:
+    """
+    Opens arrays shared by another process.
+
+    Blocks stay attached for later calls, up to ATTACHED_LIMIT of them.
+
+    Args:
+        layout: The layout of the arrays, as given by SharedArrays.layout.
+
+    Returns:
+        The arrays by name.
+    """
+    name, entries = layout
+    block = attached.pop(name, None)
+    if block is None:
+        block = SharedBlock(name=name)
+        while len(attached) >= ATTACHED_LIMIT:
+            attached.popitem(last=False)[1].close()
+    attached[name] = block
+    return get_views(block, entries)
@@ -0,0 +1,450 @@
+"""
+This module provides quadric error metric mesh simplification.
+"""
+
+import numpy as np
+import numba as nb
+
+from numba.typed import List
+
+
+@nb.njit(cache=True)
+def get_quadric_determinant(q, a11, a12, a13, a21, a22, a23, a31, a32, a33) -> float:
+    """
+    Calculates the determinant of a 3x3 submatrix of a symmetric quadric.
+
+    Args:
+        q: The quadric as its 10 unique coefficients.
+        a11 ... a33: The indices of the coefficients making up the submatrix.
+
+    Returns:
+        The determinant.
+    """
+    return (q[a11] * q[a22] * q[a33] + q[a13] * q[a21] * q[a32] + q[a12] * q[a23] * q[a31] -
+            q[a13] * q[a22] * q[a31] - q[a11] * q[a23] * q[a32] - q[a12] * q[a21] * q[a33])
+
+
+@nb.njit(cache=True)
+def get_vertex_error(q, x, y, z) -> float:
+    """
+    Evaluates a quadric at a point.
+
+    Args:
+        q: The quadric as its 10 unique coefficients.
+        x, y, z: The point.
+
+    Returns:
+        The sum of squared distances from the point to the planes of the quadric.
+    """
+    return (q[0] * x * x + 2 * q[1] * x * y + 2 * q[2] * x * z + 2 * q[3] * x +
+            q[4] * y * y + 2 * q[5] * y * z + 2 * q[6] * y +
+            q[7] * z * z + 2 * q[8] * z + q[9])
+
+
+@nb.njit(cache=True)
+def get_edge_error(vertices, quadrics, v0, v1, point) -> float:
+    """
+    Calculates the cost of collapsing an edge and the position of the merged vertex.
+
+    Args:
+        vertices: The vertex positions.
+        quadrics: The quadric of each vertex.
+        v0, v1: The vertices of the edge.
+        point: The array of 3 floats to write the merged vertex position to.
+
+    Returns:
+        The quadric error of the merged vertex.
+    """
+    q = quadrics[v0] + quadrics[v1]
+    determinant = get_quadric_determinant(q, 0, 1, 2, 1, 4, 5, 2, 5, 7)
+    if determinant != 0:
+        point[0] = -get_quadric_determinant(q, 1, 2, 3, 4, 5, 6, 5, 7, 8) / determinant
+        point[1] = get_quadric_determinant(q, 0, 2, 3, 1, 5, 6, 2, 7, 8) / determinant
+        point[2] = -get_quadric_determinant(q, 0, 1, 3, 1, 4, 6, 2, 5, 8) / determinant
+        return get_vertex_error(q, point[0], point[1], point[2])
+
+    best = np.inf
+    for t in (0.0, 0.5, 1.0):
+        x = vertices[v0, 0] + (vertices[v1, 0] - vertices[v0, 0]) * t
+        y = vertices[v0, 1] + (vertices[v1, 1] - vertices[v0, 1]) * t
+        z = vertices[v0, 2] + (vertices[v1, 2] - vertices[v0, 2]) * t
+        error = get_vertex_error(q, x, y, z)
+        if error < best:
+            best = error
+            point[0] = x
+            point[1] = y
+            point[2] = z
+    return best
+
+
+@nb.njit(cache=True)
+def get_triangle_normal(vertices, triangles, t, normal) -> None:
+    """
+    Calculates the unit normal of a triangle, or a zero vector for degenerate triangles.
+
+    Args:
+        vertices: The vertex positions.
+        triangles: The triangles.
+        t: The index of the triangle.
+        normal: The array of 3 floats to write the normal to.
+    """
+    p0 = vertices[triangles[t, 0]]
+    p1 = vertices[triangles[t, 1]]
+    p2 = vertices[triangles[t, 2]]
+    normal[:] = np.cross(p1 - p0, p2 - p0)
+    length = np.sqrt(normal[0] ** 2 + normal[1] ** 2 + normal[2] ** 2)
+    if length > 0:
+        normal /= length
+    else:
+        normal[:] = 0
+
+
+@nb.njit(cache=True)
+def update_triangle_errors(vertices, quadrics, triangles, errors, t, point) -> None:
+    """
+    Recalculates the collapse costs of the three edges of a triangle.
+
+    Args:
+        vertices: The vertex positions.
+        quadrics: The quadric of each vertex.
+        triangles: The triangles.
+        errors: The (M, 4) array of edge costs, with the minimum in the last column.
+        t: The index of the triangle.
+        point: A scratch array of 3 floats.
+    """
+    for j in range(3):
+        errors[t, j] = get_edge_error(
+            vertices, quadrics, triangles[t, j], triangles[t, (j + 1) % 3], point)
+    errors[t, 3] = min(errors[t, 0], errors[t, 1], errors[t, 2])
+
+
+@nb.njit(cache=True)
+def build_references(vertex_count, triangles):
+    """
+    Lists the triangles using each vertex.
+
+    Args:
+        vertex_count: The number of vertices.
+        triangles: The triangles.
+
+    Returns:
+        A tuple containing the triangle and corner of each reference, the first
+        reference and the reference count of each vertex, and the number of references.
+    """
+    counts = np.zeros(vertex_count, dtype=np.int64)
+    for t in range(triangles.shape[0]):
+        for j in range(3):
+            counts[triangles[t, j]] += 1
+    starts = np.zeros(vertex_count, dtype=np.int64)
+    for v in range(1, vertex_count):
+        starts[v] = starts[v - 1] + counts[v - 1]
+
+    size = 3 * triangles.shape[0]
+    ref_triangles = np.empty(max(2 * size, 16), dtype=np.int64)
+    ref_corners = np.empty(max(2 * size, 16), dtype=np.int64)
+    cursors = starts.copy()
+    for t in range(triangles.shape[0]):
+        for j in range(3):
+            v = triangles[t, j]
+            ref_triangles[cursors[v]] = t
+            ref_corners[cursors[v]] = j
+            cursors[v] += 1
+    return ref_triangles, ref_corners, starts, counts, size
+
+
+@nb.njit(cache=True)
+def is_collapse_flipping(vertices, triangles, normals, removed, ref_triangles, ref_corners, ref_flags, start, count, other, point) -> bool:
+    """
+    Checks if moving a vertex would flip or degenerate one of its triangles.
+
+    Triangles that also use the other vertex of the edge disappear with the
+    collapse and are flagged in ref_flags instead.
+
+    Args:
+        vertices: The vertex positions.
+        triangles: The triangles.
+        normals: The normal of each triangle.
+        removed: Which triangles have been removed.
+        ref_triangles, ref_corners: The triangle references.
+        ref_flags: The per-reference flags to write to.
+        start, count: The references of the vertex being moved.
+        other: The other vertex of the edge.
+        point: The new position of the vertex.
+
+    Returns:
+        True if the collapse should be rejected, False otherwise.
+    """
+    for k in range(start, start + count):
+        t = ref_triangles[k]
+        if removed[t]:
+            continue
+        corner = ref_corners[k]
+        id1 = triangles[t, (corner + 1) % 3]
+        id2 = triangles[t, (corner + 2) % 3]
+        if id1 == other or id2 == other:
+            ref_flags[k] = True
+            continue
+        ref_flags[k] = False
+
+        d1 = vertices[id1] - point
+        d2 = vertices[id2] - point
+        length1 = np.sqrt(d1[0] ** 2 + d1[1] ** 2 + d1[2] ** 2)
+        length2 = np.sqrt(d2[0] ** 2 + d2[1] ** 2 + d2[2] ** 2)
+        if length1 == 0 or length2 == 0:
+            return True
+        d1 /= length1
+        d2 /= length2
+        if abs(d1[0] * d2[0] + d1[1] * d2[1] + d1[2] * d2[2]) > 0.999:
+            return True
+        n = np.cross(d1, d2)
+        length = np.sqrt(n[0] ** 2 + n[1] ** 2 + n[2] ** 2)
+        if length == 0:
+            return True
+        if (n[0] * normals[t, 0] + n[1] * normals[t, 1] + n[2] * normals[t, 2]) / length < 0.2:
+            return True
+    return False
+
+
+@nb.njit(cache=True)
+def extract_mesh(vertices, points, moved, triangles, removed, origin, scale):
+    """
+    Copies out the remaining triangles and the vertices they use.
+
+    Args:
+        vertices: The original vertex positions.
+        points: The normalized vertex positions.
+        moved: Which vertices have been moved by a collapse.
+        triangles: The triangles.
+        removed: Which triangles have been removed.
+        origin: The offset to undo the normalization with.
+        scale: The scale to undo the normalization with.
+
+    Returns:
+        A tuple containing the vertices as an (N, 3) float32 array and the triangles
+        as an (M, 3) uint32 array.
+    """
+    remap = np.full(vertices.shape[0], -1, dtype=np.int64)
+    out_triangles = np.empty((triangles.shape[0], 3), dtype=np.uint32)
+    vertex_count = 0
+    triangle_count = 0
+    for t in range(triangles.shape[0]):
+        if removed[t]:
+            continue
+        for j in range(3):
+            v = triangles[t, j]
+            if remap[v] < 0:
+                remap[v] = vertex_count
+                vertex_count += 1
+            out_triangles[triangle_count, j] = remap[v]
+        triangle_count += 1
+
+    out_vertices = np.empty((vertex_count, 3), dtype=np.float32)
+    for v in range(vertices.shape[0]):
+        if remap[v] < 0:
+            continue
+        if moved[v]:
+            out_vertices[remap[v]] = points[v] * scale + origin
+        else:
+            out_vertices[remap[v]] = vertices[v]
+    return out_vertices, out_triangles[:triangle_count].copy()
+
+
+@nb.njit(cache=True)
+def simplify_mesh(vertices, indices, targets, aggressiveness):
+    """
+    Simplifies a triangle mesh by collapsing the edges with the lowest quadric error.
+
+    Edges are collapsed in rounds with a growing error threshold, and triangles that
+    would flip are left alone. Vertices on open boundaries are never moved, so the
+    outline of the mesh is preserved. A snapshot is taken whenever the triangle count
+    drops to the next target, so a whole LOD chain comes out of a single run.
+
+    Args:
+        vertices: The vertex positions as an (N, 3) array.
+        indices: The triangles as an (M, 3) array of vertex indices.
+        targets: The triangle counts to produce meshes for, in decreasing order.
+        aggressiveness: How quickly the error threshold grows between rounds.
+
+    Returns:
+        A tuple containing a list of vertex arrays and a list of index arrays, one per target.
+        Targets that cannot be reached without breaking the boundary get the smallest mesh found.
+    """
+    origin = np.empty(3, dtype=np.float64)
+    extent = np.empty(3, dtype=np.float64)
+    for j in range(3):
+        origin[j] = vertices[:, j].min()
+        extent[j] = vertices[:, j].max() - origin[j]
+    scale = np.sqrt((extent ** 2).sum())
+    if scale == 0:
+        scale = 1.0
+
+    vertex_count = vertices.shape[0]
+    points = np.empty((vertex_count, 3), dtype=np.float64)
+    for v in range(vertex_count):
+        for j in range(3):
+            points[v, j] = (vertices[v, j] - origin[j]) / scale
+    triangles = indices.astype(np.int64)
+    triangle_count = triangles.shape[0]
+
+    removed = np.zeros(triangle_count, dtype=np.bool_)
+    dirty = np.zeros(triangle_count, dtype=np.bool_)
+    normals = np.zeros((triangle_count, 3), dtype=np.float64)
+    errors = np.zeros((triangle_count, 4), dtype=np.float64)
+    quadrics = np.zeros((vertex_count, 10), dtype=np.float64)
+    borders = np.zeros(vertex_count, dtype=np.bool_)
+    moved = np.zeros(vertex_count, dtype=np.bool_)
+    point = np.empty(3, dtype=np.float64)
+
+    live = 0
+    for t in range(triangle_count):
+        a = triangles[t, 0]
+        b = triangles[t, 1]
+        c = triangles[t, 2]
+        if a == b or b == c or a == c:
+            removed[t] = True
+            continue
+        live += 1
+        get_triangle_normal(points, triangles, t, normals[t])
+        n = normals[t]
+        d = -(n[0] * points[a, 0] + n[1] * points[a, 1] + n[2] * points[a, 2])
+        plane = np.array([n[0], n[1], n[2], d])
+        q = np.array([
+            plane[0] * plane[0], plane[0] * plane[1], plane[0] * plane[2], plane[0] * plane[3],
+            plane[1] * plane[1], plane[1] * plane[2], plane[1] * plane[3],
+            plane[2] * plane[2], plane[2] * plane[3], plane[3] * plane[3]
+        ])
+        for j in range(3):
+            quadrics[triangles[t, j]] += q
+
+    keep = ~removed
+    triangles = triangles[keep]
+    normals = normals[keep]
+    errors = errors[keep]
+    removed = removed[keep]
+    dirty = dirty[keep]
+    ref_triangles, ref_corners, ref_starts, ref_counts, ref_size = build_references(
+        vertex_count, triangles)
+    ref_flags = np.zeros(ref_triangles.shape[0], dtype=np.bool_)
+
+    neighbor_counts = np.zeros(vertex_count, dtype=np.int64)
+    for v in range(vertex_count):
+        for k in range(ref_starts[v], ref_starts[v] + ref_counts[v]):
+            for j in range(3):
+                neighbor_counts[triangles[ref_triangles[k], j]] += 1
+        for k in range(ref_starts[v], ref_starts[v] + ref_counts[v]):
+            for j in range(3):
+                neighbor = triangles[ref_triangles[k], j]
+                if neighbor != v and neighbor_counts[neighbor] == 1:
+                    borders[v] = True
+                    borders[neighbor] = True
+                neighbor_counts[neighbor] = 0
+
+    for t in range(triangles.shape[0]):
+        update_triangle_errors(points, quadrics, triangles, errors, t, point)
+
+    vertex_levels = List()
+    index_levels = List()
+    level = 0
+    for iteration in range(100):
+        while level < targets.shape[0] and live <= targets[level]:
+            level_vertices, level_indices = extract_mesh(
+                vertices, points, moved, triangles, removed, origin, scale)
+            vertex_levels.append(level_vertices)
+            index_levels.append(level_indices)
+            level += 1
+        if level == targets.shape[0]:
+            break
+
+        if iteration > 0 and iteration % 5 == 0:
+            keep = ~removed
+            triangles = triangles[keep]
+            normals = normals[keep]
+            errors = errors[keep]
+            removed = removed[keep]
+            dirty = dirty[keep]
+            ref_triangles, ref_corners, ref_starts, ref_counts, ref_size = build_references(
+                vertex_count, triangles)
+            ref_flags = np.zeros(ref_triangles.shape[0], dtype=np.bool_)
+
+        dirty[:] = False
+        threshold = 1e-9 * (iteration + 3) ** aggressiveness
+
+        for t in range(triangles.shape[0]):
+            if live <= targets[level]:
+                break
+            if errors[t, 3] > threshold or removed[t] or dirty[t]:
+                continue
+
+            for j in range(3):
+                if errors[t, j] > threshold:
+                    continue
+                v0 = triangles[t, j]
+                v1 = triangles[t, (j + 1) % 3]
+                if borders[v0] or borders[v1]:
+                    continue
+
+                get_edge_error(points, quadrics, v0, v1, point)
+                if is_collapse_flipping(points, triangles, normals, removed, ref_triangles, ref_corners,
+                                        ref_flags, ref_starts[v0], ref_counts[v0], v1, point):
+                    continue
+                if is_collapse_flipping(points, triangles, normals, removed, ref_triangles, ref_corners,
+                                        ref_flags, ref_starts[v1], ref_counts[v1], v0, point):
+                    continue
+
+                points[v0] = point
+                moved[v0] = True
+                quadrics[v0] += quadrics[v1]
+
+                start = ref_size
+                for v in (v0, v1):
+                    for k in range(ref_starts[v], ref_starts[v] + ref_counts[v]):
+                        u = ref_triangles[k]
+                        if removed[u]:
+                            continue
+                        if ref_flags[k]:
+                            removed[u] = True
+                            live -= 1
+                            continue
+                        triangles[u, ref_corners[k]] = v0
+                        dirty[u] = True
+                        get_triangle_normal(points, triangles, u, normals[u])
+
+                        if ref_size == ref_triangles.shape[0]:
+                            grown = np.empty(2 * ref_size, dtype=np.int64)
+                            grown[:ref_size] = ref_triangles
+                            ref_triangles = grown
+                            grown = np.empty(2 * ref_size, dtype=np.int64)
+                            grown[:ref_size] = ref_corners
+                            ref_corners = grown
+                            grown_flags = np.zeros(2 * ref_size, dtype=np.bool_)
+                            grown_flags[:ref_size] = ref_flags
+                            ref_flags = grown_flags
+                        ref_triangles[ref_size] = u
+                        ref_corners[ref_size] = ref_corners[k]
+                        ref_size += 1
+
+                for k in range(start, ref_size):
+                    update_triangle_errors(
+                        points, quadrics, triangles, errors, ref_triangles[k], point)
+
+                count = ref_size - start
+                if count <= ref_counts[v0]:
+                    target_start = ref_starts[v0]
+                    for k in range(count):
+                        ref_triangles[target_start + k] = ref_triangles[start + k]
+                        ref_corners[target_start + k] = ref_corners[start + k]
+                    ref_size = start
+                else:
+                    ref_starts[v0] = start
+                ref_counts[v0] = count
+                ref_counts[v1] = 0
+                break
+
+    while level < targets.shape[0]:
+        level_vertices, level_indices = extract_mesh(
+            vertices, points, moved, triangles, removed, origin, scale)
+        vertex_levels.append(level_vertices)
+        index_levels.append(level_indices)
+        level += 1
+
+    return vertex_levels, index_levels
@@ -0,0 +1,231 @@
+"""
+This module provides the offscreen buffers the engine renders into.
+"""
+
+import threading
+import numpy as np
+
+from PIL import Image
+from .shared import *
+
+
+GROWTH = 1.25
+"""
+How much more storage than needed render targets allocate when they grow, so
+that a window being dragged larger does not reallocate on every frame.
+"""
+
+
+class RenderTarget:
+    """
+    A color buffer and a depth buffer of the same size.
+
+    The buffers are views of the start of larger storage, which is kept when the
+    target shrinks and only replaced when it grows past its capacity.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Initializes the RenderTarget.
+
+        Args:
+            width: The width in pixels.
+            height: The height in pixels.
+        """
+        self.colors = None
+        self.depths = None
+        self.resize(width, height)
+
+    @property
+    def capacity(self) -> int:
+        """
+        The number of pixels the buffers can hold without reallocating.
+        """
+        return 0 if self.depths is None else len(self.depths)
+
+    def resize(self, width: int, height: int) -> None:
+        """
+        Resizes the buffers, reusing their storage if it is large enough. The contents are lost.
+
+        Args:
+            width: The new width in pixels.
+            height: The new height in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.buffer, self.zbuffer = self.allocate(width, height)
+        self.buffer[:, :, :] = 0
+        self.zbuffer[:, :] = np.inf
+        # The image shares its memory with the buffer. It is marked writable so that
+        # drawing on it changes the buffer instead of a private copy.
+        self.image = Image.frombuffer("RGBA", (width, height), self.buffer, "raw", "RGBA", 0, 1)
+        self.image.readonly = 0
+
+    def allocate(self, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Provides contiguous buffers of a size. Their contents are undefined.
+
+        Args:
+            width: The width in pixels.
+            height: The height in pixels.
+
+        Returns:
+            A tuple containing the color buffer and the depth buffer.
+        """
+        pixels = width * height
+        if pixels > self.capacity:
+            capacity = int(pixels * GROWTH)
+            self.colors = np.empty(capacity * 4, dtype=np.uint8)
+            self.depths = np.empty(capacity, dtype=np.float32)
+        return (
+            self.colors[:pixels * 4].reshape(height, width, 4),
+            self.depths[:pixels].reshape(height, width)
+        )
+
+    def clear(self, color: tuple[int, int, int, int]) -> None:
+        """
+        Fills the color buffer with a color and resets the depth buffer.
+
+        Args:
+            color: The color as an RGBA tuple.
+        """
+        self.buffer[:, :, :] = color
+        self.zbuffer[:, :] = np.inf
+
+
+class SharedRenderTarget(RenderTarget):
+    """
+    A render target whose buffers live in shared memory, so that other processes
+    can draw into them.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Initializes the SharedRenderTarget.
+
+        Args:
+            width: The width in pixels.
+            height: The height in pixels.
+        """
+        self.arrays = SharedArrays()
+        super().__init__(width, height)
+
+    @property
+    def capacity(self) -> int:
+        """
+        About the number of pixels the buffers can hold without reallocating, as
+        each pixel takes four bytes of color and four of depth.
+        """
+        return self.arrays.capacity // 8
+
+    @property
+    def layout(self) -> tuple:
+        """
+        The layout of the buffers in shared memory, for attach().
+        """
+        return self.arrays.layout
+
+    def allocate(self, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Provides buffers of a size in shared memory. Their contents are undefined.
+
+        Args:
+            width: The width in pixels.
+            height: The height in pixels.
+
+        Returns:
+            A tuple containing the color buffer and the depth buffer.
+        """
+        arrays = self.arrays.allocate({
+            "buffer": ((height, width, 4), np.uint8),
+            "zbuffer": ((height, width), np.float32)
+        })
+        return arrays["buffer"], arrays["zbuffer"]
+
+
+class SwapChain:
+    """
+    Render targets passed between a thread that renders frames and a thread that presents them.
+
+    The presenter owns the front target, which the renderer never touches. With two
+    targets, the renderer waits until the presenter has taken its previous frame
+    (double buffering). With three, it never waits, and a finished frame that is
+    replaced before the presenter takes it is dropped (triple buffering).
+    """
+
+    def __init__(self, width: int, height: int, count: int = 3, create_target=RenderTarget) -> None:
+        """
+        Initializes the SwapChain.
+
+        Args:
+            width: The width of the targets in pixels.
+            height: The height of the targets in pixels.
+            count: The number of targets.
+            create_target: The function creating a target of a given width and height.
+
+        Raises:
+            ValueError: If there are fewer than two targets.
+        """
+        if count < 2:
+            raise ValueError("a swap chain needs at least two targets")
+        self.targets = [create_target(width, height) for _ in range(count)]
+        self.front = self.targets[0]
+        self.free = self.targets[1:]
+        self.ready = None
+        self.dropped = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def acquire(self) -> "RenderTarget | None":
+        """
+        Takes a target to render the next frame into, waiting for one to be free.
+
+        Returns:
+            The target, or None once the chain is closed.
+        """
+        with self.condition:
+            while not self.free and not self.closed:
+                self.condition.wait()
+            if self.closed:
+                return None
+            return self.free.pop()
+
+    def submit(self, target: RenderTarget, info=None) -> None:
+        """
+        Hands a finished frame to the presenter.
+
+        Args:
+            target: The target the frame was rendered into, as returned by acquire().
+            info: Anything to pass along with the frame.
+        """
+        with self.condition:
+            if self.ready is not None:
+                self.free.append(self.ready[0])
+                self.dropped += 1
+            self.ready = (target, info)
+            self.condition.notify_all()
+
+    def take(self) -> "tuple[RenderTarget, object] | None":
+        """
+        Makes the newest finished frame the front target.
+
+        Returns:
+            The target and the info it was submitted with, or None if no frame has
+            been finished since the last call.
+        """
+        with self.condition:
+            if self.ready is None:
+                return None
+            self.free.append(self.front)
+            self.front, info = self.ready
+            self.ready = None
+            self.condition.notify_all()
+            return self.front, info
+
+    def close(self) -> None:
+        """
+        Wakes the renderer up and makes acquire() return None from now on.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -27,14 +27,68 @@ class Transform:
         position = position if position is not None else [0.0, 0.0, 0.0]
         rotation = rotation if rotation is not None else [0.0, 0.0, 0.0]
         scale = scale if scale is not None else [1.0, 1.0, 1.0]
-        self.position = np.array(position, dtype=np.float32)
-        self.rotation = np.array(rotation, dtype=np.float32)
-        self.scale = np.array(scale, dtype=np.float32)
+        self.position = position
+        self.rotation = rotation
+        self.scale = scale
+        self._matrix = None
+        self._matrix_key = None
+
+    @property
+    def position(self) -> np.typing.NDArray[np.float32]:
+        """
+        The position as an array of 3 floats (x, y, z).
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: list[float]) -> None:
+        self._position = np.array(value, dtype=np.float32)
+
+    @property
+    def rotation(self) -> np.typing.NDArray[np.float32]:
+        """
+        The rotation as an array of 3 floats (pitch, yaw, roll) in radians.
+        """
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: list[float]) -> None:
+        self._rotation = np.array(value, dtype=np.float32)
+
+    @property
+    def scale(self) -> np.typing.NDArray[np.float32]:
+        """
+        The scale as an array of 3 floats (x, y, z).
+        """
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: list[float]) -> None:
+        self._scale = np.array(value, dtype=np.float32)
 
     def get_matrix(self) -> np.typing.NDArray[np.float32]:
         """
         Returns the transformation matrix.
 
+        The matrix is cached and only rebuilt after the position, rotation or scale
+        changed (including in-place changes to their arrays), so the same read-only
+        array is returned for as long as the transform stays the same.
+
+        Returns:
+            The 4x4 transformation matrix.
+        """
+        key = (self._position.tobytes(), self._rotation.tobytes(),
+               self._scale.tobytes())
+        if key != self._matrix_key:
+            self._matrix = self.compute_matrix()
+            self._matrix.flags.writeable = False
+            self._matrix_key = key
+        return self._matrix
+
+    def compute_matrix(self) -> np.typing.NDArray[np.float32]:
+        """
+        Builds the transformation matrix, bypassing the cache.
+
         Returns:
             The 4x4 transformation matrix.
         """
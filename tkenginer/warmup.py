@@ -0,0 +1,124 @@
+"""
+This module compiles the numba kernels of the render path ahead of the first
+frame, from explicit signatures, so that compiling them (or loading them from
+the cache) overlaps with setting up the scene and the window.
+
+Running it as a script fills the on-disk cache, for example after installing:
+
+    python -m tkenginer.warmup
+"""
+
+import threading
+import time
+
+from numba import types
+from . import math, bvh
+
+
+def array(dtype: types.Type, ndim: int, readonly: bool = False) -> types.Array:
+    """
+    Creates the type of a C-contiguous array.
+
+    Args:
+        dtype: The type of the elements.
+        ndim: The number of dimensions.
+        readonly: Whether the array is read-only, like the arrays of a mesh.
+
+    Returns:
+        The array type.
+    """
+    return types.Array(dtype, ndim, "C", readonly=readonly)
+
+
+FLOATS = array(types.float32, 1)
+READONLY_FLOATS = array(types.float32, 1, True)
+VECTORS = array(types.float32, 2)
+READONLY_VECTORS = array(types.float32, 2, True)
+MATRICES = array(types.float32, 3)
+INTS = array(types.int64, 1)
+TRIANGLES = array(types.int64, 2)
+INDICES = array(types.uint32, 2)
+READONLY_INDICES = array(types.uint32, 2, True)
+COLORS = array(types.uint8, 2)
+BUFFER = array(types.uint8, 3)
+W_COORDS = types.Array(types.float32, 2, "A")
+
+SIGNATURES = {
+    math.get_projection_matrix: [(types.float64, types.int64, types.int64, types.float64, types.float64)],
+    math.get_view_matrix: [(FLOATS, types.float64, types.float64)],
+    math.get_frustum_planes: [(VECTORS,)],
+    math.transform_vertices: [(VECTORS, VECTORS), (READONLY_VECTORS, VECTORS)],
+    math.clip_to_screen: [(VECTORS, types.int64, types.int64)],
+    math.draw_mesh: [
+        (BUFFER, VECTORS, VECTORS, W_COORDS, INDICES, COLORS),
+        (BUFFER, VECTORS, VECTORS, W_COORDS, READONLY_INDICES, COLORS)
+    ],
+    math.bin_triangles: [(VECTORS, VECTORS, TRIANGLES, types.int64, types.int64, types.int64)],
+    math.draw_tiles: [(BUFFER, VECTORS, VECTORS, VECTORS, TRIANGLES, COLORS, INTS, INTS, types.int64)],
+    math.transform_bounds: [
+        (READONLY_VECTORS, FLOATS, FLOATS, FLOATS, types.float64),
+        (READONLY_VECTORS, READONLY_FLOATS, READONLY_FLOATS, READONLY_FLOATS, types.float64)
+    ],
+    math.cull_instances: [(VECTORS, MATRICES, READONLY_FLOATS, types.float64)],
+    math.transform_instances: [(READONLY_VECTORS, MATRICES)],
+    math.compose_matrices: [(VECTORS, VECTORS, VECTORS, MATRICES)],
+    math.get_hierarchy_order: [(INTS,)],
+    math.resolve_hierarchy: [(INTS, INTS, MATRICES, MATRICES)],
+    bvh.build_bvh: [(VECTORS, VECTORS, types.int64)],
+    bvh.refit_bvh: [(VECTORS, VECTORS, INTS, VECTORS, VECTORS, INTS, INTS, INTS, INTS, INTS, INTS)],
+    bvh.query_bvh_frustum: [(VECTORS, VECTORS, VECTORS, INTS, VECTORS, VECTORS, INTS, INTS, INTS)]
+}
+"""
+The argument types the engine calls each kernel of the render path with. The
+kernels are still compiled lazily for other types.
+"""
+
+warmup_thread: threading.Thread = None
+"""
+The thread started by start_warmup(), if any.
+"""
+
+warmup_lock = threading.Lock()
+
+
+def compile_kernels(signatures: dict = None) -> int:
+    """
+    Compiles kernels for the given signatures, loading them from the cache when possible.
+
+    Args:
+        signatures: The argument types to compile each kernel for. Defaults to SIGNATURES.
+
+    Returns:
+        The number of signatures that were not compiled yet.
+    """
+    count = 0
+    for kernel, kernel_signatures in (signatures or SIGNATURES).items():
+        for signature in kernel_signatures:
+            if signature not in kernel.overloads:
+                kernel.compile(signature)
+                count += 1
+    return count
+
+
+def start_warmup() -> threading.Thread:
+    """
+    Compiles the kernels of the render path on a daemon thread, once per process.
+
+    Kernels called while it runs wait for their compilation instead of compiling twice.
+
+    Returns:
+        The thread, which can be joined to wait for the kernels.
+    """
+    global warmup_thread
+    with warmup_lock:
+        if warmup_thread is None:
+            warmup_thread = threading.Thread(
+                target=compile_kernels, name="tkenginer-warmup", daemon=True)
+            warmup_thread.start()
+    return warmup_thread
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    count = compile_kernels()
+    print(f"compiled {count} kernel signatures in {time.perf_counter() - start:.2f} s")
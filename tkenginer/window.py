@@ -0,0 +1,66 @@
+"""
+This module provides the tkinter window the engine presents its frames in.
+
+It is only imported by engines that are not headless, so that rendering works
+without tkinter or a display.
+"""
+
+import tkinter as tk
+
+from PIL import Image, ImageTk
+
+
+class Window(tk.Tk):
+    """
+    A tkinter window with a canvas showing the rendered frame.
+    """
+
+    def __init__(self, title: str, width: int, height: int) -> None:
+        """
+        Initializes the Window.
+
+        Args:
+            title: The title of the window.
+            width: The width of the window.
+            height: The height of the window.
+        """
+        super().__init__()
+        self.title(title)
+        self.geometry(f"{width}x{height}")
+        self.canvas = tk.Canvas(
+            self,
+            highlightthickness=0
+        )
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        # Frames are shown by a single canvas item, which is pointed at the new image
+        # when the frame size changes instead of stacking up items on every resize.
+        self.item = self.canvas.create_image(0, 0, anchor="nw")
+        self.photo = None
+        self.frame = None
+
+    def resize(self, width: int, height: int, mode: str = "RGBA") -> None:
+        """
+        Creates the image frames are presented to, for a new frame size.
+
+        Args:
+            width: The width of the frames.
+            height: The height of the frames.
+            mode: "RGBA" to present frames with their alpha channel, or "RGB" to
+                present them opaque, which spares Tk blending them.
+        """
+        self.photo = ImageTk.PhotoImage(mode, (width, height))
+        # PhotoImage.paste() copies images that are not stored in a single block
+        # into a newly allocated one, so frames are staged in a block allocated once.
+        self.frame = Image.new(mode, (0, 0))._new(Image.core.new_block(mode, (width, height)))
+        self.canvas.itemconfigure(self.item, image=self.photo)
+
+    def present(self, image: Image.Image) -> None:
+        """
+        Shows a frame.
+
+        Args:
+            image: The frame, the size of the window. Its alpha channel is dropped
+                if the window presents RGB frames.
+        """
+        self.frame.paste(image)
+        self.photo.paste(self.frame)